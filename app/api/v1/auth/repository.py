@@ -0,0 +1,65 @@
+from typing import Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import passwords
+from app.models.user import UserORM
+
+# Hash de una contraseña cualquiera: con un email que no existe verificamos igual
+# contra este, asi el tiempo de respuesta no delata que cuentas existen.
+_dummy_hash: Optional[str] = None
+
+
+class UserRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_by_email(self, email: str) -> Optional[UserORM]:
+        return await self.db.scalar(
+            select(UserORM).where(UserORM.email == email.strip().lower())
+        )
+
+    async def create(self, email: str, username: str, password: str) -> UserORM:
+        password_hash = await passwords.run_in_hash_pool(
+            passwords.hash_password, password
+        )
+        user = UserORM(
+            email=email.strip().lower(),
+            username=username,
+            password_hash=password_hash,
+        )
+        self.db.add(user)
+        await self.db.flush()
+        return user
+
+    async def authenticate(
+        self, email: str, password: str
+    ) -> Tuple[Optional[UserORM], bool]:
+        """(usuario, rehasheado): usuario si la contraseña es correcta.
+
+        Si cambio el costo del hash deja el nuevo en la session (flush) y
+        devuelve rehasheado=True; el commit lo hace quien llama.
+        """
+        global _dummy_hash
+        user = await self.get_by_email(email)
+        if user is None or not user.is_active:
+            if _dummy_hash is None:
+                _dummy_hash = await passwords.run_in_hash_pool(
+                    passwords.hash_password, "dummy-password"
+                )
+            await passwords.run_in_hash_pool(
+                passwords.verify_password, password, _dummy_hash
+            )
+            return None, False
+
+        ok, new_hash = await passwords.run_in_hash_pool(
+            passwords.verify_and_update, password, user.password_hash
+        )
+        if not ok:
+            return None, False
+        if new_hash is None:
+            return user, False
+        user.password_hash = new_hash
+        await self.db.flush()
+        return user, True
@@ -2,44 +2,54 @@ from datetime import timedelta
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.v1.auth.repository import UserRepository
 from app.api.v1.auth.schemas import Token, UserPublic
-from app.core.security import create_access_token, get_current_user
-
-FAKE_USERS = {
-    "ricardo@example.com": {
-        "email": "ricardo@example.com",
-        "username": "ricardo",
-        "password": "secret123",
-    },
-    "alumno@example.com": {
-        "email": "alumno@example.com",
-        "username": "alumno",
-        "password": "123456",
-    },
-}
-
+from app.core.replicas import get_write_db
+from app.core.security import (
+    create_access_token,
+    get_current_user,
+    oauth2_scheme,
+    revoke_token,
+)
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
 @router.post("/login", response_model=Token)
-async def login(form_data: OAuth2PasswordRequestForm = Depends()):
-    user = FAKE_USERS.get(form_data.username)
+async def login(
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: AsyncSession = Depends(get_write_db),
+):
+    # el hash corre en el pool de app/core/passwords.py, no en el event loop
+    user, rehashed = await UserRepository(db).authenticate(
+        form_data.username, form_data.password
+    )
 
-    if not user or user["password"] != form_data.password:
+    if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Credendicales invalidas"
         )
+    if rehashed:
+        # cambio el costo configurado: guardamos el hash nuevo
+        await db.commit()
 
     token = create_access_token(
-        data={"sub": user["email"], "username": user["username"]},
+        data={"sub": user.email, "username": user.username},
         expire_delta=timedelta(minutes=30),
     )
 
     return {"access_token": token, "token_type": "bearer"}
 
 
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    token: str = Depends(oauth2_scheme), current=Depends(get_current_user)
+):
+    revoke_token(token)
+
+
 @router.get("/me", response_model=UserPublic)
 async def read_me(current=Depends(get_current_user)):
     return {"email": current["email"], "username": current["username"]}
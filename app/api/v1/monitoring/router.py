@@ -0,0 +1,34 @@
+from fastapi import APIRouter
+
+from app.core import replicas
+from app.core.db import pool_stats
+from app.core.security import token_cache
+from app.services.cache import response_cache
+
+router = APIRouter(prefix="/monitoring", tags=["monitoring"])
+
+
+@router.get("/db-pool")
+async def db_pool_stats():
+    # conexiones en uso/libres/overflow y tiempos de espera de cada pool
+    return {name: stats.snapshot() for name, stats in pool_stats.items()}
+
+
+@router.get("/cache")
+async def cache_stats():
+    # hits/misses y ocupacion del cache de lecturas de posts
+    return response_cache.stats()
+
+
+@router.get("/auth-cache")
+async def auth_cache_stats():
+    # hit ratio del cache de tokens y cuanto tarda verificar uno
+    return token_cache.stats()
+
+
+@router.get("/replicas")
+async def replica_stats():
+    # salud y lecturas de cada replica ({} sin DATABASE_REPLICA_URLS)
+    if replicas.replica_router is None:
+        return {}
+    return replicas.replica_router.stats()
@@ -0,0 +1,107 @@
+from typing import Iterable, List, Optional
+
+from fastapi import Request, Response
+
+from app.core.replicas import stale_replica_read, wants_primary
+from app.services.cache import CachedResponse, response_cache
+from app.services.image_variants import cache_tag, ready_at
+
+from .conditional import not_modified, not_modified_response, validator_headers
+from .repository import clear_counts
+
+# Etiquetas de invalidacion de las lecturas de posts:
+#   post:<id>             entradas que incluyen ese post (detalle, paginas, by-tags)
+#   posts:list            todas las paginas de GET /posts (incluyen total)
+#   posts:list:<order>    paginas ordenadas por ese campo
+#   posts:search          paginas filtradas con Search
+#   posts:tags:<tag>      paginas de by-tags que piden esa etiqueta
+#   media:<image_url>     respuestas con una imagen cuyos derivados no estan listos
+
+LIST = "posts:list"
+SEARCH = "posts:search"
+
+
+def post_tag(post_id: int) -> str:
+    return f"post:{post_id}"
+
+
+def tag_tag(name: str) -> str:
+    return f"posts:tags:{name.strip().lower()}"
+
+
+def list_tags(order_by: str, query: Optional[str], post_ids: Iterable[int]) -> set:
+    tags = {LIST, f"{LIST}:{order_by}", *map(post_tag, post_ids)}
+    if query:
+        tags.add(SEARCH)
+    return tags
+
+
+def by_tags_tags(tag_names: Iterable[str], post_ids: Iterable[int]) -> set:
+    # LIST: el total cambia con cualquier alta o baja de un post con esos tags
+    return {LIST, *map(tag_tag, tag_names), *map(post_tag, post_ids)}
+
+
+def image_tags(posts) -> set:
+    # se invalidan cuando terminan los derivados (ver app/services/image_variants.py)
+    return {
+        cache_tag(post.image_url)
+        for post in posts
+        if post.image_url and ready_at(post.image_url) is None
+    }
+
+
+def lookup(request: Request, key: str) -> Optional[CachedResponse]:
+    # despues de escribir, el cliente lee del primario: el cache pudo llenarlo
+    # una replica atrasada que todavia no tiene su cambio
+    if wants_primary(request):
+        return None
+    return response_cache.get(key)
+
+
+def cached_response(entry: CachedResponse, request: Request) -> Response:
+    if entry.etag is None:
+        return Response(content=entry.body, media_type="application/json")
+    if not_modified(
+        request, entry.etag, entry.last_modified, entry.allow_modified_since
+    ):
+        return not_modified_response(entry.etag, entry.last_modified)
+    return Response(
+        content=entry.body,
+        media_type="application/json",
+        headers=validator_headers(entry.etag, entry.last_modified),
+    )
+
+
+def store_response(
+    request: Request, key: str, entry: CachedResponse, tags: Iterable[str]
+) -> Response:
+    # una replica atrasada volveria a llenar lo que invalido una escritura
+    if not stale_replica_read(request):
+        response_cache.set(key, entry, tags)
+    return cached_response(entry, request)
+
+
+def invalidate_created(tag_names: List[str]) -> None:
+    # un post nuevo cambia el total de todas las paginas y los by-tags de sus tags
+    clear_counts()
+    response_cache.invalidate([LIST, *map(tag_tag, tag_names)])
+
+
+def invalidate_updated(
+    post_id: int, fields: Iterable[str], changed_tags: Iterable[str] = ()
+) -> None:
+    tags = {post_tag(post_id), SEARCH}
+    if "title" in fields:
+        # cambia la posicion del post en las paginas ordenadas por titulo
+        tags.add(f"{LIST}:title")
+    # el post entra o sale de los by-tags de los tags agregados o quitados
+    tags.update(map(tag_tag, changed_tags))
+    # titulo, contenido o tags cambian que busquedas y by-tags lo cuentan
+    clear_counts()
+    response_cache.invalidate(tags)
+
+
+def invalidate_deleted(post_id: int) -> None:
+    # sin el post cambian el total y el corte de todas las paginas
+    clear_counts()
+    response_cache.invalidate([post_tag(post_id), LIST])
@@ -0,0 +1,63 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Iterable, Optional, Tuple
+
+from fastapi import Request, Response
+
+# Validadores HTTP para los GET de posts: ETag fuerte a partir de (id, updated_at)
+# de lo que entra en la respuesta, y Last-Modified con el updated_at mas nuevo.
+
+
+def make_etag(*parts) -> str:
+    digest = hashlib.sha256("|".join(map(str, parts)).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def versions_etag(key: str, versions: Iterable[Tuple[int, datetime]], *extra) -> str:
+    return make_etag(key, *extra, *(f"{pid}@{ts.isoformat()}" for pid, ts in versions))
+
+
+def http_date(value: datetime) -> str:
+    return format_datetime(value.replace(tzinfo=timezone.utc), usegmt=True)
+
+
+def is_conditional(request: Request) -> bool:
+    headers = request.headers
+    return "if-none-match" in headers or "if-modified-since" in headers
+
+
+def not_modified(
+    request: Request,
+    etag: str,
+    last_modified: Optional[str],
+    allow_modified_since: bool = True,
+) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match manda sobre If-Modified-Since (RFC 9110)
+        candidates = [
+            tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+        ]
+        return "*" in candidates or etag in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if not (allow_modified_since and if_modified_since and last_modified):
+        return False
+    try:
+        return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(
+            if_modified_since
+        )
+    except (TypeError, ValueError):
+        return False
+
+
+def validator_headers(etag: str, last_modified: Optional[str]) -> dict:
+    headers = {"ETag": etag}
+    if last_modified:
+        headers["Last-Modified"] = last_modified
+    return headers
+
+
+def not_modified_response(etag: str, last_modified: Optional[str]) -> Response:
+    return Response(status_code=304, headers=validator_headers(etag, last_modified))
@@ -0,0 +1,50 @@
+import csv
+import io
+import json
+from typing import AsyncIterator, List
+
+# Formatos de GET /posts/export: cada chunk de posts se serializa y se envia
+# enseguida, sin acumular el corpus en memoria.
+
+EXPORT_COLUMNS = [
+    "id",
+    "title",
+    "content",
+    "image_url",
+    "created_at",
+    "updated_at",
+    "author_name",
+    "author_email",
+    "tags",
+]
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+
+def _plain(record: dict) -> dict:
+    return {
+        **record,
+        "created_at": record["created_at"] and record["created_at"].isoformat(),
+        "updated_at": record["updated_at"] and record["updated_at"].isoformat(),
+    }
+
+
+async def ndjson_lines(chunks: AsyncIterator[List[dict]]) -> AsyncIterator[bytes]:
+    async for records in chunks:
+        yield "".join(
+            json.dumps(_plain(record), ensure_ascii=False) + "\n" for record in records
+        ).encode()
+
+
+async def csv_rows(chunks: AsyncIterator[List[dict]]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+    writer.writeheader()
+    async for records in chunks:
+        for record in records:
+            writer.writerow({**_plain(record), "tags": "|".join(record["tags"])})
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
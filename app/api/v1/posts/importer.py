@@ -0,0 +1,186 @@
+import json
+from collections import Counter
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.post import PostORM, post_tags
+
+from .repository import PostRepository, adjust_tag_counts, normalize_tag
+from .schemas import Author, PostCreate
+
+# Importacion masiva de posts en NDJSON (un post JSON por linea):
+#   {"title": "...", "content": "...", "tags": ["python", ...],
+#    "author": {"name": "...", "email": "..."}}
+# Cada linea se valida con las reglas de PostCreate; los posts validos se insertan
+# por lotes (autores y tags resueltos en bloque, posts y post_tags con bulk insert)
+# y cada lote se commitea por separado. Las lineas con error se reportan sin
+# cortar la importacion.
+
+MAX_REPORTED_ERRORS = 1000
+
+
+class ImportedPost(BaseModel):
+    line: int
+    post: PostCreate
+    author: Optional[Author] = None
+
+
+class ImportReport(BaseModel):
+    received: int = 0
+    inserted: int = 0
+    failed: int = 0
+    errors: List[dict] = []
+    errors_truncated: bool = False
+    tags: List[str] = []
+
+    def add_error(self, line: int, error: str) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "error": error})
+        else:
+            self.errors_truncated = True
+
+
+async def iter_ndjson_lines(
+    chunks: AsyncIterator[bytes],
+) -> AsyncIterator[Tuple[int, bytes]]:
+    """Corta un stream de bytes en lineas sin cargar el cuerpo entero."""
+    pending = b""
+    number = 0
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            number += 1
+            yield number, line
+    if pending:
+        yield number + 1, pending
+
+
+def _format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(loc) for loc in item['loc']) or 'post'}: {item['msg']}"
+        for item in error.errors()
+    )
+
+
+def parse_line(number: int, raw: bytes) -> ImportedPost:
+    data = json.loads(raw)
+    if not isinstance(data, dict):
+        raise ValueError("cada linea debe ser un objeto JSON")
+    raw_tags = data.get("tags")
+    if raw_tags is None:
+        raw_tags = []
+    elif not isinstance(raw_tags, list):
+        raise ValueError("tags debe ser una lista")
+    tags = [tag if isinstance(tag, dict) else {"name": tag} for tag in raw_tags]
+    # sin content (o null) aplica el default de PostCreate, igual que la API
+    fields = {k: data[k] for k in ("title", "content") if data.get(k) is not None}
+    post = PostCreate(**fields, tags=tags)
+    author = Author.model_validate(data["author"]) if data.get("author") else None
+    return ImportedPost(line=number, post=post, author=author)
+
+
+class PostImporter:
+    def __init__(
+        self,
+        db: AsyncSession,
+        batch_size: int = 500,
+        default_author: Optional[Author] = None,
+    ):
+        self.db = db
+        self.repository = PostRepository(db)
+        self.batch_size = batch_size
+        self.default_author = default_author
+        self.report = ImportReport()
+        self._tags: set = set()
+
+    async def run(self, lines: AsyncIterator[Tuple[int, bytes]]) -> ImportReport:
+        batch: List[ImportedPost] = []
+        async for number, raw in lines:
+            if not raw.strip():
+                continue
+            self.report.received += 1
+            try:
+                batch.append(parse_line(number, raw))
+            except ValidationError as e:
+                self.report.add_error(number, _format_validation_error(e))
+                continue
+            except json.JSONDecodeError as e:
+                self.report.add_error(number, f"JSON invalido: {e}")
+                continue
+            except ValueError as e:  # JSON valido pero con otra forma
+                self.report.add_error(number, str(e))
+                continue
+            if len(batch) >= self.batch_size:
+                await self._flush(batch)
+                batch = []
+        if batch:
+            await self._flush(batch)
+
+        self.report.tags = sorted(self._tags)
+        return self.report
+
+    async def _flush(self, batch: List[ImportedPost]) -> None:
+        try:
+            async with self.db.begin_nested():
+                await self._insert(batch)
+        except SQLAlchemyError:
+            # el lote fallo entero: lo reintentamos fila por fila para aislar
+            # las lineas que fallan y guardar el resto
+            for item in batch:
+                try:
+                    async with self.db.begin_nested():
+                        await self._insert([item])
+                except SQLAlchemyError as e:
+                    reason = getattr(e, "orig", None) or e
+                    self.report.add_error(
+                        item.line, f"Error de base de datos: {reason}"
+                    )
+                else:
+                    self.report.inserted += 1
+        else:
+            self.report.inserted += len(batch)
+        await self.db.commit()
+
+    async def _insert(self, batch: List[ImportedPost]) -> None:
+        authors: Dict[str, str] = {}
+        for item in batch:
+            author = item.author or self.default_author
+            if author:
+                authors.setdefault(author.email, author.name)
+        author_ids = await self.repository.ensure_authors(authors) if authors else {}
+
+        tag_ids = await self.repository.ensure_tags(
+            [tag.name for item in batch for tag in item.post.tags]
+        )
+
+        rows = []
+        for item in batch:
+            author = item.author or self.default_author
+            rows.append(
+                {
+                    "title": item.post.title,
+                    "content": item.post.content,
+                    "author_id": author_ids[author.email] if author else None,
+                }
+            )
+        post_ids = (
+            await self.db.scalars(
+                insert(PostORM).returning(PostORM.id, sort_by_parameter_order=True),
+                rows,
+            )
+        ).all()
+
+        links = []
+        for item, post_id in zip(batch, post_ids):
+            keys = {normalize_tag(tag.name) for tag in item.post.tags} - {""}
+            links.extend({"post_id": post_id, "tag_id": tag_ids[key]} for key in keys)
+            self._tags.update(keys)
+        if links:
+            await self.db.execute(insert(post_tags), links)
+            await adjust_tag_counts(self.db, Counter(link["tag_id"] for link in links))
@@ -0,0 +1,37 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Tuple
+
+# Cursor opaco para paginacion keyset: guarda la ultima (clave de orden, id) vista
+# junto con el orden con el que se genero, para no mezclar cursores entre ordenes.
+# Las fechas (order_by=created_at) viajan en ISO 8601.
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(order_by: str, direction: str, key: Any, post_id: int) -> str:
+    if isinstance(key, datetime):
+        key = key.isoformat()
+    payload = {"o": order_by, "d": direction, "k": key, "i": post_id}
+    raw = json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, order_by: str, direction: str) -> Tuple[Any, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        key, post_id = payload["k"], int(payload["i"])
+        same_order = payload["o"] == order_by and payload["d"] == direction
+        if same_order and order_by == "created_at":
+            key = datetime.fromisoformat(key)
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise InvalidCursor("Cursor invalido")
+
+    if not same_order:
+        raise InvalidCursor("El cursor no corresponde a order_by/direction")
+    return key, post_id
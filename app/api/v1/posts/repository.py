@@ -1,116 +1,500 @@
+import json
+import os
+from collections import OrderedDict
+from datetime import datetime
 from math import ceil
-from typing import Dict, List, Optional, Tuple
-
-from sqlalchemy import func, select
-from sqlalchemy.orm import Session, joinedload, selectinload
-
-from app.api.v1.posts.schemas import PostPublic
+from time import monotonic
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from sqlalchemy import bindparam, delete, func, insert, literal, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import (
+    joinedload,
+    load_only,
+    selectinload,
+    undefer,
+    with_expression,
+)
+
+from app.core.replicas import recent_primary_write, replica_session
 from app.models.author import AuthorORM
-from app.models.post import PostORM
+from app.models.post import PostORM, post_tags, utcnow
+from app.models.search import search_posts
 from app.models.tag import TagORM
 
+# Largo del extracto de las cards (PostCard), calculado en SQL
+EXCERPT_CHARS = int(os.getenv("POST_EXCERPT_CHARS", "200"))
+
+RELATIONS = (selectinload(PostORM.tags), joinedload(PostORM.author))
+FULL_CONTENT = undefer(PostORM.content)
+EXCERPT = with_expression(
+    PostORM.excerpt, func.substr(PostORM.content, 1, EXCERPT_CHARS)
+)
+
+# Perfiles de carga: que columnas y relaciones trae cada consulta segun el modelo
+# de respuesta. content es diferido y las relaciones lazy="raise", asi que nada
+# se carga si no esta aca.
+LOADER_PROFILES = {
+    # PostPublic: content completo, tags y autor
+    "public": (FULL_CONTENT, *RELATIONS),
+    # PostCard: extracto en lugar de content, tags y autor
+    "card": (EXCERPT, *RELATIONS),
+    # ?fields= sin tags ni autor: las mismas columnas, sin relaciones
+    "public_columns": (FULL_CONTENT,),
+    "card_columns": (EXCERPT,),
+    # PostSummary: id y titulo (updated_at e image_url para los validadores)
+    "summary": (
+        load_only(PostORM.id, PostORM.title, PostORM.updated_at, PostORM.image_url),
+    ),
+    # validadores HTTP (ETag/Last-Modified): sin content ni relaciones
+    "version": (load_only(PostORM.id, PostORM.updated_at, PostORM.image_url),),
+    # update/delete: solo la fila
+    "bare": (),
+}
+
+
+def normalize_tag(name: str) -> str:
+    return name.strip().lower()
+
+
+class _IdCache:
+    """Cache chico (LRU) de clave -> id por proceso. Tags y autores no se borran,
+    asi que un id ya commiteado no queda viejo."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._ids: "OrderedDict[str, int]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[int]:
+        value = self._ids.get(key)
+        if value is not None:
+            self._ids.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: int) -> None:
+        self._ids[key] = value
+        self._ids.move_to_end(key)
+        if len(self._ids) > self.max_size:
+            self._ids.popitem(last=False)
+
+    def update(self, values: Dict[str, int]) -> None:
+        for key, value in values.items():
+            self.put(key, value)
+
+    def clear(self) -> None:
+        self._ids.clear()
+
+
+class _CountCache:
+    """Totales de listados por (alcance, filtro) con TTL corto. Las escrituras de
+    este proceso lo vacian; en otros procesos un total puede atrasar hasta TTL."""
+
+    def __init__(self, ttl: float, max_size: int = 256):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._totals: "OrderedDict[Tuple, Tuple[int, float]]" = OrderedDict()
+
+    def get(self, key: Tuple) -> Optional[int]:
+        entry = self._totals.get(key)
+        if entry is None or entry[1] <= monotonic():
+            return None
+        return entry[0]
+
+    def put(self, key: Tuple, total: int) -> None:
+        if self.ttl <= 0:
+            return
+        self._totals[key] = (total, monotonic() + self.ttl)
+        self._totals.move_to_end(key)
+        if len(self._totals) > self.max_size:
+            self._totals.popitem(last=False)
+
+    def clear(self) -> None:
+        self._totals.clear()
+
+
+class PostPage(NamedTuple):
+    total: Optional[int]
+    total_mode: str  # exact, cached, estimated o none
+    total_pages: Optional[int]
+    page: Optional[int]  # None cuando se pagina por cursor
+    items: List[PostORM]
+    next_cursor: Optional[Tuple[Any, int]]
+
+
+_tag_ids = _IdCache(int(os.getenv("TAG_ID_CACHE_SIZE", "2048")))
+_author_ids = _IdCache(int(os.getenv("AUTHOR_ID_CACHE_SIZE", "512")))
+_counts = _CountCache(float(os.getenv("COUNT_CACHE_TTL_SECONDS", "10")))
+
+
+def clear_counts() -> None:
+    _counts.clear()
+
+
+def _order_column(order_by: str):
+    # titulo sin distinguir mayusculas (usa ix_posts_lower_title_id), fecha de
+    # creacion (ix_posts_created_at_id) o id
+    if order_by == "title":
+        return func.lower(PostORM.title)
+    if order_by == "created_at":
+        return PostORM.created_at
+    return PostORM.id
+
+
+def _tag_ids_query(keys: List[str]):
+    return select(TagORM.key, TagORM.id).where(TagORM.key.in_(keys))
+
+
+def _author_ids_query(emails: List[str]):
+    return select(AuthorORM.email, AuthorORM.id).where(AuthorORM.email.in_(emails))
+
+
+_increment_tag = (
+    update(TagORM.__table__)
+    .where(TagORM.__table__.c.id == bindparam("tag_id"))
+    .values(post_count=TagORM.__table__.c.post_count + bindparam("delta"))
+)
+
+
+def explain_statement(results, dialect) -> Tuple[str, Any]:
+    """EXPLAIN (FORMAT JSON) de results con los valores del filtro como parametros.
+
+    Nunca se escriben inline: la busqueda puede venir del parametro obsoleto
+    text, que no pasa por el patron de Search.
+    """
+    compiled = results.compile(
+        dialect=dialect, compile_kwargs={"render_postcompile": True}
+    )
+    params = compiled.params
+    if compiled.positiontup is not None:
+        # asyncpg usa $1, $2...: los valores van en ese orden
+        params = tuple(params[name] for name in compiled.positiontup)
+    return f"EXPLAIN (FORMAT JSON) {compiled}", params
+
+
+async def adjust_tag_counts(db: AsyncSession, deltas: Dict[int, int]) -> None:
+    """Suma deltas[tag_id] a tags.post_count, atomico frente a otros requests.
+
+    El incremento lo hace la base sobre el valor vigente de la fila (nunca leemos
+    y reescribimos el contador), asi dos escrituras en paralelo no se pisan. Se
+    ordena por id para que todas tomen los locks de filas en el mismo orden."""
+    params = [
+        {"tag_id": tag_id, "delta": delta}
+        for tag_id, delta in sorted(deltas.items())
+        if delta
+    ]
+    if params:
+        await db.execute(_increment_tag, params)
+
+
+def _insert_ignore(db: AsyncSession, model):
+    # INSERT ... ON CONFLICT DO NOTHING: dos requests que crean el mismo tag o
+    # autor a la vez no terminan en IntegrityError
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(model).on_conflict_do_nothing()
+    if dialect == "sqlite":
+        return sqlite.insert(model).on_conflict_do_nothing()
+    return insert(model)
+
+
 # ESTA CLASE DE  ENCARGA DE LAS CONSULTAS
 
 
 class PostRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def get(self, post_id: int) -> Optional[PostORM]:
-        post_find = select(PostORM).where(PostORM.id == post_id)
-        return self.db.execute(post_find).scalar_one_or_none()
+    async def get(self, post_id: int, profile: str = "public") -> Optional[PostORM]:
+        post_find = (
+            select(PostORM)
+            .options(*LOADER_PROFILES[profile])
+            .where(PostORM.id == post_id)
+            # si el post ya esta en la session lo recargamos con el perfil pedido
+            .execution_options(populate_existing=True)
+        )
+        return (await self.db.execute(post_find)).scalar_one_or_none()
 
-    def search(
+    async def search(
         self,
         query: Optional[str],
         order_by: str,
         direction: str,
         page: int,
         per_page: int,
-    ) -> Tuple[int, List[PostORM]]:
+        cursor: Optional[Tuple[Any, int]] = None,
+        profile: str = "public",
+        total_mode: str = "exact",
+        author_id: Optional[int] = None,
+        created_after: Optional[datetime] = None,
+    ) -> PostPage:
 
         results = select(PostORM)
+        score = None
 
-        if query:
-            results = results.where(PostORM.title.ilike(f"%{query}%"))
+        # ambos filtros van contra los indices (author_id, ...) y (created_at, id)
+        if author_id is not None:
+            results = results.where(PostORM.author_id == author_id)
+        if created_after is not None:
+            results = results.where(PostORM.created_at > created_after)
 
-        total = (
-            self.db.scalar(select(func.count()).select_from(results.subquery())) or 0
-        )
-        total_pages = ceil(total / per_page) if total > 0 else 0
-        current_page = 1 if total_pages == 0 else min(page, total_pages)
-        if order_by == "id":
-            order_col = PostORM.id
+        if query:
+            condition, score, matches = search_posts(
+                query, self.db.get_bind().dialect.name
+            )
+            if matches is not None:
+                results = results.join(matches, matches.c.post_id == PostORM.id)
+            if condition is not None:
+                results = results.where(condition)
+
+        if order_by == "relevance" and score is not None:
+            # lo mas relevante primero, direction no aplica
+            order_col, direction = score, "desc"
         else:
-            order_col = func.lower(PostORM.title)
-
-        results = results.order_by(
-            order_col.asc() if direction == "asc" else order_col.desc()
+            order_col = _order_column(order_by)
+
+        return await self._paginate(
+            results,
+            order_col,
+            direction,
+            page,
+            per_page,
+            cursor,
+            profile,
+            count_key=("search", query or "", author_id, created_after),
+            total_mode=total_mode,
         )
-        # results = sorted(
-        #     results, key=lambda post: post[order_by], reverse=(direction == "desc"))
-        if total_pages == 0:
-            items: List[PostPublic] = []
-        else:
-            start = (current_page - 1) * per_page
-            posts_orm = (
-                self.db.execute(results.limit(per_page).offset(start)).scalars().all()
-            )
-            items = [
-                PostPublic.model_validate(post) for post in posts_orm
-            ]  # convertir tus modelos de SQLAlchemy en modelos de respuesta Pydantic.
-
-            # model_validate() toma los atributos del objeto ORM y genera una instancia validada de PostPublic
-        return total, items
-
-    def by_tags(self, tags: List[str]) -> List[PostORM]:
-        normalized_tags_names = [tag.strip().lower() for tag in tags if tag.strip()]
-        if not normalized_tags_names:
-            return []
 
-        post_list = (
-            select(PostORM)
-            .options(
-                selectinload(PostORM.tags),
-                joinedload(PostORM.author),
+    async def by_tags(
+        self,
+        tags: List[str],
+        match: str = "any",
+        order_by: str = "id",
+        direction: str = "asc",
+        page: int = 1,
+        per_page: int = 10,
+        cursor: Optional[Tuple[Any, int]] = None,
+        profile: str = "public",
+        total_mode: str = "exact",
+    ) -> PostPage:
+        """Posts con alguno (match=any) o todos (match=all) los tags pedidos."""
+        keys = {normalize_tag(tag) for tag in tags} - {""}
+        tag_ids = await self._tag_ids(keys)
+        if not tag_ids or (match == "all" and len(tag_ids) < len(keys)):
+            current_page = None if cursor is not None else 1
+            if total_mode == "none":
+                return PostPage(None, "none", None, current_page, [], None)
+            return PostPage(0, "exact", 0, current_page, [], None)
+
+        # resolvemos los tags a ids antes: el filtro va contra el indice
+        # (tag_id, post_id) de post_tags, sin tocar tags ni comparar nombres
+        matching = select(post_tags.c.post_id).where(
+            post_tags.c.tag_id.in_(list(tag_ids))
+        )
+        if match == "all":
+            matching = matching.group_by(post_tags.c.post_id).having(
+                func.count() == len(tag_ids)
             )
-            .where(PostORM.tags.any(func.lower(TagORM.name).in_(normalized_tags_names)))
-            .order_by(PostORM.id.asc())
+        results = select(PostORM).where(PostORM.id.in_(matching))
+
+        return await self._paginate(
+            results,
+            _order_column(order_by),
+            direction,
+            page,
+            per_page,
+            cursor,
+            profile,
+            count_key=("by-tags", match, *sorted(tag_ids)),
+            total_mode=total_mode,
         )
 
-        posts = self.db.execute(post_list).scalars().all()
-
-        return posts
-
-    def ensure_author(self, name: str, email: str) -> AuthorORM:
+    async def _tag_ids(self, keys: Iterable[str]) -> Set[int]:
+        ids = {key: _tag_ids.get(key) for key in keys}
+        missing = [key for key, tag_id in ids.items() if tag_id is None]
+        if missing:
+            found = dict((await self.db.execute(_tag_ids_query(missing))).all())
+            _tag_ids.update(found)
+            ids.update(found)
+        return {tag_id for tag_id in ids.values() if tag_id is not None}
 
-        author_obj = self.db.execute(
-            select(AuthorORM).where(AuthorORM.email == email)
-        ).scalar_one_or_none()
-
-        if author_obj:
-            return author_obj
-
-        author_obj = AuthorORM(name=name, email=email)
-        self.db.add(author_obj)
-        self.db.flush()
-        return author_obj
+    async def _paginate(
+        self,
+        results,
+        order_col,
+        direction: str,
+        page: int,
+        per_page: int,
+        cursor: Optional[Tuple[Any, int]],
+        profile: str,
+        count_key: Tuple,
+        total_mode: str,
+    ) -> PostPage:
+        """Contrato comun de los listados: total (segun total_mode), la pagina
+        (por OFFSET o por cursor keyset) y el (clave, id) de la ultima fila si hay
+        siguiente."""
+        total, total_mode = await self._count(results, count_key, total_mode)
+        if total is None or total_mode == "estimated":
+            # sin total exacto no sabemos cual es la ultima pagina
+            total_pages = None if total is None else ceil(total / per_page)
+            current_page = page
+        else:
+            total_pages = ceil(total / per_page) if total > 0 else 0
+            current_page = 1 if total_pages == 0 else min(page, total_pages)
+        if cursor is not None:
+            current_page = None
+
+        # el id desempata, asi (clave, id) es unico y sirve como cursor
+        if direction == "asc":
+            results = results.order_by(order_col.asc(), PostORM.id.asc())
+        else:
+            results = results.order_by(order_col.desc(), PostORM.id.desc())
+
+        if cursor is not None:
+            # keyset: buscamos a partir de la ultima fila vista usando el indice,
+            # en vez de recorrer y descartar OFFSET filas
+            last = tuple_(order_col, PostORM.id)
+            # con el tipo de la columna, asi la fecha se bindea en su formato
+            seek = tuple_(literal(cursor[0], order_col.type), literal(cursor[1]))
+            results = results.where(last > seek if direction == "asc" else last < seek)
+        elif total_pages == 0 and total_mode != "estimated":
+            return PostPage(total, total_mode, 0, current_page, [], None)
+        else:
+            results = results.offset((current_page - 1) * per_page)
+
+        # pedimos una fila de mas para saber si hay pagina siguiente
+        rows = (
+            await self.db.execute(
+                results.add_columns(order_col.label("sort_key"))
+                .options(*LOADER_PROFILES[profile])
+                .limit(per_page + 1)
+                # la revalidacion pudo dejar los posts en la session sin content
+                .execution_options(populate_existing=True)
+            )
+        ).all()
 
-    def ensure_tags(self, name: str) -> TagORM:
+        next_cursor = None
+        if len(rows) > per_page:
+            rows = rows[:per_page]
+            last_post, last_key = rows[-1]
+            next_cursor = (last_key, last_post.id)
 
-        tag_obj = self.db.execute(
-            select(TagORM).where(TagORM.name.ilike(name))
-        ).scalar_one_or_none()
-        if tag_obj:
-            return tag_obj
+        posts = [post for post, _ in rows]
+        return PostPage(
+            total, total_mode, total_pages, current_page, posts, next_cursor
+        )
 
-        tag_obj = TagORM(name=name)
-        self.db.add(tag_obj)
-        self.db.flush()
+    async def _count(
+        self, results, count_key: Tuple, total_mode: str
+    ) -> Tuple[Optional[int], str]:
+        """Total del listado y como se obtuvo: none, estimated, cached o exact."""
+        if total_mode == "none":
+            return None, "none"
+        if (
+            total_mode == "estimated"
+            and self.db.get_bind().dialect.name == "postgresql"
+        ):
+            return await self._estimate(results), "estimated"
+        # sin estadisticas del planner (SQLite) el estimado cae en el conteo
+        total = _counts.get(count_key)
+        if total is not None:
+            return total, "cached"
+        # solo el id: el subquery no arrastra content ni las demas columnas
+        ids = results.with_only_columns(PostORM.id)
+        total = await self.db.scalar(select(func.count()).select_from(ids.subquery()))
+        total = total or 0
+        # igual que el cache de respuestas: no guardamos totales de una replica
+        # que quizas todavia no tiene la ultima escritura
+        if not (replica_session(self.db) and recent_primary_write()):
+            _counts.put(count_key, total)
+        return total, "exact"
+
+    async def _estimate(self, results) -> int:
+        # filas que el planner espera para la consulta filtrada, segun las
+        # estadisticas de ANALYZE (reltuples y selectividad): no recorre la tabla
+        statement, params = explain_statement(results, self.db.get_bind().dialect)
+        connection = await self.db.connection()
+        plan = (await connection.exec_driver_sql(statement, params)).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return max(int(plan[0]["Plan"]["Plan Rows"]), 0)
+
+    async def ensure_author(self, name: str, email: str) -> int:
+        return (await self.ensure_authors({email: name}))[email]
+
+    async def ensure_authors(self, authors: Dict[str, str]) -> Dict[str, int]:
+        """Resuelve {email: nombre} a {email: id}, creando los que faltan."""
+        ids = {email: _author_ids.get(email) for email in authors}
+        ids = {email: author_id for email, author_id in ids.items() if author_id}
+        missing = [email for email in authors if email not in ids]
+        if missing:
+            found = dict((await self.db.execute(_author_ids_query(missing))).all())
+            _author_ids.update(found)
+            ids.update(found)
+            missing = [email for email in missing if email not in ids]
+
+        if missing:
+            # insertados en esta transaccion: se cachean recien al leerlos commiteados
+            inserted = await self.db.execute(
+                _insert_ignore(self.db, AuthorORM)
+                .values([{"name": authors[email], "email": email} for email in missing])
+                .returning(AuthorORM.email, AuthorORM.id)
+            )
+            ids.update(inserted.all())
+            raced = [email for email in missing if email not in ids]
+            if raced:
+                # otro request los creo entre nuestro SELECT y el INSERT
+                found = dict((await self.db.execute(_author_ids_query(raced))).all())
+                _author_ids.update(found)
+                ids.update(found)
+
+        return ids
+
+    async def ensure_tags(self, names: List[str]) -> Dict[str, int]:
+        """Resuelve nombres de tag a ids: un SELECT por clave normalizada y un solo
+        INSERT ... ON CONFLICT DO NOTHING para las que faltan."""
+        wanted: Dict[str, str] = {}
+        for name in names:
+            key = normalize_tag(name)
+            if key:
+                wanted.setdefault(key, name.strip())
+
+        ids = {key: _tag_ids.get(key) for key in wanted}
+        ids = {key: tag_id for key, tag_id in ids.items() if tag_id is not None}
+        missing = [key for key in wanted if key not in ids]
+        if missing:
+            found = dict((await self.db.execute(_tag_ids_query(missing))).all())
+            _tag_ids.update(found)
+            ids.update(found)
+            missing = [key for key in missing if key not in ids]
+
+        if missing:
+            inserted = await self.db.execute(
+                _insert_ignore(self.db, TagORM)
+                .values([{"key": key, "name": wanted[key]} for key in missing])
+                .returning(TagORM.key, TagORM.id)
+            )
+            ids.update(inserted.all())
+            raced = [key for key in missing if key not in ids]
+            if raced:
+                # las creo otro request en paralelo: ON CONFLICT las salteo
+                found = dict((await self.db.execute(_tag_ids_query(raced))).all())
+                _tag_ids.update(found)
+                ids.update(found)
 
-        return tag_obj
+        return ids
 
-    def create_post(
+    async def create_post(
         self,
         title: str,
         content: str,
@@ -118,26 +502,113 @@ class PostRepository:
         tags: List[dict],
         image_url: Optional[str],
     ) -> PostORM:
-        author_obj = None
+        author_id = None
 
         if author:
-            author_obj = self.ensure_author(author["username"], author["email"])
+            author_id = await self.ensure_author(author["username"], author["email"])
+
+        tag_ids = await self.ensure_tags([tag["name"] for tag in tags])
 
         post = PostORM(
-            title=title, content=content, image_url=image_url, author=author_obj
+            title=title, content=content, image_url=image_url, author_id=author_id
         )
-
-        for tag in tags:
-            tag_obj = self.ensure_tags(tag["name"])
-            post.tags.append(tag_obj)
-
         self.db.add(post)
-        self.db.flush()
+        await self.db.flush()
+
+        if tag_ids:
+            await self.db.execute(
+                insert(post_tags),
+                [{"post_id": post.id, "tag_id": tag_id} for tag_id in tag_ids.values()],
+            )
+            await adjust_tag_counts(self.db, dict.fromkeys(tag_ids.values(), 1))
 
         return post
 
-    def delete_post(self, post: PostORM) -> None:
-        self.db.delete(post)
+    async def set_tags(self, post: PostORM, names: List[str]) -> List[str]:
+        """Reemplaza los tags del post. Devuelve las claves agregadas o quitadas."""
+        tag_ids = await self.ensure_tags(names)
+        wanted = set(tag_ids.values())
+        current = set(
+            await self.db.scalars(
+                select(post_tags.c.tag_id).where(post_tags.c.post_id == post.id)
+            )
+        )
+        removed = current - wanted
+        if removed:
+            removed = set(
+                await self.db.scalars(
+                    delete(post_tags)
+                    .where(
+                        post_tags.c.post_id == post.id,
+                        post_tags.c.tag_id.in_(removed),
+                    )
+                    .returning(post_tags.c.tag_id)
+                )
+            )
+        added = wanted - current
+        if added:
+            await self.db.execute(
+                insert(post_tags),
+                [{"post_id": post.id, "tag_id": tag_id} for tag_id in added],
+            )
+        if not (added or removed):
+            return []
+
+        await adjust_tag_counts(
+            self.db, {**dict.fromkeys(added, 1), **dict.fromkeys(removed, -1)}
+        )
+        # la fila del post no cambia: marcamos la edicion para ETag/Last-Modified
+        post.updated_at = utcnow()
+        changed = [key for key, tag_id in tag_ids.items() if tag_id in added]
+        if removed:
+            changed += await self.db.scalars(
+                select(TagORM.key).where(TagORM.id.in_(removed))
+            )
+        return changed
+
+    async def export_chunks(self, chunk_size: int) -> AsyncIterator[List[dict]]:
+        """Recorre todos los posts con un cursor del servidor, de a chunk_size filas.
+
+        Se leen columnas (no objetos ORM) y los tags se cargan por chunk, asi la
+        memoria no depende del tamaño del corpus."""
+        posts = (
+            select(
+                PostORM.id,
+                PostORM.title,
+                PostORM.content,
+                PostORM.image_url,
+                PostORM.created_at,
+                PostORM.updated_at,
+                AuthorORM.name.label("author_name"),
+                AuthorORM.email.label("author_email"),
+            )
+            .outerjoin(AuthorORM, AuthorORM.id == PostORM.author_id)
+            .order_by(PostORM.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        result = await self.db.stream(posts)
+        async for rows in result.partitions():
+            tags: Dict[int, List[str]] = {row.id: [] for row in rows}
+            tag_rows = await self.db.execute(
+                select(post_tags.c.post_id, TagORM.name)
+                .join(TagORM, TagORM.id == post_tags.c.tag_id)
+                .where(post_tags.c.post_id.in_(list(tags)))
+                .order_by(post_tags.c.post_id, TagORM.name)
+            )
+            for post_id, name in tag_rows:
+                tags[post_id].append(name)
+            yield [{**row._asdict(), "tags": tags[row.id]} for row in rows]
+
+    async def delete_post(self, post: PostORM) -> None:
+        # borramos los links a mano (no por el CASCADE) para saber que contadores
+        # bajar; RETURNING trae los que efectivamente borro esta transaccion
+        tag_ids = await self.db.scalars(
+            delete(post_tags)
+            .where(post_tags.c.post_id == post.id)
+            .returning(post_tags.c.tag_id)
+        )
+        await adjust_tag_counts(self.db, {tag_id: -1 for tag_id in tag_ids})
+        await self.db.delete(post)
 
     def update_post(self, post: PostORM, updates: Dict) -> PostORM:
 
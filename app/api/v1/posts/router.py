@@ -1,51 +1,285 @@
-from math import ceil
-from typing import Annotated, List, Literal, Optional, Union
+from datetime import datetime, timezone
+from functools import partial
+from typing import Annotated, List, Literal, Optional, Tuple, Union
 
 from fastapi import (
     APIRouter,
+    BackgroundTasks,
     Depends,
     File,
     HTTPException,
     Path,
     Query,
+    Request,
+    Response,
     UploadFile,
     status,
 )
+from fastapi.responses import StreamingResponse
 from sqlalchemy import func, select
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.db import get_db
+from app.core.replicas import get_read_db, get_write_db
 from app.core.security import get_current_user, oauth2_scheme
 from app.models.author import AuthorORM
 from app.models.post import PostORM
 from app.models.tag import TagORM
+from app.services import image_variants, media_gc
+from app.services.cache import CachedResponse, make_key
 from app.services.save_file import save_upload_image
 
+from . import caching
+from .conditional import (
+    http_date,
+    is_conditional,
+    not_modified,
+    not_modified_response,
+    versions_etag,
+)
+from .export import MEDIA_TYPES, csv_rows, ndjson_lines
+from .importer import ImportReport, PostImporter, iter_ndjson_lines
+from .pagination import InvalidCursor, decode_cursor, encode_cursor
 from .repository import PostRepository
 from .schemas import (
+    Author,
     PaginatedPost,
+    PaginatedPostByTags,
     PostBase,
+    PostCard,
     PostCreate,
     PostPublic,
     PostSummary,
     PostUpdate,
+    PostView,
+)
+from .serialization import dumps, json_response, loader_profile, parse_fields, post_dict
+
+FIELDS_DESCRIPTION = (
+    "Campos de cada post separados por coma (ej. id,title,tags); el id va siempre"
+)
+VIEW_DESCRIPTION = (
+    "full: post completo; card: extracto de content calculado en SQL; "
+    "summary: id y titulo"
 )
 
 router = APIRouter(prefix="/posts", tags=["posts"])
 
 
-@router.get("/by-tags", response_model=List[PostPublic])
-def get_post_by_tags(
+@router.get("/by-tags", response_model=PaginatedPostByTags)
+async def get_post_by_tags(
+    request: Request,
     tags: List[str] = Query(
         ...,
         description="Una o más etiquetas. Ejemplo: ?tags=python&tags=java",
     ),
-    db: Session = Depends(get_db),
+    match: Literal["any", "all"] = Query(
+        "any", description="any: alguna de las etiquetas; all: todas"
+    ),
+    per_page: int = Query(10, ge=1, le=50, description="Numero de resultados(1-50)"),
+    page: int = Query(1, ge=1, description="Numero de pagina >=1"),
+    order_by: Literal["id", "title", "created_at"] = Query(
+        "id", description="campo de orden"
+    ),
+    direction: Literal["asc", "desc"] = Query("asc", description="Direccion de orden"),
+    cursor: Optional[str] = Query(
+        default=None,
+        description="Cursor opaco (next_cursor de la respuesta anterior); ignora page",
+    ),
+    include_total: bool = Query(
+        True, description="false evita el conteo (total y total_pages en null)"
+    ),
+    count_mode: Literal["exact", "estimated"] = Query(
+        "exact",
+        description="estimated usa las estadisticas del planner (Postgres)",
+    ),
+    view: PostView = Query("card", description=VIEW_DESCRIPTION),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    repository = PostRepository(db)
-    posts = repository.by_tags(tags)
-    return [PostPublic.model_validate(p, from_attributes=True) for p in posts]
+    only = parse_fields(fields, view)
+    tag_names = sorted({t.strip().lower() for t in tags if t.strip()})
+    key = make_key(
+        "posts:by-tags",
+        tags=tag_names,
+        match=match,
+        order_by=order_by,
+        direction=direction,
+        page=page,
+        per_page=per_page,
+        cursor=cursor,
+        total=count_mode if include_total else "none",
+        view=view,
+        fields=only,
+    )
+    cached = caching.lookup(request, key)
+    if cached:
+        return caching.cached_response(cached, request)
+
+    seek = _decode_seek(cursor, order_by, direction)
+    fetch = partial(
+        PostRepository(db).by_tags,
+        tag_names,
+        match,
+        order_by,
+        direction,
+        page,
+        per_page,
+        cursor=seek,
+        total_mode=count_mode if include_total else "none",
+    )
+    return await _paginated_response(
+        request,
+        key,
+        fetch,
+        lambda posts: caching.by_tags_tags(tag_names, (post.id for post in posts)),
+        view,
+        only,
+        per_page=per_page,
+        seek=seek,
+        order_by=order_by,
+        direction=direction,
+        tags=tag_names,
+        match=match,
+    )
+
+
+def _decode_seek(cursor: Optional[str], order_by: str, direction: str):
+    if not cursor:
+        return None
+    try:
+        return decode_cursor(cursor, order_by, direction)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _naive_utc(moment: Optional[datetime]) -> Optional[datetime]:
+    # created_at se guarda en UTC sin zona
+    if moment is None or moment.tzinfo is None:
+        return moment
+    return moment.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+async def _paginated_response(
+    request: Request,
+    key: str,
+    fetch,
+    cache_tags,
+    view: str,
+    only: Optional[Tuple[str, ...]],
+    per_page: int,
+    seek,
+    order_by: str,
+    direction: str,
+    **extra,
+) -> Response:
+    """Arma una pagina de posts (GET /posts, by-tags) con el mismo contrato:
+    page o cursor, total, next_cursor, validadores HTTP y cache."""
+    if is_conditional(request):
+        # revalidacion: misma pagina pero solo (id, updated_at), sin content
+        versions = await fetch(profile="version")
+        await image_variants.refresh(post.image_url for post in versions.items)
+        etag, last_modified = _collection_validators(
+            key, versions.items, versions.total, versions.next_cursor
+        )
+        if not_modified(request, etag, last_modified, allow_modified_since=False):
+            return not_modified_response(etag, last_modified)
+
+    found = await fetch(profile=loader_profile(view, only))
+    posts = found.items
+    # derivados de las imagenes a memoria antes de serializar (sin I/O por post)
+    await image_variants.refresh(post.image_url for post in posts)
+    etag, last_modified = _collection_validators(
+        key, posts, found.total, found.next_cursor
+    )
+
+    # mismo contenido que PaginatedPost, armado y serializado en una sola pasada
+    result = {
+        "page": found.page,
+        "total": found.total,
+        "total_pages": found.total_pages,
+        "total_mode": found.total_mode,
+        "per_page": per_page,
+        "has_prev": seek is not None or found.page > 1,
+        "has_next": found.next_cursor is not None,
+        "order_by": order_by,
+        "direction": direction,
+        "search": extra.pop("search", None),
+        "next_cursor": (
+            encode_cursor(order_by, direction, *found.next_cursor)
+            if found.next_cursor
+            else None
+        ),
+        "items": [post_dict(post, only, view) for post in posts],
+        **extra,
+    }
+    return caching.store_response(
+        request,
+        key,
+        CachedResponse(
+            dumps(result),
+            etag,
+            last_modified,
+            allow_modified_since=False,
+        ),
+        cache_tags(posts) | caching.image_tags(posts),
+    )
+
+
+def _version(post) -> Tuple[int, datetime]:
+    # los derivados de la imagen cambian la respuesta sin tocar updated_at
+    variants_at = image_variants.ready_at(post.image_url)
+    if variants_at and variants_at > post.updated_at:
+        return post.id, variants_at
+    return post.id, post.updated_at
+
+
+def _collection_validators(key: str, posts, *extra) -> Tuple[str, Optional[str]]:
+    # Last-Modified de una coleccion no refleja los posts borrados, por eso solo
+    # se informa y la revalidacion se decide por ETag
+    versions = [_version(post) for post in posts]
+    etag = versions_etag(key, versions, *extra)
+    newest = max((ts for _, ts in versions), default=None)
+    return etag, http_date(newest) if newest else None
+
+
+@router.get("/export", response_description="Todos los posts en NDJSON o CSV")
+async def export_posts(
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="Formato"),
+    chunk_size: int = Query(1000, ge=10, le=10000, description="Filas por lectura"),
+    db: AsyncSession = Depends(get_read_db),
+    user=Depends(get_current_user),
+):
+    chunks = PostRepository(db).export_chunks(chunk_size)
+    body = ndjson_lines(chunks) if format == "ndjson" else csv_rows(chunks)
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="posts.{format}"'},
+    )
+
+
+@router.post(
+    "/import",
+    response_model=ImportReport,
+    response_description="Resultado de la importacion, con errores por linea",
+)
+async def import_posts(
+    request: Request,
+    batch_size: int = Query(500, ge=1, le=5000, description="Posts por lote"),
+    db: AsyncSession = Depends(get_write_db),
+    user=Depends(get_current_user),
+):
+    # el cuerpo es NDJSON (un post por linea) y se procesa a medida que llega
+    importer = PostImporter(
+        db,
+        batch_size=batch_size,
+        default_author=Author(name=user["username"], email=user["email"]),
+    )
+    report = await importer.run(iter_ndjson_lines(request.stream()))
+    if report.inserted:
+        caching.invalidate_created(report.tags)
+    return report
 
 
 @router.put(
@@ -54,59 +288,77 @@ def get_post_by_tags(
     response_description="Post actualizado con exito",
     status_code=status.HTTP_200_OK,
 )
-def update_post(
+async def update_post(
     post_id: int,
     post: PostUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     user=Depends(get_current_user),
 ):
 
     repository = PostRepository(db)
-    post_to_update = repository.get(post_id)
+    post_to_update = await repository.get(post_id, profile="bare")
 
     if not post_to_update:
         raise HTTPException(status_code=404, detail="Post no encontrado")
     try:
         updates = post.model_dump(exclude_unset=True)
+        tags = updates.pop("tags", None)
+        changed_tags = []
+        if tags is not None:
+            changed_tags = await repository.set_tags(
+                post_to_update, [tag["name"] for tag in tags]
+            )
         new_post = repository.update_post(post_to_update, updates)
-        db.commit()
-        db.refresh(new_post)
-        return new_post
+        await db.commit()
+        caching.invalidate_updated(post_id, updates, changed_tags)
+        new_post = await repository.get(new_post.id, profile="public")
+        await image_variants.refresh([new_post.image_url])
+        return json_response(post_dict(new_post))
 
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=409, detail="El titulo ya existe, prueba con otro"
         )
     except SQLAlchemyError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail="Error al actualizar el post")
 
 
 @router.delete("/{post_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_post(
-    post_id: int, db: Session = Depends(get_db), user=Depends(get_current_user)
+async def delete_post(
+    post_id: int,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_write_db),
+    user=Depends(get_current_user),
 ):
 
     repository = PostRepository(db)
-    post_to_delete = repository.get(post_id)
+    post_to_delete = await repository.get(post_id, profile="bare")
     if not post_to_delete:
         raise HTTPException(status_code=404, detail="Post no encontrado")
 
+    image_url = post_to_delete.image_url
     try:
-        repository.delete_post(post_to_delete)
-        db.commit()
+        await repository.delete_post(post_to_delete)
+        await db.commit()
+        caching.invalidate_deleted(post_id)
     except SQLAlchemyError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail="Error al eliminar el post")
 
+    if image_url:
+        # corre despues de responder; la sesion sigue abierta hasta que termina
+        background_tasks.add_task(media_gc.collect_unreferenced, db, [image_url])
+
 
 @router.get(
     "/{post_id}",
-    response_model=Union[PostPublic, PostSummary],
+    response_model=Union[PostPublic, PostCard, PostSummary],
     response_description="Post encontrado",
 )
-def get_post_by_id(
+async def get_post_by_id(
+    request: Request,
     post_id: int = Path(
         ...,
         ge=1,
@@ -115,20 +367,52 @@ def get_post_by_id(
         example="ejemplo 1",
     ),
     include_content: bool = Query(
-        default=True, description="Incluir o no el Contenido"
+        default=True, description="Incluir o no el Contenido (false = view=summary)"
     ),
-    db: Session = Depends(get_db),
+    view: PostView = Query("full", description=VIEW_DESCRIPTION),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: AsyncSession = Depends(get_read_db),
 ):
 
+    if not include_content:
+        view = "summary"
+    only = parse_fields(fields, view)
+    key = make_key("post", id=post_id, view=view, fields=only)
+    cached = caching.lookup(request, key)
+    if cached:
+        return caching.cached_response(cached, request)
+
     repository = PostRepository(db)
-    post_fin = repository.get(post_id)
+    if is_conditional(request):
+        # revalidacion: alcanza con (id, updated_at), sin traer content
+        version = await repository.get(post_id, profile="version")
+        if not version:
+            raise HTTPException(status_code=404, detail="Post no encontrado")
+        await image_variants.refresh([version.image_url])
+        _, modified = _version(version)
+        etag = versions_etag(key, [(version.id, modified)])
+        last_modified = http_date(modified)
+        if not_modified(request, etag, last_modified):
+            return not_modified_response(etag, last_modified)
+
+    post_fin = await repository.get(post_id, profile=loader_profile(view, only))
 
     if not post_fin:
         raise HTTPException(status_code=404, detail="Post no encontrado")
-    if include_content:
-        return PostPublic.model_validate(post_fin, from_attributes=True)
-
-    return PostSummary.model_validate(post_fin, from_attributes=True)
+    await image_variants.refresh([post_fin.image_url])
+    found = post_dict(post_fin, only, view)
+
+    _, modified = _version(post_fin)
+    return caching.store_response(
+        request,
+        key,
+        CachedResponse(
+            dumps(found),
+            versions_etag(key, [(post_fin.id, modified)]),
+            http_date(modified),
+        ),
+        {caching.post_tag(post_id), *caching.image_tags([post_fin])},
+    )
 
 
 @router.post(
@@ -140,7 +424,7 @@ def get_post_by_id(
 async def create_post(
     post: Annotated[PostCreate, Depends(PostCreate.as_form)],
     image: Optional[UploadFile] = File(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     user=Depends(get_current_user),
 ):
 
@@ -152,7 +436,7 @@ async def create_post(
 
         image_url = save["url"] if save else None
 
-        new_post = repository.create_post(
+        new_post = await repository.create_post(
             title=post.title,
             content=post.content,
             author=user,
@@ -161,30 +445,35 @@ async def create_post(
         )
 
         # Hacer commit antes de recargar
-        db.commit()
+        await db.commit()
+        caching.invalidate_created([tag.name for tag in post.tags])
+        # miniaturas y WebP en el pool de procesos; hasta entonces, el original
+        image_variants.schedule(image_url)
 
         # Recargar el post con sus relaciones después del commit
         # Necesitamos recargar porque después del commit el objeto puede estar detached
-        reloaded_post = db.execute(
-            select(PostORM)
-            .options(selectinload(PostORM.tags), selectinload(PostORM.author))
-            .where(PostORM.id == new_post.id)
-        ).scalar_one_or_none()
+        reloaded_post = await repository.get(new_post.id, profile="public")
 
         if not reloaded_post:
-            db.rollback()
+            await db.rollback()
             raise HTTPException(
                 status_code=500, detail="Error al recargar el post después de crearlo"
             )
 
-        return PostPublic.model_validate(reloaded_post, from_attributes=True)
+        # una imagen repetida puede tener los derivados de un upload anterior
+        await image_variants.refresh([reloaded_post.image_url])
+        return json_response(post_dict(reloaded_post), status.HTTP_201_CREATED)
+    except HTTPException:
+        # errores de la imagen (tipo, tamaño): se devuelven tal cual
+        await db.rollback()
+        raise
     except IntegrityError as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=409, detail="El titulo ya existe, prueba con otro"
         )
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         import traceback
 
         error_detail = f"Error SQLAlchemy: {str(e)}\n{traceback.format_exc()}"
@@ -192,7 +481,7 @@ async def create_post(
             status_code=500, detail=f"Error al crear el post: {error_detail}"
         )
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         import traceback
 
         error_detail = f"Error inesperado: {str(e)}\n{traceback.format_exc()}"
@@ -202,7 +491,8 @@ async def create_post(
 
 
 @router.get("", response_model=PaginatedPost)
-def list_post(
+async def list_post(
+    request: Request,
     text: Optional[str] = Query(
         default=None,
         deprecated=True,
@@ -210,7 +500,7 @@ def list_post(
     ),
     query: Optional[str] = Query(
         default=None,
-        description="Busca por titulo de post",
+        description="Busca en titulo y contenido del post",
         alias="Search",
         min_length=3,
         max_length=50,
@@ -218,32 +508,78 @@ def list_post(
     ),
     per_page: int = Query(10, ge=1, le=50, description="Numero de resultados(1-50)"),
     page: int = Query(1, ge=1, description="Numero de pagina >=1"),
-    order_by: Literal["id", "title"] = Query("id", description="campo de orden"),
+    order_by: Literal["id", "title", "created_at", "relevance"] = Query(
+        "id",
+        description="campo de orden; relevance ordena por ranking de Search",
+    ),
     direction: Literal["asc", "desc"] = Query("asc", description="Direccion de orden"),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(
+        default=None,
+        description="Cursor opaco (next_cursor de la respuesta anterior); ignora page",
+    ),
+    include_total: bool = Query(
+        True, description="false evita el conteo (total y total_pages en null)"
+    ),
+    count_mode: Literal["exact", "estimated"] = Query(
+        "exact",
+        description="estimated usa las estadisticas del planner (Postgres)",
+    ),
+    author_id: Optional[int] = Query(
+        None, ge=1, description="Solo los posts de este autor"
+    ),
+    created_after: Optional[datetime] = Query(
+        None, description="Solo los posts creados despues (ISO 8601; sin zona, UTC)"
+    ),
+    view: PostView = Query("card", description=VIEW_DESCRIPTION),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    repository = PostRepository(db)
     query = query or text
-
-    total, items = repository.search(query, order_by, direction, page, per_page)
-
-    total_pages = ceil(total / per_page) if total > 0 else 0
-
-    current_page = 1 if total_pages == 0 else min(page, total_pages)
-    has_prev = current_page > 1
-    has_next = current_page < total_pages if total_pages > 0 else False
-
-    return PaginatedPost(
-        page=current_page,
+    only = parse_fields(fields, view)
+    created_after = _naive_utc(created_after)
+    key = make_key(
+        "posts",
+        search=query,
+        author_id=author_id,
+        created_after=created_after,
+        order_by=order_by,
+        direction=direction,
+        page=page,
+        per_page=per_page,
+        cursor=cursor,
+        total=count_mode if include_total else "none",
+        view=view,
+        fields=only,
+    )
+    cached = caching.lookup(request, key)
+    if cached:
+        return caching.cached_response(cached, request)
+
+    seek = _decode_seek(cursor, order_by, direction)
+    fetch = partial(
+        PostRepository(db).search,
+        query,
+        order_by,
+        direction,
+        page,
+        per_page,
+        cursor=seek,
+        total_mode=count_mode if include_total else "none",
+        author_id=author_id,
+        created_after=created_after,
+    )
+    return await _paginated_response(
+        request,
+        key,
+        fetch,
+        lambda posts: caching.list_tags(order_by, query, (post.id for post in posts)),
+        view,
+        only,
         per_page=per_page,
-        total=total,
-        total_pages=total_pages,
-        has_prev=has_prev,
-        has_next=has_next,
+        seek=seek,
         order_by=order_by,
         direction=direction,
         search=query,
-        items=items,
     )
 
 
@@ -1,7 +1,16 @@
-from typing import Annotated, List, Literal, Optional
+from typing import Annotated, List, Literal, Optional, Union
 
 from fastapi import Form
-from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    EmailStr,
+    Field,
+    computed_field,
+    field_validator,
+)
+
+from app.services.image_variants import variants_for
 
 
 class Tag(BaseModel):
@@ -64,10 +73,40 @@ class PostCreate(BaseModel):
         return cls(title=title, content=content, tags=tag_objs)
 
 
+class ImageVariant(BaseModel):
+    url: str
+    width: int
+    content_type: str
+
+
 class PostPublic(PostBase):
     id: int
     model_config = ConfigDict(from_attributes=True)
 
+    @computed_field
+    @property
+    def image_variants(self) -> List[ImageVariant]:
+        # vacio hasta que se generan los derivados: mientras, se usa image_url.
+        # Solo lee memoria; el router carga los manifiestos (image_variants.refresh)
+        return [ImageVariant(**v) for v in variants_for(self.image_url)]
+
+
+class PostCard(BaseModel):
+    """Item de listado (view=card): extracto de content en lugar del cuerpo."""
+
+    title: str
+    excerpt: str
+    tags: Optional[List[Tag]] = Field(default_factory=list)
+    author: Optional[Author] = None
+    image_url: Optional[str] = None
+    id: int
+    model_config = ConfigDict(from_attributes=True)
+
+    @computed_field
+    @property
+    def image_variants(self) -> List[ImageVariant]:
+        return [ImageVariant(**v) for v in variants_for(self.image_url)]
+
 
 class PostSummary(BaseModel):
     id: int
@@ -75,19 +114,34 @@ class PostSummary(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+PostView = Literal["full", "card", "summary"]
+
+
 class PostUpdate(BaseModel):
     title: Optional[str] = Field(None, min_length=3, max_length=100)
     content: Optional[str] = None
+    # reemplaza la lista completa de tags; [] los quita todos
+    tags: Optional[List[Tag]] = None
 
 
 class PaginatedPost(BaseModel):
-    page: int
-    total: int
-    total_pages: int
+    page: Optional[int] = None  # None cuando se pagina por cursor
+    # None con include_total=false; con estimated, aproximados
+    total: Optional[int] = None
+    total_pages: Optional[int] = None
+    total_mode: Literal["exact", "cached", "estimated", "none"] = "exact"
     per_page: int
     has_prev: bool
     has_next: bool
-    order_by: Literal["id", "title"]
+    order_by: Literal["id", "title", "created_at", "relevance"]
     direction: Literal["asc", "desc"]
     search: Optional[str] = None
-    items: List[PostPublic]
+    next_cursor: Optional[str] = None
+    # segun ?view= (card por defecto) y recortados por ?fields=
+    items: List[Union[PostPublic, PostCard, PostSummary]]
+
+
+class PaginatedPostByTags(PaginatedPost):
+    order_by: Literal["id", "title", "created_at"]
+    tags: List[str]
+    match: Literal["any", "all"]
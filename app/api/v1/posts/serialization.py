@@ -0,0 +1,86 @@
+import json
+from typing import Any, Iterable, Optional, Tuple
+
+from fastapi import HTTPException, Response
+
+from app.services.image_variants import variants_for
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional: sin el usamos json de la stdlib
+    orjson = None
+
+# Camino rapido de las respuestas de posts: los dicts salen directo de las filas
+# ORM (una sola pasada, sin construir PostPublic y volver a validarlo) y se
+# serializan con orjson. El resultado es el mismo JSON que el de los schemas,
+# que siguen documentando las respuestas en OpenAPI.
+
+# campos de cada vista, en el mismo orden que model_dump() de su schema
+VIEW_FIELDS = {
+    # PostPublic
+    "full": ("title", "content", "tags", "author", "image_url", "id", "image_variants"),
+    # PostCard
+    "card": ("title", "excerpt", "tags", "author", "image_url", "id", "image_variants"),
+    # PostSummary
+    "summary": ("id", "title"),
+}
+RELATION_FIELDS = {"tags", "author"}
+
+
+def parse_fields(
+    fields: Optional[str], view: str = "full"
+) -> Optional[Tuple[str, ...]]:
+    """?fields=id,title -> ("title", "id"); None si no se pidio un subconjunto."""
+    if fields is None:
+        return None
+    allowed = VIEW_FIELDS[view]
+    wanted = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = wanted - set(allowed)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Campos desconocidos para view={view}: {', '.join(sorted(unknown))}",
+        )
+    # el id siempre va: sin el no se puede pedir el detalle ni paginar
+    wanted.add("id")
+    return tuple(name for name in allowed if name in wanted)
+
+
+def loader_profile(view: str, fields: Optional[Tuple[str, ...]] = None) -> str:
+    """Perfil de PostRepository que trae justo las columnas de la vista."""
+    if view == "summary":
+        return "summary"
+    profile = "public" if view == "full" else "card"
+    # sin tags ni autor no hace falta cargar las relaciones
+    if fields is not None and not RELATION_FIELDS.intersection(fields):
+        profile += "_columns"
+    return profile
+
+
+def _value(post, name: str) -> Any:
+    if name == "tags":
+        return [{"name": tag.name} for tag in post.tags]
+    if name == "author":
+        author = post.author
+        return {"name": author.name, "email": author.email} if author else None
+    if name == "image_variants":
+        return variants_for(post.image_url)
+    return getattr(post, name)
+
+
+def post_dict(post, fields: Optional[Iterable[str]] = None, view: str = "full") -> dict:
+    """El post en la vista pedida (o solo esos campos) a partir del ORM."""
+    return {name: _value(post, name) for name in fields or VIEW_FIELDS[view]}
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def json_response(content: Any, status_code: int = 200) -> Response:
+    # devolver un Response evita que FastAPI valide y serialice de nuevo
+    return Response(
+        content=dumps(content), status_code=status_code, media_type="application/json"
+    )
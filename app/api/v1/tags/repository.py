@@ -0,0 +1,47 @@
+from typing import List, Literal
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.post import post_tags
+from app.models.tag import TagORM
+
+
+class TagRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def list_counts(
+        self, order_by: Literal["count", "name"], min_count: int, limit: int
+    ) -> List[TagORM]:
+        # lee el contador materializado: no toca post_tags ni posts
+        order = (
+            (TagORM.post_count.desc(), TagORM.key)
+            if order_by == "count"
+            else (TagORM.key,)
+        )
+        tags = (
+            select(TagORM)
+            .where(TagORM.post_count >= min_count)
+            .order_by(*order)
+            .limit(limit)
+        )
+        return list((await self.db.scalars(tags)).all())
+
+    async def rebuild_counts(self) -> int:
+        """Recalcula todos los post_count desde post_tags en una sola sentencia.
+
+        Devuelve cuantos tags tenian el contador desfasado."""
+        actual = (
+            select(func.count())
+            .where(post_tags.c.tag_id == TagORM.id)
+            .correlate(TagORM)
+            .scalar_subquery()
+        )
+        result = await self.db.execute(
+            update(TagORM)
+            .where(TagORM.post_count != actual)
+            .values(post_count=actual)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
@@ -0,0 +1,24 @@
+from typing import List, Literal
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.replicas import get_read_db
+
+from .repository import TagRepository
+from .schemas import TagCount
+
+router = APIRouter(prefix="/tags", tags=["tags"])
+
+
+@router.get("", response_model=List[TagCount])
+async def list_tags(
+    order_by: Literal["count", "name"] = Query(
+        "count", description="count: los mas usados primero; name: alfabetico"
+    ),
+    min_count: int = Query(1, ge=0, description="Oculta tags con menos posts"),
+    limit: int = Query(100, ge=1, le=1000, description="Cantidad de tags"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    tags = await TagRepository(db).list_counts(order_by, min_count, limit)
+    return [TagCount.model_validate(tag) for tag in tags]
@@ -0,0 +1,7 @@
+from pydantic import BaseModel, ConfigDict
+
+
+class TagCount(BaseModel):
+    name: str
+    post_count: int
+    model_config = ConfigDict(from_attributes=True)
@@ -1,7 +1,9 @@
 from fastapi import APIRouter, File, UploadFile
 
-from app.services.save_file import save_upload_image
+from app.services import image_variants
+from app.services.save_file import measure_upload, save_upload_image
 
+# el tamaño maximo lo corta UploadLimitMiddleware sobre el stream del request
 router = APIRouter(prefix="/upload", tags=["uploads"])
 
 
@@ -10,8 +12,15 @@ MEDIA_DIR = "app/media"
 
 # ... quiere decir REQUERIDO
 @router.post("/bytes")
-async def upload_bytes(file: bytes = File(...)):
-    return {"file_name": "Archivo subido", "size_bytes": len(file)}
+async def upload_bytes(file: UploadFile = File(...)):
+    # se lee en chunks: el archivo nunca se carga entero en memoria
+    report = await measure_upload(file)
+    return {
+        "file_name": "Archivo subido",
+        "size_bytes": report["bytes_written"],
+        "duration_ms": report["duration_ms"],
+        "throughput_mb_s": report["throughput_mb_s"],
+    }
 
 
 @router.post("/file")
@@ -23,9 +32,15 @@ async def upload_file(file: UploadFile = File(...)):
 @router.post("/save")
 async def save_files(file: UploadFile = File(...)):
     save = await save_upload_image(file)
+    image_variants.schedule(save["url"])
 
     return {
         "filename": save["filename"],
         "conten_type": save["content_type"],
         "url": save["url"],
+        "sha256": save["sha256"],
+        "deduplicated": save["deduplicated"],
+        "bytes_written": save["bytes_written"],
+        "duration_ms": save["duration_ms"],
+        "throughput_mb_s": save["throughput_mb_s"],
     }
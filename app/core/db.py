@@ -1,16 +1,82 @@
 import os
+from typing import AsyncIterator, Type
 
 from dotenv import load_dotenv
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from app.core.instrumentation import instrument_engine
+from app.core.pool_stats import PoolStats, timed_pool_class
 
 load_dotenv()
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+# Driver async equivalente para cada motor (el sync sigue usandose en los scripts)
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+    "mysql": "aiomysql",
+}
+ASYNC_READY_DRIVERS = {"aiosqlite", "asyncpg", "psycopg", "aiomysql", "asyncmy"}
+
+
+def to_async_url(url: str) -> str:
+    parsed = make_url(url)
+    backend, driver = parsed.get_backend_name(), parsed.get_driver_name()
+    if driver in ASYNC_READY_DRIVERS or backend not in ASYNC_DRIVERS:
+        return url
+    return parsed.set(
+        drivername=f"{backend}+{ASYNC_DRIVERS[backend]}"
+    ).render_as_string(hide_password=False)
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or to_async_url(DATABASE_URL)
+
+
+def env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).strip().lower() in ("1", "true", "yes", "on")
+
+
+# Configuracion del pool desde el entorno
+DB_ECHO = env_flag("DB_ECHO", "false")  # muestra el SQL ejecutado en la terminal
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "-1"))  # segundos, -1 = nunca
+DB_POOL_PRE_PING = env_flag("DB_POOL_PRE_PING", "true")
+DB_POOL_SLOW_WAIT_MS = float(os.getenv("DB_POOL_SLOW_WAIT_MS", "100"))
+
+pool_stats = {
+    "sync": PoolStats("sync", slow_wait_ms=DB_POOL_SLOW_WAIT_MS),
+    "async": PoolStats("async", slow_wait_ms=DB_POOL_SLOW_WAIT_MS),
+}
+
+
+def engine_options(url: str, base_pool: Type[Pool], stats: PoolStats) -> dict:
+    options = {"echo": DB_ECHO, "pool_pre_ping": DB_POOL_PRE_PING}
+    if make_url(url).database in (None, "", ":memory:"):
+        # SQLite en memoria usa un pool propio de una sola conexion
+        return options
+    return {
+        **options,
+        "poolclass": timed_pool_class(base_pool, stats),
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+    }
+
 
 engine = create_engine(
-    DATABASE_URL, echo=True, future=True
-)  ## echo=True , muestra el SQL ejecutado para que lo veamos enla terminal, Future=True, le decimos que queremos ocupar la sintaxis moderna de SQlAlchemy
+    DATABASE_URL,
+    future=True,
+    **engine_options(DATABASE_URL, QueuePool, pool_stats["sync"]),
+)  ## Future=True, le decimos que queremos ocupar la sintaxis moderna de SQlAlchemy
+pool_stats["sync"].attach(engine)
+instrument_engine(engine)
 
 SessionLocal = sessionmaker(
     bind=engine,
@@ -20,15 +86,27 @@ SessionLocal = sessionmaker(
     expire_on_commit=False,
 )  # autoflush lo que hace es no enviar cambios hasta hacer el Commit si esta en FALSE, si queres que se guarden de forma inmediata, lo mismo autocomit=False , hace que se tenga un control explicito sobrel el commit
 
+# Engine async para la API: las consultas no bloquean el event loop
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    **engine_options(ASYNC_DATABASE_URL, AsyncAdaptedQueuePool, pool_stats["async"]),
+)
+pool_stats["async"].attach(async_engine.sync_engine)
+instrument_engine(async_engine.sync_engine)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+
 
 class Base(DeclarativeBase):
     pass
 
 
 # Funcion con la cual Creamos la session, y la cerramos cuando no la usammos
-def get_db() -> Session:
-    db = SessionLocal()
-    try:
+async def get_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as db:
         yield db  ## FASTAPI Expera una dependencia de tipo generadora, es como que le deceimos te entrego esta DB y cuando termines de hacer lo q tengas q hacer y ahi Cirreo la DB.
-    finally:
-        db.close()
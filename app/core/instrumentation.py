@@ -0,0 +1,122 @@
+import json
+import logging
+import os
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Optional
+
+from sqlalchemy import Engine, event
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Medimos cuantas sentencias SQL y cuanto tiempo de DB cuesta cada request, sin
+# depender del echo global. El contexto del request viaja en un ContextVar, que
+# llega tanto a las rutas async como a las que corren en el threadpool.
+
+SERVER_TIMING = os.getenv("SERVER_TIMING", "true").strip().lower() in ("1", "true")
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "0"))  # 0 = log apagado
+
+slow_logger = logging.getLogger("app.slow_requests")
+
+
+class RequestStats:
+    def __init__(self):
+        self.statements = 0
+        self.db_time = 0.0
+        self.slowest = 0.0
+        self.slowest_sql: Optional[str] = None
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.statements += 1
+        self.db_time += elapsed
+        if elapsed >= self.slowest:
+            self.slowest = elapsed
+            self.slowest_sql = statement
+
+    def server_timing(self, total: float) -> str:
+        return (
+            f'db;dur={self.db_time * 1000:.2f};desc="{self.statements} queries", '
+            f"db-slowest;dur={self.slowest * 1000:.2f}, "
+            f"app;dur={total * 1000:.2f}"
+        )
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar(
+    "request_db_stats", default=None
+)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    return _current.get()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Registra los hooks de tiempo en un engine sync (o async_engine.sync_engine)."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = perf_counter() - conn.info["query_start"].pop()
+        stats = _current.get()
+        if stats is not None:
+            stats.record(statement, elapsed)
+
+    @event.listens_for(engine, "handle_error")
+    def _error(exception_context):
+        # si la sentencia fallo no hay after_cursor_execute: descartamos su inicio
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start"):
+            conn.info["query_start"].pop()
+
+
+class QueryStatsMiddleware:
+    """Agrega Server-Timing con el costo de DB y loguea los requests lentos."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        start = perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if SERVER_TIMING:
+                    headers = MutableHeaders(scope=message)
+                    headers.append(
+                        "Server-Timing", stats.server_timing(perf_counter() - start)
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            elapsed_ms = (perf_counter() - start) * 1000
+            if SLOW_REQUEST_MS and elapsed_ms >= SLOW_REQUEST_MS:
+                slow_logger.warning(
+                    json.dumps(
+                        {
+                            "method": scope["method"],
+                            "path": scope["path"],
+                            "query": scope.get("query_string", b"").decode(),
+                            "status": status_code,
+                            "duration_ms": round(elapsed_ms, 2),
+                            "db_statements": stats.statements,
+                            "db_ms": round(stats.db_time * 1000, 2),
+                            "slowest_ms": round(stats.slowest * 1000, 2),
+                            "slowest_sql": (stats.slowest_sql or "")[:500],
+                        }
+                    )
+                )
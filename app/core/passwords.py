@@ -0,0 +1,142 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+try:
+    from argon2 import PasswordHasher
+    from argon2.exceptions import InvalidHashError, VerificationError
+except ImportError:  # argon2-cffi es opcional: sin el usamos scrypt de hashlib
+    PasswordHasher = None
+
+# Hash de contraseñas. Un hash con costo razonable tarda decenas o cientos de ms
+# de CPU: nunca se calcula en el event loop sino en un pool de threads propio y
+# acotado (argon2 y scrypt sueltan el GIL), asi un pico de logins no frena al
+# resto de los requests ni le come los threads al threadpool de Starlette.
+#
+# Formatos guardados en users.password_hash:
+#   $argon2id$v=19$m=65536,t=3,p=4$<salt>$<hash>
+#   $scrypt$n=16384,r=8,p=1$<salt>$<hash>
+# Los parametros van en el hash: si cambia el costo configurado, el proximo
+# login exitoso vuelve a hashear con el nuevo (needs_rehash).
+
+PASSWORD_SCHEME = os.getenv(
+    "PASSWORD_SCHEME", "argon2" if PasswordHasher is not None else "scrypt"
+)
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", "3"))
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", "65536"))  # KiB
+ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", "4"))
+SCRYPT_N = int(os.getenv("SCRYPT_N", str(2**14)))
+SCRYPT_R = int(os.getenv("SCRYPT_R", "8"))
+SCRYPT_P = int(os.getenv("SCRYPT_P", "1"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+
+SCRYPT_PREFIX = "$scrypt$"
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _argon2() -> "PasswordHasher":
+    if PasswordHasher is None:
+        raise RuntimeError("PASSWORD_SCHEME=argon2 requiere el paquete argon2-cffi")
+    return PasswordHasher(
+        time_cost=ARGON2_TIME_COST,
+        memory_cost=ARGON2_MEMORY_COST,
+        parallelism=ARGON2_PARALLELISM,
+    )
+
+
+def _b64(raw: bytes) -> str:
+    return base64.b64encode(raw).decode().rstrip("=")
+
+
+def _unb64(text: str) -> bytes:
+    return base64.b64decode(text + "=" * (-len(text) % 4))
+
+
+def _scrypt(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    return hashlib.scrypt(
+        password.encode(), salt=salt, n=n, r=r, p=p, maxmem=256 * n * r + 2**20
+    )
+
+
+def _parse_scrypt(encoded: str) -> Tuple[int, int, int, bytes, bytes]:
+    params, salt, digest = encoded[len(SCRYPT_PREFIX) :].split("$")
+    values = dict(item.split("=") for item in params.split(","))
+    return (
+        int(values["n"]),
+        int(values["r"]),
+        int(values["p"]),
+        _unb64(salt),
+        _unb64(digest),
+    )
+
+
+def hash_password(password: str) -> str:
+    """Hashea con el esquema y costo configurados (bloquea: usar el pool)."""
+    if PASSWORD_SCHEME == "argon2":
+        return _argon2().hash(password)
+    salt = os.urandom(16)
+    digest = _scrypt(password, salt, SCRYPT_N, SCRYPT_R, SCRYPT_P)
+    return f"{SCRYPT_PREFIX}n={SCRYPT_N},r={SCRYPT_R},p={SCRYPT_P}${_b64(salt)}${_b64(digest)}"
+
+
+def verify_password(password: str, encoded: str) -> bool:
+    if encoded.startswith(SCRYPT_PREFIX):
+        try:
+            n, r, p, salt, expected = _parse_scrypt(encoded)
+        except (ValueError, KeyError):
+            return False
+        return hmac.compare_digest(_scrypt(password, salt, n, r, p), expected)
+    if encoded.startswith("$argon2") and PasswordHasher is not None:
+        try:
+            return PasswordHasher().verify(encoded, password)
+        except (VerificationError, InvalidHashError):
+            return False
+    return False
+
+
+def needs_rehash(encoded: str) -> bool:
+    """True si el hash no usa el esquema o los parametros configurados hoy."""
+    if PASSWORD_SCHEME == "argon2":
+        return not encoded.startswith("$argon2") or _argon2().check_needs_rehash(
+            encoded
+        )
+    if not encoded.startswith(SCRYPT_PREFIX):
+        return True
+    n, r, p, _, _ = _parse_scrypt(encoded)
+    return (n, r, p) != (SCRYPT_N, SCRYPT_R, SCRYPT_P)
+
+
+def verify_and_update(password: str, encoded: str) -> Tuple[bool, Optional[str]]:
+    """Verifica y, si el costo cambio, devuelve el hash nuevo para guardar."""
+    if not verify_password(password, encoded):
+        return False, None
+    if needs_rehash(encoded):
+        return True, hash_password(password)
+    return True, None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+        )
+    return _executor
+
+
+async def run_in_hash_pool(func, *args):
+    """Corre func en el pool de hashing sin bloquear el event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), func, *args)
+
+
+def shutdown() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -0,0 +1,111 @@
+import logging
+import threading
+from time import perf_counter
+from typing import Optional, Type
+
+from sqlalchemy import Engine, event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import Pool
+
+logger = logging.getLogger("app.db.pool")
+
+
+class PoolStats:
+    """Contadores de un pool de conexiones para dimensionarlo con datos reales."""
+
+    def __init__(self, name: str, slow_wait_ms: float = 100.0):
+        self.name = name
+        self.slow_wait_ms = slow_wait_ms
+        self.engine: Optional[Engine] = None
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.connects = 0
+            self.checkouts = 0
+            self.invalidations = 0
+            self.timeouts = 0
+            self.slow_waits = 0
+            self.wait_total = 0.0
+            self.wait_max = 0.0
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+            if seconds * 1000 >= self.slow_wait_ms:
+                self.slow_waits += 1
+        if timed_out or seconds * 1000 >= self.slow_wait_ms:
+            logger.warning(
+                "pool %s: espera de %.1f ms por una conexion (%s)",
+                self.name,
+                seconds * 1000,
+                self.snapshot(),
+            )
+
+    def attach(self, engine: Engine) -> None:
+        # escuchamos en el engine: los eventos siguen aplicando si el pool se recrea
+        self.engine = engine
+
+        @event.listens_for(engine, "connect")
+        def _on_connect(dbapi_connection, connection_record):
+            with self._lock:
+                self.connects += 1
+
+        @event.listens_for(engine, "checkout")
+        def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+            with self._lock:
+                self.checkouts += 1
+
+        @event.listens_for(engine, "invalidate")
+        def _on_invalidate(dbapi_connection, connection_record, exception):
+            with self._lock:
+                self.invalidations += 1
+
+    def snapshot(self) -> dict:
+        pool = self.engine.pool if self.engine is not None else None
+        with self._lock:
+            waits = self.checkouts + self.timeouts
+            return {
+                "pool": type(pool).__name__ if pool else None,
+                "size": _call(pool, "size"),
+                "checked_out": _call(pool, "checkedout"),
+                "idle": _call(pool, "checkedin"),
+                # QueuePool arranca overflow en -size; solo interesan las extra
+                "overflow": max(_call(pool, "overflow") or 0, 0),
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "slow_waits": self.slow_waits,
+                "wait_avg_ms": round(self.wait_total / waits * 1000, 3) if waits else 0,
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+            }
+
+
+def _call(pool: Optional[Pool], method: str):
+    fn = getattr(pool, method, None)
+    return fn() if callable(fn) else None
+
+
+def timed_pool_class(base: Type[Pool], stats: PoolStats) -> Type[Pool]:
+    """Subclase del pool que mide cuanto se espera para obtener una conexion.
+
+    Los pools no tienen evento "antes del checkout", asi que medimos _do_get. La
+    clase guarda stats como atributo de clase para sobrevivir a pool.recreate().
+    """
+
+    def _do_get(self):
+        start = perf_counter()
+        try:
+            connection = base._do_get(self)
+        except PoolTimeoutError:
+            stats.record_wait(perf_counter() - start, timed_out=True)
+            raise
+        stats.record_wait(perf_counter() - start)
+        return connection
+
+    return type(f"Timed{base.__name__}", (base,), {"_do_get": _do_get})
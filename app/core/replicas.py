@@ -0,0 +1,234 @@
+import logging
+import os
+import threading
+from time import time
+from typing import AsyncIterator, List, Optional
+
+from fastapi import Depends, Request
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.db import (
+    DB_POOL_SLOW_WAIT_MS,
+    engine_options,
+    get_db,
+    pool_stats,
+    to_async_url,
+)
+from app.core.instrumentation import instrument_engine
+from app.core.pool_stats import PoolStats
+
+# Lecturas a replicas. Con DATABASE_REPLICA_URLS (separadas por coma) las rutas
+# de solo lectura usan get_read_db, que reparte entre replicas en round-robin; las
+# escrituras usan get_write_db, siempre contra el primario.
+#
+# - Salud: la conexion de la replica se abre al entregar la sesion (con el
+#   pre-ping del pool). Si falla, la replica queda afuera REPLICA_RETRY_SECONDS y
+#   el request sigue con la siguiente o con el primario.
+# - Read-your-writes: despues de un commit en el primario el cliente recibe una
+#   cookie y durante READ_YOUR_WRITES_SECONDS lee del primario (sin cache), asi
+#   no ve una replica atrasada sin su propio cambio.
+# - Caches compartidos: en esa misma ventana despues de cualquier escritura, lo
+#   que lee una replica no se guarda en el cache de respuestas ni en el de
+#   totales (stale_replica_read); si no, la invalidacion de la escritura se
+#   volveria a llenar con datos viejos para todos los demas clientes.
+#
+# Para probarlo local: DATABASE_URL=sqlite:///./primary.db y
+# DATABASE_REPLICA_URLS=sqlite:///./replica.db (copiando el archivo para "replicar").
+
+DATABASE_REPLICA_URLS = [
+    url.strip()
+    for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",")
+    if url.strip()
+]
+REPLICA_RETRY_SECONDS = float(os.getenv("REPLICA_RETRY_SECONDS", "30"))
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+PRIMARY_COOKIE = "db_primary_until"
+
+logger = logging.getLogger("app.db.replicas")
+
+# ultimo commit en el primario de este proceso (los caches tambien son locales)
+_last_primary_write = 0.0
+
+
+class Replica:
+    def __init__(self, name: str, url: str):
+        self.name = name
+        async_url = to_async_url(url)
+        stats = PoolStats(name, slow_wait_ms=DB_POOL_SLOW_WAIT_MS)
+        self.engine = create_async_engine(
+            async_url, **engine_options(async_url, AsyncAdaptedQueuePool, stats)
+        )
+        stats.attach(self.engine.sync_engine)
+        instrument_engine(self.engine.sync_engine)
+        pool_stats[name] = stats
+        self.sessions = async_sessionmaker(
+            bind=self.engine, autoflush=False, expire_on_commit=False
+        )
+        self.down_until = 0.0
+        self.failures = 0
+        self.reads = 0
+
+
+class ReplicaRouter:
+    """Round-robin entre replicas sanas; None si no queda ninguna."""
+
+    def __init__(self, replicas: List[Replica], retry_seconds: float):
+        self.replicas = replicas
+        self.retry_seconds = retry_seconds
+        self._next = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_urls(cls, urls: List[str], retry_seconds: float) -> "ReplicaRouter":
+        replicas = [Replica(f"replica{i}", url) for i, url in enumerate(urls)]
+        return cls(replicas, retry_seconds)
+
+    def _candidates(self) -> List[Replica]:
+        now = time()
+        with self._lock:
+            start = self._next
+            self._next = (self._next + 1) % len(self.replicas)
+        ordered = self.replicas[start:] + self.replicas[:start]
+        # una replica caida vuelve a probarse cuando vence su retry
+        return [replica for replica in ordered if replica.down_until <= now]
+
+    def mark_down(self, replica: Replica, error: Exception) -> None:
+        replica.failures += 1
+        replica.down_until = time() + self.retry_seconds
+        logger.warning(
+            "replica %s fuera por %.0f s: %r", replica.name, self.retry_seconds, error
+        )
+
+    async def session(self) -> Optional[AsyncSession]:
+        for replica in self._candidates():
+            db = replica.sessions()
+            db.info["replica"] = replica
+            try:
+                # abre la conexion ya: si la replica no responde, probamos otra
+                await db.connection()
+            except (DBAPIError, OSError) as e:
+                await db.close()
+                self.mark_down(replica, e)
+                continue
+            replica.reads += 1
+            return db
+        return None
+
+    def stats(self) -> dict:
+        now = time()
+        return {
+            replica.name: {
+                "healthy": replica.down_until <= now,
+                "reads": replica.reads,
+                "failures": replica.failures,
+                "retry_in_s": round(max(replica.down_until - now, 0), 1),
+            }
+            for replica in self.replicas
+        }
+
+
+replica_router: Optional[ReplicaRouter] = (
+    ReplicaRouter.from_urls(DATABASE_REPLICA_URLS, REPLICA_RETRY_SECONDS)
+    if DATABASE_REPLICA_URLS
+    else None
+)
+
+
+def wants_primary(request: Request) -> bool:
+    """True si hay replicas y el cliente escribio hace poco (cookie vigente)."""
+    if replica_router is None:
+        return False
+    try:
+        return float(request.cookies.get(PRIMARY_COOKIE, 0)) > time()
+    except ValueError:
+        return False
+
+
+def recent_primary_write() -> bool:
+    """True si hubo un commit en el primario hace menos de READ_YOUR_WRITES_SECONDS."""
+    return time() < _last_primary_write + READ_YOUR_WRITES_SECONDS
+
+
+def replica_session(db: AsyncSession) -> bool:
+    return "replica" in db.info
+
+
+def stale_replica_read(request: Request) -> bool:
+    """True si el request leyo de una replica que quizas no tiene la ultima escritura."""
+    return getattr(request.state, "replica_read", False) and recent_primary_write()
+
+
+@event.listens_for(Session, "after_commit")
+def _remember_write(session: Session) -> None:
+    global _last_primary_write
+    if "replica" in session.info:
+        return
+    _last_primary_write = time()
+    request = session.info.get("request")
+    if request is not None:
+        request.state.db_wrote = True
+
+
+async def get_write_db(
+    request: Request, db: AsyncSession = Depends(get_db)
+) -> AsyncIterator[AsyncSession]:
+    # el commit marca el request; ReadYourWritesMiddleware pone la cookie
+    db.sync_session.info["request"] = request
+    yield db
+
+
+async def get_read_db(
+    request: Request, primary: AsyncSession = Depends(get_db)
+) -> AsyncIterator[AsyncSession]:
+    # la sesion del primario no abre conexion hasta que se usa
+    if replica_router is None or wants_primary(request):
+        yield primary
+        return
+    db = await replica_router.session()
+    if db is None:
+        # todas las replicas caidas: leemos del primario
+        yield primary
+        return
+    # lo lee caching.store_response (ver stale_replica_read)
+    request.state.replica_read = True
+    try:
+        yield db
+    except DBAPIError as e:
+        if e.connection_invalidated:
+            replica_router.mark_down(db.info["replica"], e)
+        raise
+    finally:
+        await db.close()
+
+
+class ReadYourWritesMiddleware:
+    """Pone la cookie de lectura del primario en las respuestas con escrituras."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or replica_router is None:
+            await self.app(scope, receive, send)
+            return
+        # request.state usa este dict: lo compartimos con las rutas
+        state = scope.setdefault("state", {})
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and state.get("db_wrote"):
+                until = time() + READ_YOUR_WRITES_SECONDS
+                MutableHeaders(scope=message).append(
+                    "Set-Cookie",
+                    f"{PRIMARY_COOKIE}={until:.3f}; Max-Age="
+                    f"{int(READ_YOUR_WRITES_SECONDS) or 1}; Path=/; HttpOnly; "
+                    "SameSite=Lax",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
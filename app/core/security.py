@@ -1,15 +1,24 @@
 import os
+import uuid
 from datetime import datetime, timedelta, timezone
+from time import perf_counter
 from typing import Optional
 
 import jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 
+from app.core.token_cache import TokenCache
+
 SECRET_KEY = os.getenv("SECRET_KEY", "change-me-in-prod")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
 
+# Claims ya verificados por token (TOKEN_CACHE_TTL_SECONDS=0 lo desactiva)
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "1024"))
+TOKEN_CACHE_TTL_SECONDS = float(os.getenv("TOKEN_CACHE_TTL_SECONDS", "300"))
+token_cache = TokenCache(TOKEN_CACHE_SIZE, TOKEN_CACHE_TTL_SECONDS)
+
 oauth2_scheme = OAuth2PasswordBearer(
     tokenUrl="/api/v1/auth/login"
 )  # Le decimos a Fastapi ue los toquen se obtendran de esta url
@@ -34,7 +43,8 @@ def create_access_token(data: dict, expire_delta: Optional[timedelta] = None):
     expire = datetime.now(tz=timezone.utc) + (
         expire_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     )
-    to_encode.update({"exp": expire})
+    # jti: dos logins en el mismo segundo no comparten token (ni su logout)
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
     token = jwt.encode(payload=to_encode, key=SECRET_KEY, algorithm=ALGORITHM)
     return token
 
@@ -44,6 +54,20 @@ def decode_token(token: str) -> dict:
     return payload
 
 
+def rotate_secret(new_key: str) -> None:
+    """Cambia la clave de firma: los tokens cacheados se vuelven a verificar."""
+    global SECRET_KEY
+    SECRET_KEY = new_key
+    token_cache.clear()
+
+
+def revoke_token(token: str) -> None:
+    """Logout: el token se rechaza en este proceso hasta que venza."""
+    # ya lo verifico get_current_user; solo necesitamos el exp
+    claims = jwt.decode(token, options={"verify_signature": False})
+    token_cache.revoke(token, claims.get("exp"))
+
+
 def get_current_user(token: str = Depends(oauth2_scheme)):
     credentials_exc = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -51,14 +75,26 @@ def get_current_user(token: str = Depends(oauth2_scheme)):
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+    user = token_cache.get(token)
+    if user is not None:
+        return user
+    if token_cache.is_revoked(token):
+        raise credentials_exc
+
+    started = perf_counter()
     try:
         payload = decode_token(token)
-        sub = payload.get("sub")
-        username = payload.get("username")
-        if not sub or not username:
-            raise credentials_exc
-        return {"email": sub, "username": username}
     except jwt.ExpiredSignatureError:
         raise raise_expired_token()
     except jwt.InvalidTokenError:
         raise credentials_exc
+    finally:
+        token_cache.record_verification(perf_counter() - started)
+
+    sub = payload.get("sub")
+    username = payload.get("username")
+    if not sub or not username:
+        raise credentials_exc
+    user = {"email": sub, "username": username}
+    token_cache.put(token, user, payload.get("exp"))
+    return user
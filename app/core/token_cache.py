@@ -0,0 +1,123 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from time import time
+from typing import Dict, NamedTuple, Optional
+
+# Cache de tokens ya verificados: evita repetir la verificacion HMAC y el decode
+# del JWT en rafagas de requests con el mismo token. La clave es el sha256 del
+# token (no guardamos tokens en memoria) y ninguna entrada vive mas que el exp.
+
+
+class _Entry(NamedTuple):
+    claims: dict
+    expires_at: float  # epoch: min(ahora + ttl, exp del token)
+    exp: Optional[float]
+
+
+def token_digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
+class TokenCache:
+    """LRU acotado de claims verificados, con lista de tokens revocados."""
+
+    def __init__(self, max_entries: int, ttl: float, max_revoked: int = 10000):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_revoked = max_revoked
+        self._entries: "OrderedDict[bytes, _Entry]" = OrderedDict()
+        # logout: digest -> exp, hasta que el token venceria solo
+        self._revoked: "OrderedDict[bytes, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        self.hits = self.misses = 0
+        self.verifications = 0
+        self.verify_total = 0.0
+        self.verify_max = 0.0
+
+    def get(self, token: str) -> Optional[dict]:
+        digest = token_digest(token)
+        now = time()
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None or entry.expires_at <= now:
+                if entry is not None:
+                    del self._entries[digest]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            return entry.claims
+
+    def put(self, token: str, claims: dict, exp: Optional[float]) -> None:
+        if self.ttl <= 0 or self.max_entries <= 0:
+            return
+        expires_at = time() + self.ttl
+        if exp is not None:
+            expires_at = min(expires_at, exp)
+        digest = token_digest(token)
+        with self._lock:
+            if digest in self._revoked:
+                return
+            self._entries[digest] = _Entry(claims, expires_at, exp)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def record_verification(self, seconds: float) -> None:
+        with self._lock:
+            self.verifications += 1
+            self.verify_total += seconds
+            self.verify_max = max(self.verify_max, seconds)
+
+    def revoke(self, token: str, exp: Optional[float]) -> None:
+        """Hook de logout: saca el token del cache y lo rechaza hasta su exp."""
+        digest = token_digest(token)
+        now = time()
+        with self._lock:
+            self._entries.pop(digest, None)
+            self._revoked[digest] = exp if exp is not None else now + self.ttl
+            # limpiamos los que ya vencieron y acotamos el tamaño
+            for key in [k for k, until in self._revoked.items() if until <= now]:
+                del self._revoked[key]
+            while len(self._revoked) > self.max_revoked:
+                self._revoked.popitem(last=False)
+
+    def is_revoked(self, token: str) -> bool:
+        with self._lock:
+            until = self._revoked.get(token_digest(token))
+        return until is not None and until > time()
+
+    def clear(self) -> None:
+        """Hook de rotacion de clave: todo token se vuelve a verificar."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "revoked": len(self._revoked),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "verifications": self.verifications,
+                "verify_avg_ms": (
+                    round(self.verify_total / self.verifications * 1000, 3)
+                    if self.verifications
+                    else 0
+                ),
+                "verify_max_ms": round(self.verify_max * 1000, 3),
+                # tiempo de verificacion que se ahorraron los hits
+                "saved_ms": (
+                    round(self.hits * self.verify_total / self.verifications * 1000, 3)
+                    if self.verifications
+                    else 0
+                ),
+            }
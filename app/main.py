@@ -1,29 +1,50 @@
 import os
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
 
 from app.api.v1.auth.router import router as auth_router
+from app.api.v1.monitoring.router import router as monitoring_router
 from app.api.v1.posts.router import router as post_router
+from app.api.v1.tags.router import router as tags_router
 from app.api.v1.upload.router import router as upload_router
 
 # 👇 ¡IMPORTAR modelos antes de create_all!
+from app.core import passwords
 from app.core.db import Base, engine, get_db
+from app.core.instrumentation import QueryStatsMiddleware
+from app.core.replicas import ReadYourWritesMiddleware
+from app.services import image_variants
+from app.services.media_files import MediaFiles
+from app.services.save_file import UploadLimitMiddleware
 
 # Solo en desarrollo: crear tablas si no existen
 
 MEDIA_DIR = "app/media"
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # cortamos el pool de procesos de derivados de imagenes
+    image_variants.shutdown()
+    passwords.shutdown()
+
+
 def create_app() -> FastAPI:
-    app = FastAPI(title="Mini blo")
+    app = FastAPI(title="Mini blo", lifespan=lifespan)
     Base.metadata.create_all(bind=engine)
+    app.add_middleware(QueryStatsMiddleware)
+    app.add_middleware(ReadYourWritesMiddleware)
+    app.add_middleware(UploadLimitMiddleware)
     app.include_router(auth_router, prefix="/api/v1")
+    app.include_router(monitoring_router, prefix="/api/v1")
     app.include_router(post_router)
+    app.include_router(tags_router)
     app.include_router(upload_router)
 
     os.makedirs(MEDIA_DIR, exist_ok=True)  # CREAMOS LA CARPETA SI No eXISTE
-    app.mount("/media", StaticFiles(directory=MEDIA_DIR), name="media")
+    app.mount("/media", MediaFiles(directory=MEDIA_DIR), name="media")
 
     return app
 
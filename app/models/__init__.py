@@ -1,6 +1,8 @@
 # Importar todos los modelos para que estén disponibles
 from .author import AuthorORM
 from .post import PostORM, post_tags
+from .search import search_posts
 from .tag import TagORM
+from .user import UserORM
 
-__all__ = ["AuthorORM", "PostORM", "TagORM", "post_tags"]
+__all__ = ["AuthorORM", "PostORM", "TagORM", "UserORM", "post_tags", "search_posts"]
@@ -18,5 +18,5 @@ class AuthorORM(Base):
     email: Mapped[str] = mapped_column(String(100), unique=True, index=True)
 
     posts: Mapped[List["PostORM"]] = relationship(
-        back_populates="author"
+        back_populates="author", lazy="raise"
     )  # UN Author puede tener muchos Post
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+from datetime import datetime, timezone
 from typing import TYPE_CHECKING, List, Optional
 
 from sqlalchemy import (
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     Table,
@@ -13,7 +15,8 @@ from sqlalchemy import (
     func,
     null,
 )
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.orm import Mapped, mapped_column, query_expression, relationship
 
 from app.core.db import Base
 
@@ -22,6 +25,22 @@ if TYPE_CHECKING:
     from .tag import TagORM
 
 
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+# en SQLite created_at se guarda como texto: usamos el mismo formato que
+# CURRENT_TIMESTAMP (sin microsegundos) para que los valores que bindeamos en
+# filtros y cursores comparen igual que los de las filas con server_default
+CREATED_AT_TYPE = DateTime().with_variant(
+    sqlite.DATETIME(
+        storage_format="%(year)04d-%(month)02d-%(day)02d "
+        "%(hour)02d:%(minute)02d:%(second)02d"
+    ),
+    "sqlite",
+)
+
+
 post_tags = Table(
     "post_tags",
     Base.metadata,
@@ -34,18 +53,60 @@ class PostORM(Base):
     __tablename__ = "posts"
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     title: Mapped[str] = mapped_column(String(150), nullable=False)
-    content: Mapped[str] = mapped_column(Text, nullable=False)
-    image_url: Mapped[Optional[str]] = mapped_column(String(300), nullable=True)
-    created_at: Mapped[DateTime] = mapped_column(
-        DateTime, server_default=func.now(), nullable=False
+    # diferido: los listados no traen el cuerpo salvo que el perfil de carga lo
+    # pida (undefer); leerlo sin cargar falla, igual que las relaciones
+    content: Mapped[str] = mapped_column(
+        Text, nullable=False, deferred=True, deferred_raiseload=True
+    )
+    # extracto calculado en SQL, solo con with_expression (perfil "card")
+    excerpt: Mapped[Optional[str]] = query_expression()
+    # indexado: el GC de media cuenta los posts que referencian cada archivo
+    image_url: Mapped[Optional[str]] = mapped_column(
+        String(300), nullable=True, index=True
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        CREATED_AT_TYPE, server_default=func.now(), nullable=False
+    )
+    # se genera en Python (con microsegundos) para que dos ediciones seguidas den
+    # ETags distintos; server_default cubre filas insertadas por SQL directo
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=utcnow,
+        onupdate=utcnow,
+        server_default=func.now(),
+        nullable=False,
     )
 
     author_id: Mapped[Optional[int]] = mapped_column(ForeignKey("authors.id"))
-    author: Mapped[Optional[AuthorORM]] = relationship(back_populates="posts")
+    # sin carga implicita: cada consulta elige que relaciones cargar (ver
+    # LOADER_PROFILES en PostRepository), y acceder a una sin cargar falla
+    author: Mapped[Optional[AuthorORM]] = relationship(
+        back_populates="posts", lazy="raise"
+    )
 
     tags: Mapped[List["TagORM"]] = relationship(
         secondary=post_tags,
         back_populates="posts",
-        lazy="selectin",
+        lazy="raise",
         passive_deletes=True,
     )
+
+
+# indice para paginar por cursor ordenando por titulo (ver PostRepository.search)
+Index("ix_posts_lower_title_id", func.lower(PostORM.title), PostORM.id)
+
+# listado mas nuevo primero (order_by=created_at) y filtro created_after
+Index("ix_posts_created_at_id", PostORM.created_at, PostORM.id)
+
+# listados de un autor, por id o por fecha (filtro author_id)
+Index("ix_posts_author_id_id", PostORM.author_id, PostORM.id)
+Index(
+    "ix_posts_author_id_created_at_id",
+    PostORM.author_id,
+    PostORM.created_at,
+    PostORM.id,
+)
+
+# la PK de post_tags es (post_id, tag_id); by-tags filtra por tag_id, asi que
+# necesita el indice al reves (ver PostRepository.by_tags)
+Index("ix_post_tags_tag_id_post_id", post_tags.c.tag_id, post_tags.c.post_id)
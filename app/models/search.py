@@ -0,0 +1,106 @@
+import re
+from typing import List, Optional, Tuple
+
+from sqlalchemy import (
+    DDL,
+    ColumnElement,
+    Subquery,
+    bindparam,
+    event,
+    func,
+    literal_column,
+    or_,
+    select,
+    text,
+)
+
+from .post import PostORM
+
+# Motor de busqueda de posts (titulo + contenido).
+# - SQLite: tabla FTS5 "sombra" (external content) sincronizada con triggers.
+# - Postgres: indice GIN sobre una expresion tsvector, siempre al dia.
+# - Otros motores: ILIKE sobre titulo y contenido, sin ranking.
+
+_PG_DOCUMENT = (
+    "setweight(to_tsvector('simple', coalesce({p}title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce({p}content, '')), 'B')"
+)
+
+SQLITE_SEARCH_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5("
+    "title, content, content='posts', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS posts_fts_ai AFTER INSERT ON posts BEGIN "
+    "INSERT INTO posts_fts(rowid, title, content) "
+    "VALUES (new.id, new.title, new.content); END",
+    "CREATE TRIGGER IF NOT EXISTS posts_fts_ad AFTER DELETE ON posts BEGIN "
+    "INSERT INTO posts_fts(posts_fts, rowid, title, content) "
+    "VALUES ('delete', old.id, old.title, old.content); END",
+    "CREATE TRIGGER IF NOT EXISTS posts_fts_au AFTER UPDATE OF title, content "
+    "ON posts BEGIN "
+    "INSERT INTO posts_fts(posts_fts, rowid, title, content) "
+    "VALUES ('delete', old.id, old.title, old.content); "
+    "INSERT INTO posts_fts(rowid, title, content) "
+    "VALUES (new.id, new.title, new.content); END",
+]
+SQLITE_REBUILD = "INSERT INTO posts_fts(posts_fts) VALUES ('rebuild')"
+
+POSTGRES_SEARCH_DDL = [
+    "CREATE INDEX IF NOT EXISTS ix_posts_search ON posts USING GIN (("
+    + _PG_DOCUMENT.format(p="")
+    + "))",
+]
+
+for _statement in SQLITE_SEARCH_DDL:
+    event.listen(
+        PostORM.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite")
+    )
+for _statement in POSTGRES_SEARCH_DDL:
+    event.listen(
+        PostORM.__table__,
+        "after_create",
+        DDL(_statement).execute_if(dialect="postgresql"),
+    )
+event.listen(
+    PostORM.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS posts_fts").execute_if(dialect="sqlite"),
+)
+
+
+def _terms(query: str) -> List[str]:
+    return re.findall(r"\w+", query.lower())
+
+
+def search_posts(
+    query: str, dialect: str
+) -> Tuple[Optional[ColumnElement], Optional[ColumnElement], Optional[Subquery]]:
+    """Devuelve (filtro, score, subconsulta a unir); score mayor = mas relevante."""
+    terms = _terms(query)
+    if not terms:
+        return PostORM.title.ilike(f"%{query}%"), None, None
+
+    if dialect == "sqlite":
+        # busqueda por prefijo de cada termino ("pyth" encuentra "python")
+        match = " ".join(f'"{term}"*' for term in terms)
+        fts = (
+            select(
+                literal_column("posts_fts.rowid").label("post_id"),
+                (-literal_column("bm25(posts_fts, 10.0, 1.0)")).label("score"),
+            )
+            .select_from(text("posts_fts"))
+            .where(text("posts_fts MATCH :fts_query").bindparams(fts_query=match))
+            .subquery("fts")
+        )
+        return None, fts.c.score, fts
+
+    if dialect == "postgresql":
+        document = literal_column("(" + _PG_DOCUMENT.format(p="posts.") + ")")
+        tsquery = func.to_tsquery(
+            literal_column("'simple'"),
+            bindparam("ts_query", " & ".join(f"{term}:*" for term in terms)),
+        )
+        return document.op("@@")(tsquery), func.ts_rank(document, tsquery), None
+
+    pattern = f"%{query}%"
+    return or_(PostORM.title.ilike(pattern), PostORM.content.ilike(pattern)), None, None
@@ -15,10 +15,19 @@ class TagORM(Base):
     __tablename__ = "tags"
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     name: Mapped[str] = mapped_column(String(100), unique=True, index=True)
+    # nombre normalizado (strip + lower): se busca y se deduplica por esta columna
+    key: Mapped[str] = mapped_column(
+        String(100), unique=True, index=True, nullable=False
+    )
+    # contador desnormalizado de post_tags: se ajusta con UPDATE relativos
+    # (post_count = post_count + n) en la misma transaccion que cambia los links
+    post_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0", index=True
+    )
 
     posts: Mapped[List["PostORM"]] = relationship(
         secondary="post_tags",
         back_populates="tags",
-        lazy="selectin",
+        lazy="raise",
         passive_deletes=True,
     )
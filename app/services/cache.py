@@ -0,0 +1,162 @@
+import os
+import threading
+from collections import OrderedDict
+from time import monotonic
+from typing import Dict, Iterable, NamedTuple, Optional, Protocol, Set
+
+# Cache de respuestas de lectura. Cada entrada guarda el JSON ya serializado y un
+# conjunto de etiquetas ("post:3", "posts:list", ...) para invalidar con precision
+# solo lo que cambia cuando se escribe un post.
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    # si Last-Modified sirve para If-Modified-Since (no en colecciones)
+    allow_modified_since: bool = True
+
+
+class CacheBackend(Protocol):
+    def get(self, key: str) -> Optional[CachedResponse]: ...
+
+    def set(self, key: str, value: CachedResponse, tags: Iterable[str]) -> None: ...
+
+    def invalidate(self, tags: Iterable[str]) -> int: ...
+
+    def clear(self) -> None: ...
+
+    def stats(self) -> dict: ...
+
+
+class NullCache:
+    def get(self, key: str) -> Optional[CachedResponse]:
+        return None
+
+    def set(self, key: str, value: CachedResponse, tags: Iterable[str]) -> None:
+        pass
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        return 0
+
+    def clear(self) -> None:
+        pass
+
+    def stats(self) -> dict:
+        return {"backend": "none"}
+
+
+class _Entry(NamedTuple):
+    value: CachedResponse
+    expires_at: float
+    size: int
+    tags: frozenset
+
+
+class LRUTTLCache:
+    """LRU en memoria con TTL, acotado por cantidad de entradas y por bytes."""
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._by_tag: Dict[str, Set[str]] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at <= monotonic():
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def set(self, key: str, value: CachedResponse, tags: Iterable[str]) -> None:
+        size = len(key) + len(value.body)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            entry = _Entry(value, monotonic() + self.ttl, size, frozenset(tags))
+            self._entries[key] = entry
+            self._bytes += size
+            for tag in entry.tags:
+                self._by_tag.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        with self._lock:
+            keys = set()
+            for tag in tags:
+                keys |= self._by_tag.get(tag, set())
+            for key in keys:
+                self._remove(key)
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_tag.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": "memory",
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+        for tag in entry.tags:
+            keys = self._by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_tag[tag]
+
+
+def make_key(name: str, **params) -> str:
+    # parametros normalizados: orden fijo y listas ordenadas, para que
+    # ?tags=a&tags=b y ?tags=b&tags=a compartan entrada
+    parts = []
+    for param, value in sorted(params.items()):
+        if isinstance(value, (list, tuple, set)):
+            value = ",".join(sorted(str(v) for v in value))
+        parts.append(f"{param}={value}")
+    return f"{name}?{'&'.join(parts)}"
+
+
+def build_cache() -> CacheBackend:
+    if os.getenv("CACHE_BACKEND", "memory").lower() == "none":
+        return NullCache()
+    return LRUTTLCache(
+        max_entries=int(os.getenv("CACHE_MAX_ENTRIES", "1024")),
+        max_bytes=int(os.getenv("CACHE_MAX_BYTES", str(32 * 1024 * 1024))),
+        ttl=float(os.getenv("CACHE_TTL_SECONDS", "60")),
+    )
+
+
+response_cache: CacheBackend = build_cache()
@@ -0,0 +1,303 @@
+import asyncio
+import json
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from time import monotonic
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.db import env_flag
+from app.services.cache import response_cache
+from app.services.save_file import media_path
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow es opcional: sin el se sirve siempre el original
+    Image = ImageOps = None
+
+# Derivados de las imagenes subidas (anchos configurados, en WebP y en el formato
+# original), generados en un pool de procesos fuera del request. Se guardan al
+# lado del original:
+#   ab/cd/<sha>.png  ->  ab/cd/<sha>_w320.webp, ab/cd/<sha>_w320.png, ...
+# y un manifiesto <sha>.variants.json que se escribe al final: si existe, los
+# derivados estan completos. Mientras tanto la API solo expone el original.
+# Serializar un post no toca el disco: lee lo que el pipeline dejo en memoria
+# (ver refresh para los manifiestos de otros procesos).
+
+IMAGE_VARIANTS = env_flag("IMAGE_VARIANTS", "true")
+IMAGE_VARIANT_WIDTHS = [
+    int(width)
+    for width in os.getenv("IMAGE_VARIANT_WIDTHS", "320,640,1280").split(",")
+    if width.strip()
+]
+IMAGE_VARIANT_QUALITY = int(os.getenv("IMAGE_VARIANT_QUALITY", "80"))
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", "2"))
+
+MANIFEST_SUFFIX = ".variants.json"
+DERIVATIVE_RE = re.compile(r"_w\d+\.(webp|png|jpg)$|" + re.escape(MANIFEST_SUFFIX))
+FORMATS = {".png": ("PNG", "image/png"), ".jpg": ("JPEG", "image/jpeg")}
+
+logger = logging.getLogger("app.media.variants")
+
+IMAGE_READY_CACHE_SIZE = int(os.getenv("IMAGE_READY_CACHE_SIZE", "4096"))
+IMAGE_MISS_TTL_SECONDS = float(os.getenv("IMAGE_MISS_TTL_SECONDS", "10"))
+
+_executor: Optional[ProcessPoolExecutor] = None
+_pending: Dict[str, asyncio.Future] = {}
+# derivados listos por url (LRU acotado). Los registra el pipeline al terminar
+# y refresh cuando encuentra el manifiesto en disco; un derivado listo no cambia
+# mas (el nombre es el hash)
+_ready: "OrderedDict[str, Tuple[datetime, List[dict]]]" = OrderedDict()
+# urls sin manifiesto -> cuando volver a buscarlo (lookup negativo con TTL)
+_missing: "OrderedDict[str, float]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def enabled() -> bool:
+    return IMAGE_VARIANTS and Image is not None and bool(IMAGE_VARIANT_WIDTHS)
+
+
+def is_derivative(name: str) -> bool:
+    return DERIVATIVE_RE.search(name) is not None
+
+
+def manifest_path(source: str) -> str:
+    return os.path.splitext(source)[0] + MANIFEST_SUFFIX
+
+
+def derivative_paths(source: str) -> List[str]:
+    """Archivos generados a partir de source (derivados y manifiesto)."""
+    directory, name = os.path.split(source)
+    stem = os.path.splitext(name)[0]
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return []
+    return [
+        os.path.join(directory, other)
+        for other in names
+        if other.startswith(f"{stem}_w") or other == stem + MANIFEST_SUFFIX
+    ]
+
+
+def cache_tag(image_url: str) -> str:
+    """Etiqueta de las respuestas cacheadas que muestran la imagen sin derivados."""
+    return f"media:{image_url}"
+
+
+def _save(image, path: str, format: str) -> None:
+    partial = f"{path}.part"
+    options = {"quality": IMAGE_VARIANT_QUALITY} if format != "PNG" else {}
+    image.save(partial, format=format, optimize=True, **options)
+    os.replace(partial, path)
+
+
+def generate_variants(source: str, widths: List[int]) -> List[dict]:
+    """Corre en el pool de procesos: genera los derivados y escribe el manifiesto."""
+    stem, ext = os.path.splitext(source)
+    original_format, original_type = FORMATS[ext]
+    variants = []
+    with Image.open(source) as opened:
+        image = ImageOps.exif_transpose(opened)
+        if image.mode not in ("RGB", "RGBA", "L", "LA"):
+            image = image.convert("RGBA")
+        # nunca agrandamos; el WebP al ancho original tambien sirve
+        targets = sorted({w for w in widths if w < image.width} | {image.width})
+        for width in targets:
+            height = max(1, round(image.height * width / image.width))
+            resized = image.resize((width, height), Image.Resampling.LANCZOS)
+            outputs = [(".webp", "WEBP", "image/webp")]
+            if width != image.width:
+                outputs.append((ext, original_format, original_type))
+            for suffix, format, content_type in outputs:
+                frame = resized
+                if format == "JPEG" and frame.mode not in ("RGB", "L"):
+                    frame = frame.convert("RGB")
+                path = f"{stem}_w{width}{suffix}"
+                _save(frame, path, format)
+                variants.append(
+                    {
+                        "file": os.path.basename(path),
+                        "width": width,
+                        "content_type": content_type,
+                    }
+                )
+
+    manifest = manifest_path(source)
+    with open(f"{manifest}.part", "w") as out:
+        json.dump({"variants": variants}, out)
+    os.replace(f"{manifest}.part", manifest)
+    return variants
+
+
+def _read_manifest(source: str) -> Optional[Tuple[float, List[dict]]]:
+    """(mtime, variantes) del manifiesto de source, o None si todavia no esta."""
+    manifest = manifest_path(source)
+    try:
+        with open(manifest) as file:
+            variants = json.load(file)["variants"]
+        return os.stat(manifest).st_mtime, variants
+    except (FileNotFoundError, ValueError, KeyError):
+        return None
+
+
+def build_variants(source: str, widths: List[int]) -> Tuple[float, List[dict]]:
+    """Corre en el pool: genera los derivados si falta el manifiesto."""
+    existing = _read_manifest(source)
+    if existing is not None:
+        return existing
+    variants = generate_variants(source, widths)
+    return os.stat(manifest_path(source)).st_mtime, variants
+
+
+def _remember(image_url: str, mtime: float, variants: List[dict]) -> None:
+    ready_at = datetime.fromtimestamp(mtime, timezone.utc).replace(tzinfo=None)
+    base = image_url.rsplit("/", 1)[0]
+    urls = [
+        {
+            "url": f"{base}/{item['file']}",
+            "width": item["width"],
+            "content_type": item["content_type"],
+        }
+        for item in variants
+    ]
+    with _lock:
+        _missing.pop(image_url, None)
+        _ready[image_url] = (ready_at, urls)
+        _ready.move_to_end(image_url)
+        while len(_ready) > IMAGE_READY_CACHE_SIZE:
+            _ready.popitem(last=False)
+
+
+def _cached(image_url: str) -> Optional[Tuple[datetime, List[dict]]]:
+    with _lock:
+        entry = _ready.get(image_url)
+        if entry is not None:
+            _ready.move_to_end(image_url)
+        return entry
+
+
+def _needs_lookup(image_url: Optional[str]) -> bool:
+    if not image_url or _cached(image_url) is not None:
+        return False
+    with _lock:
+        retry_at = _missing.get(image_url)
+    return retry_at is None or retry_at <= monotonic()
+
+
+def _lookup(image_url: str) -> None:
+    """Busca el manifiesto en disco (bloquea: correr fuera del event loop)."""
+    source = media_path(image_url)
+    found = _read_manifest(source) if source is not None else None
+    if found is not None:
+        _remember(image_url, *found)
+        return
+    with _lock:
+        _missing[image_url] = monotonic() + IMAGE_MISS_TTL_SECONDS
+        _missing.move_to_end(image_url)
+        while len(_missing) > IMAGE_READY_CACHE_SIZE:
+            _missing.popitem(last=False)
+
+
+async def refresh(image_urls: Iterable[Optional[str]]) -> None:
+    """Carga en memoria los derivados de estas imagenes antes de serializar.
+
+    Solo va al disco (en el threadpool) por las urls que no estan en memoria ni
+    se buscaron hace menos de IMAGE_MISS_TTL_SECONDS: asi se encuentran los
+    manifiestos de otros procesos o de antes de un reinicio.
+    """
+    if not enabled():
+        return
+    missing = {url for url in image_urls if _needs_lookup(url)}
+    if missing:
+        await run_in_threadpool(lambda: [_lookup(url) for url in missing])
+
+
+def load(image_url: Optional[str]) -> List[dict]:
+    """Como variants_for, pero mira el disco si hace falta (bloquea)."""
+    if enabled() and _needs_lookup(image_url):
+        _lookup(image_url)
+    return variants_for(image_url)
+
+
+def variants_for(image_url: Optional[str]) -> List[dict]:
+    """Derivados listos de la imagen ([] si todavia no hay: se usa el original).
+
+    Solo lee memoria (ver refresh): se llama al serializar cada post.
+    """
+    if not image_url or not enabled():
+        return []
+    loaded = _cached(image_url)
+    return loaded[1] if loaded else []
+
+
+def ready_at(image_url: Optional[str]) -> Optional[datetime]:
+    """Cuando quedaron listos los derivados; cambia la version de la respuesta."""
+    if not image_url or not enabled():
+        return None
+    loaded = _cached(image_url)
+    return loaded[0] if loaded else None
+
+
+def forget(image_url: str) -> None:
+    # el GC borro el original y sus derivados
+    with _lock:
+        _ready.pop(image_url, None)
+        _missing.pop(image_url, None)
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=IMAGE_WORKERS)
+    return _executor
+
+
+def schedule(image_url: Optional[str]) -> Optional[asyncio.Future]:
+    """Encola la generacion de derivados (una vez por imagen) y vuelve enseguida."""
+    if not enabled() or not image_url:
+        return None
+    if image_url in _pending:
+        return _pending[image_url]
+    source = media_path(image_url)
+    if source is None or os.path.splitext(source)[1] not in FORMATS:
+        return None
+    if _cached(image_url) is not None:
+        return None
+
+    # si el manifiesto ya existe (misma imagen subida antes) el worker lo lee
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(
+        _get_executor(), build_variants, source, IMAGE_VARIANT_WIDTHS
+    )
+    _pending[image_url] = future
+
+    def _done(done: asyncio.Future) -> None:
+        _pending.pop(image_url, None)
+        if done.cancelled():
+            return
+        if done.exception() is not None:
+            logger.error("derivados de %s: %r", image_url, done.exception())
+            return
+        mtime, variants = done.result()
+        # desde aca las respuestas los incluyen sin tocar el disco
+        _remember(image_url, mtime, variants)
+        # las respuestas cacheadas con la imagen sin derivados quedan viejas
+        response_cache.invalidate([cache_tag(image_url)])
+        logger.info("derivados de %s listos (%d)", image_url, len(variants))
+
+    future.add_done_callback(_done)
+    return future
+
+
+def shutdown() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -0,0 +1,90 @@
+import os
+import re
+from typing import Optional
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+from app.services import image_variants
+from app.services.save_file import INCOMING_DIR, MEDIA_URL_PREFIX
+
+# Servido de /media. Los archivos con nombre por contenido (<sha256>[_w<ancho>])
+# no cambian nunca, asi que van con cache inmutable de un año. Range y 304 los
+# resuelve FileResponse; si el servidor ASGI soporta la extension
+# http.response.pathsend, el archivo se manda sin copiarlo por Python.
+#
+# Con MEDIA_ACCEL el proxy de adelante entrega el archivo:
+#   x-accel-redirect  nginx: location interna MEDIA_ACCEL_PREFIX -> app/media
+#   x-sendfile        apache/lighttpd: ruta absoluta del archivo
+
+MEDIA_MAX_AGE = int(os.getenv("MEDIA_MAX_AGE", "3600"))  # nombres no inmutables
+MEDIA_ACCEL = os.getenv("MEDIA_ACCEL", "").strip().lower()
+MEDIA_ACCEL_PREFIX = os.getenv("MEDIA_ACCEL_PREFIX", "/protected-media/")
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+CONTENT_NAMED_RE = re.compile(r"^[0-9a-f]{64}(_w\d+)?\.(png|jpg|webp)$")
+NEGOTIABLE_RE = re.compile(r"^(?P<stem>.+?)(?P<width>_w\d+)?\.(png|jpg)$")
+
+
+def cache_control(name: str) -> str:
+    if CONTENT_NAMED_RE.match(name):
+        return IMMUTABLE
+    return f"public, max-age={MEDIA_MAX_AGE}"
+
+
+class MediaFiles(StaticFiles):
+    """StaticFiles con cache inmutable, eleccion de WebP por Accept y offload."""
+
+    def webp_alternative(self, path: str) -> Optional[str]:
+        """Ruta del WebP equivalente a path (mismo ancho), si ya se genero."""
+        directory, name = os.path.split(path)
+        match = NEGOTIABLE_RE.match(name)
+        if match is None:
+            return None
+        if match["width"]:
+            candidate = os.path.join(directory, f"{match['stem']}{match['width']}.webp")
+        else:
+            # original: el WebP de mayor ancho es el de tamaño completo
+            # corre en un thread: puede leer el manifiesto del disco
+            variants = image_variants.load(MEDIA_URL_PREFIX + path.replace(os.sep, "/"))
+            webps = [v for v in variants if v["content_type"] == "image/webp"]
+            if not webps:
+                return None
+            best = max(webps, key=lambda v: v["width"])
+            candidate = os.path.join(directory, best["url"].rsplit("/", 1)[1])
+        _, stat_result = self.lookup_path(candidate)
+        return candidate if stat_result is not None else None
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        if path.split(os.sep, 1)[0] == INCOMING_DIR:
+            raise HTTPException(status_code=404)
+
+        negotiable = NEGOTIABLE_RE.match(os.path.basename(path)) is not None
+        if negotiable and "image/webp" in Headers(scope=scope).get("accept", ""):
+            path = await anyio.to_thread.run_sync(self.webp_alternative, path) or path
+
+        response = await super().get_response(path, scope)
+        response.headers["Cache-Control"] = cache_control(os.path.basename(path))
+        if negotiable:
+            # la misma url puede ser PNG/JPEG o WebP segun lo que acepte el cliente
+            response.headers["Vary"] = "Accept"
+        if MEDIA_ACCEL and isinstance(response, FileResponse):
+            return self.offload(response, path)
+        return response
+
+    def offload(self, response: FileResponse, path: str) -> Response:
+        headers = {
+            key: value
+            for key, value in response.headers.items()
+            if key in ("content-type", "cache-control", "vary", "etag", "last-modified")
+        }
+        if MEDIA_ACCEL == "x-sendfile":
+            headers["X-Sendfile"] = os.path.abspath(response.path)
+        else:
+            location = MEDIA_ACCEL_PREFIX.rstrip("/") + "/" + path.replace(os.sep, "/")
+            headers["X-Accel-Redirect"] = location
+        return Response(status_code=response.status_code, headers=headers)
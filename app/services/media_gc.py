@@ -0,0 +1,109 @@
+import logging
+import os
+import time
+from typing import Iterable, List
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.models.post import PostORM
+from app.services import image_variants, save_file
+from app.services.save_file import media_path, media_url
+
+# Conteo de referencias de los archivos de media: un archivo vive mientras algun
+# post lo tenga en image_url. No guardamos un contador aparte; contar sobre el
+# indice de posts.image_url no puede desincronizarse de los posts reales.
+#
+# El periodo de gracia cubre el hueco entre subir una imagen y commitear el post
+# que la usa: un archivo subido o reutilizado hace poco nunca se borra.
+
+MEDIA_GC_GRACE_SECONDS = float(os.getenv("MEDIA_GC_GRACE_SECONDS", "600"))
+
+logger = logging.getLogger("app.media.gc")
+
+
+def _remove_if_stale(path: str, grace: float) -> bool:
+    try:
+        if time.time() - os.stat(path).st_mtime < grace:
+            return False
+        os.remove(path)
+    except FileNotFoundError:
+        return False
+    for derivative in image_variants.derivative_paths(path):
+        try:
+            os.remove(derivative)
+        except FileNotFoundError:
+            pass
+    # limpiamos los shards que quedaron vacios
+    root = os.path.abspath(save_file.MEDIA_DIR)
+    parent = os.path.dirname(os.path.abspath(path))
+    while parent != root:
+        try:
+            os.rmdir(parent)
+        except OSError:
+            break
+        parent = os.path.dirname(parent)
+    return True
+
+
+def _has_source(derivative: str) -> bool:
+    directory, name = os.path.split(derivative)
+    stem = image_variants.DERIVATIVE_RE.split(name)[0]
+    return any(
+        os.path.exists(os.path.join(directory, stem + ext))
+        for ext in image_variants.FORMATS
+    )
+
+
+async def count_references(db: AsyncSession, url: str) -> int:
+    return await db.scalar(
+        select(func.count()).select_from(PostORM).where(PostORM.image_url == url)
+    )
+
+
+async def collect_unreferenced(db: AsyncSession, urls: Iterable[str]) -> List[str]:
+    """Borra los archivos de esas urls que ya no usa ningun post."""
+    removed = []
+    for url in set(urls):
+        path = media_path(url)
+        if path is None or await count_references(db, url):
+            continue
+        if await run_in_threadpool(_remove_if_stale, path, MEDIA_GC_GRACE_SECONDS):
+            image_variants.forget(url)
+            removed.append(url)
+    if removed:
+        logger.info("media gc: %d archivos borrados %s", len(removed), removed)
+    return removed
+
+
+async def sweep(db: AsyncSession, batch_size: int = 500) -> List[str]:
+    """Recorre todo MEDIA_DIR y borra lo que no referencia ningun post.
+
+    Levanta lo que el GC en background dejo por el periodo de gracia y los
+    uploads a medio escribir que quedaron en .incoming.
+    """
+    paths = []
+    for directory, _, files in os.walk(save_file.MEDIA_DIR):
+        for name in files:
+            path = os.path.join(directory, name)
+            # los derivados viven y mueren con su original
+            if image_variants.is_derivative(name) and _has_source(path):
+                continue
+            paths.append(path)
+
+    removed = []
+    for start in range(0, len(paths), batch_size):
+        batch = {media_url(path): path for path in paths[start : start + batch_size]}
+        referenced = set(
+            await db.scalars(
+                select(PostORM.image_url).where(PostORM.image_url.in_(list(batch)))
+            )
+        )
+        for url, path in batch.items():
+            if url in referenced:
+                continue
+            if await run_in_threadpool(_remove_if_stale, path, MEDIA_GC_GRACE_SECONDS):
+                image_variants.forget(url)
+                removed.append(url)
+    return removed
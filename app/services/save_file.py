@@ -1,29 +1,223 @@
+import hashlib
+import logging
 import os
-import shutil  # #  Es util para darte los permisos y habildad para copiar y mover archivos
 import uuid
+from time import perf_counter
+from typing import AsyncIterator, Optional, Tuple
 
 from fastapi import File, HTTPException, UploadFile, status
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+# Los archivos se guardan por contenido: app/media/ab/cd/<sha256>.<ext>. Subir la
+# misma imagen dos veces reutiliza el archivo; el GC (app/services/media_gc.py)
+# borra los que ya no referencia ningun post.
 MEDIA_DIR = "app/media"
+INCOMING_DIR = ".incoming"  # uploads a medio escribir, antes de saber su hash
+MEDIA_URL_PREFIX = "/media/"
 ALLOW_MIME = ["image/png", "image/jpeg"]
 
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(5 * 1024 * 1024)))
+UPLOAD_CHUNK_BYTES = int(os.getenv("UPLOAD_CHUNK_BYTES", str(64 * 1024)))
+# margen para los boundaries y campos de texto de un multipart/form-data
+FORM_OVERHEAD_BYTES = 64 * 1024
+
+# El content_type lo manda el cliente: el tipo real sale de los primeros bytes
+IMAGE_SIGNATURES = {
+    b"\x89PNG\r\n\x1a\n": ("image/png", ".png"),
+    b"\xff\xd8\xff": ("image/jpeg", ".jpg"),
+}
+
+logger = logging.getLogger("app.uploads")
+
+
+def sniff_image(head: bytes) -> Optional[Tuple[str, str]]:
+    """Devuelve (content_type, extension) segun la firma del archivo."""
+    for signature, detected in IMAGE_SIGNATURES.items():
+        if head.startswith(signature):
+            return detected
+    return None
+
+
+def _too_large() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+        detail=f"El archivo supera el maximo de {MAX_UPLOAD_BYTES} bytes",
+    )
+
+
+class UploadLimitMiddleware:
+    """Corta con 413 los multipart/form-data que superan el maximo de upload.
+
+    FastAPI parsea el form (y vuelca los archivos a disco) antes de resolver las
+    dependencias, asi que el limite va sobre el stream del request: con
+    Content-Length se rechaza sin leer el cuerpo; sin el (chunked) se cuentan
+    los bytes a medida que llegan y se aborta el parseo al pasarse.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        if not headers.get("content-type", "").lower().startswith("multipart/"):
+            # /posts/import recibe NDJSON en crudo y no tiene este limite
+            await self.app(scope, receive, send)
+            return
+
+        limit = MAX_UPLOAD_BYTES + FORM_OVERHEAD_BYTES
+        length = headers.get("content-length")
+        if length and length.isdigit() and int(length) > limit:
+            error = _too_large()
+            response = JSONResponse({"detail": error.detail}, error.status_code)
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # el parser de multipart cierra sus temporales y FastAPI
+                    # responde el 413
+                    raise _too_large()
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+async def iter_upload(
+    file: UploadFile, chunk_size: Optional[int] = None
+) -> AsyncIterator[bytes]:
+    """Lee el archivo en chunks y aborta apenas se pasa del maximo."""
+    if file.size is not None and file.size > MAX_UPLOAD_BYTES:
+        raise _too_large()
+    chunk_size = chunk_size or UPLOAD_CHUNK_BYTES
+    total = 0
+    while chunk := await file.read(chunk_size):
+        total += len(chunk)
+        if total > MAX_UPLOAD_BYTES:
+            raise _too_large()
+        yield chunk
+
+
+def _report(written: int, started: float) -> dict:
+    elapsed = perf_counter() - started
+    return {
+        "bytes_written": written,
+        "duration_ms": round(elapsed * 1000, 2),
+        "throughput_mb_s": round(written / elapsed / 1e6, 2) if elapsed else None,
+    }
+
+
+async def write_stream(
+    first: bytes, chunks: AsyncIterator[bytes], path: str, digest=None
+) -> int:
+    """Escribe los chunks via threadpool, actualizando digest si se pasa uno.
+
+    Si algo falla (archivo demasiado grande, cliente que corta) borra el archivo.
+    """
+    out = await run_in_threadpool(open, path, "wb")
+    written = 0
+    try:
+        chunk = first
+        while chunk:
+            await run_in_threadpool(out.write, chunk)
+            if digest is not None:
+                digest.update(chunk)
+            written += len(chunk)
+            chunk = await anext(chunks, b"")
+    except BaseException:
+        await run_in_threadpool(out.close)
+        await run_in_threadpool(os.remove, path)
+        raise
+    await run_in_threadpool(out.close)
+    return written
+
+
+def media_relpath(sha256: str, ext: str) -> str:
+    # dos niveles de shards (65536 directorios) para que ninguno crezca sin limite
+    return os.path.join(sha256[:2], sha256[2:4], f"{sha256}{ext}")
+
+
+def _store(tmp_path: str, final_path: str) -> bool:
+    """Mueve el upload a su ruta por contenido. Devuelve True si ya existia."""
+    if os.path.exists(final_path):
+        os.remove(tmp_path)
+        # renovamos el mtime: el GC respeta un periodo de gracia desde el ultimo uso
+        os.utime(final_path)
+        return True
+    os.makedirs(os.path.dirname(final_path), exist_ok=True)
+    # dos uploads iguales en paralelo escriben el mismo contenido: da igual cual gane
+    os.replace(tmp_path, final_path)
+    return False
+
+
+def media_path(url: Optional[str]) -> Optional[str]:
+    """Ruta en disco de una url /media/..., o None si apunta fuera de MEDIA_DIR."""
+    if not url or not url.startswith(MEDIA_URL_PREFIX):
+        return None
+    root = os.path.abspath(MEDIA_DIR)
+    path = os.path.abspath(os.path.join(root, url[len(MEDIA_URL_PREFIX) :]))
+    if os.path.commonpath([root, path]) != root or path == root:
+        return None
+    return path
+
+
+def media_url(path: str) -> str:
+    relative = os.path.relpath(path, MEDIA_DIR)
+    return MEDIA_URL_PREFIX + relative.replace(os.sep, "/")
+
 
 async def save_upload_image(file: UploadFile = File(...)):
-    if file.content_type not in ALLOW_MIME:
+    started = perf_counter()
+    chunks = iter_upload(file)
+    first = await anext(chunks, b"")
+
+    detected = sniff_image(first)
+    if detected is None or detected[0] not in ALLOW_MIME:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Solo se permiten imagene jpg o png",
         )
+    content_type, ext = detected
 
-    ext = os.path.splitext(file.filename)[1]
-    filename = f"{uuid.uuid4().hex}{ext}"
-    file_path = os.path.join(MEDIA_DIR, filename)
+    incoming = os.path.join(MEDIA_DIR, INCOMING_DIR)
+    await run_in_threadpool(os.makedirs, incoming, exist_ok=True)
+    tmp_path = os.path.join(incoming, f"{uuid.uuid4().hex}.part")
+    digest = hashlib.sha256()
+    written = await write_stream(first, chunks, tmp_path, digest)
 
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    sha256 = digest.hexdigest()
+    filename = media_relpath(sha256, ext)
+    deduplicated = await run_in_threadpool(
+        _store, tmp_path, os.path.join(MEDIA_DIR, filename)
+    )
 
+    report = _report(written, started)
+    logger.info("upload %s (dedup=%s): %s", filename, deduplicated, report)
     return {
         "filename": filename,
-        "content_type": file.content_type,
-        "url": f"/media/{filename}",
+        "content_type": content_type,
+        "url": MEDIA_URL_PREFIX + filename.replace(os.sep, "/"),
+        "sha256": sha256,
+        "deduplicated": deduplicated,
+        **report,
     }
+
+
+async def measure_upload(file: UploadFile) -> dict:
+    """Recorre el archivo sin guardarlo (solo tamaño y throughput)."""
+    started = perf_counter()
+    size = 0
+    async for chunk in iter_upload(file):
+        size += len(chunk)
+    return _report(size, started)
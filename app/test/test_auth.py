@@ -0,0 +1,217 @@
+import asyncio
+import os
+from datetime import timedelta
+from time import time
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.api.v1.auth.repository import UserRepository
+from app.core import passwords, security
+from app.core.db import Base, get_db
+from app.core.security import (
+    create_access_token,
+    get_current_user,
+    rotate_secret,
+    token_cache,
+)
+from app.core.token_cache import TokenCache
+from app.main import app
+
+client = TestClient(app)
+
+USER = {"sub": "ricardo@example.com", "username": "ricardo"}
+
+# base propia: los tests de login no dependen del orden de los otros modulos
+engine = create_engine("sqlite:///./test_auth.db")
+async_engine = create_async_engine(
+    "sqlite+aiosqlite:///./test_auth.db", poolclass=NullPool
+)
+SessionLocal = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    token_cache.clear()
+    token_cache.reset_stats()
+    yield
+    token_cache.clear()
+
+
+def test_token_cache_hits_after_first_verification():
+    token = create_access_token(USER)
+
+    first = get_current_user(token)
+    second = get_current_user(token)
+
+    assert first == second == {"email": USER["sub"], "username": "ricardo"}
+    stats = token_cache.stats()
+    assert stats["verifications"] == 1
+    assert stats["hits"] == 1 and stats["misses"] == 1
+    assert stats["hit_ratio"] == 0.5
+
+
+def test_token_cache_never_outlives_exp():
+    cache = TokenCache(max_entries=10, ttl=300)
+    cache.put("vencido", {"email": "x"}, exp=time() - 1)
+    cache.put("vigente", {"email": "y"}, exp=time() + 60)
+
+    assert cache.get("vencido") is None
+    assert cache.get("vigente") == {"email": "y"}
+
+
+def test_token_cache_is_bounded_lru():
+    cache = TokenCache(max_entries=2, ttl=300)
+    cache.put("a", {"n": 1}, exp=None)
+    cache.put("b", {"n": 2}, exp=None)
+    cache.get("a")
+    cache.put("c", {"n": 3}, exp=None)
+
+    assert cache.get("b") is None
+    assert cache.get("a") and cache.get("c")
+    assert cache.stats()["entries"] == 2
+
+
+def test_expired_token_is_rejected():
+    token = create_access_token(USER, expire_delta=timedelta(seconds=-1))
+
+    with pytest.raises(HTTPException) as exc:
+        get_current_user(token)
+    assert exc.value.detail == "Token expirado"
+    assert token_cache.stats()["entries"] == 0
+
+
+def test_logout_revokes_cached_token():
+    token = create_access_token(USER)
+    get_current_user(token)
+
+    response = client.post(
+        "/api/v1/auth/logout", headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 204
+
+    with pytest.raises(HTTPException) as exc:
+        get_current_user(token)
+    assert exc.value.status_code == 401
+    # otro token del mismo usuario sigue valido
+    assert get_current_user(create_access_token(USER))["username"] == "ricardo"
+
+
+def test_rotate_secret_drops_cached_tokens():
+    original = security.SECRET_KEY
+    token = create_access_token(USER)
+    get_current_user(token)
+    try:
+        rotate_secret("otra-clave")
+        with pytest.raises(HTTPException):
+            get_current_user(token)
+        assert get_current_user(create_access_token(USER))["username"] == "ricardo"
+    finally:
+        rotate_secret(original)
+
+
+def test_auth_cache_stats_endpoint():
+    token = create_access_token(USER)
+    get_current_user(token)
+    get_current_user(token)
+
+    stats = client.get("/api/v1/monitoring/auth-cache").json()
+    assert stats["hits"] == 1
+    assert stats["verifications"] == 1
+    assert {"hit_ratio", "verify_avg_ms", "verify_max_ms", "entries"} <= set(stats)
+
+
+@pytest.fixture
+def users_db(monkeypatch):
+    # scrypt barato: el test no mide el costo, solo que se respete
+    monkeypatch.setattr(passwords, "PASSWORD_SCHEME", "scrypt")
+    monkeypatch.setattr(passwords, "SCRYPT_N", 2**10)
+    Base.metadata.create_all(bind=engine)
+
+    async def override_get_db():
+        async with SessionLocal() as db:
+            yield db
+
+    previous = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = override_get_db
+    yield
+    if previous is None:
+        app.dependency_overrides.pop(get_db)
+    else:
+        app.dependency_overrides[get_db] = previous
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+    os.remove("test_auth.db")
+
+
+def create_user(email: str, username: str, password: str):
+    async def create():
+        async with SessionLocal() as db:
+            user = await UserRepository(db).create(email, username, password)
+            await db.commit()
+            return user
+
+    return asyncio.run(create())
+
+
+def stored_hash(email: str) -> str:
+    async def load():
+        async with SessionLocal() as db:
+            return (await UserRepository(db).get_by_email(email)).password_hash
+
+    return asyncio.run(load())
+
+
+def login(email: str, password: str):
+    return client.post(
+        "/api/v1/auth/login", data={"username": email, "password": password}
+    )
+
+
+def test_login_checks_hashed_password(users_db):
+    user = create_user("Ana@Example.com", "ana", "secreta")
+    assert user.password_hash.startswith("$scrypt$n=1024,")
+    assert "secreta" not in user.password_hash
+
+    response = login("ana@example.com", "secreta")
+    assert response.status_code == 200
+    claims = security.decode_token(response.json()["access_token"])
+    assert claims["sub"] == "ana@example.com" and claims["username"] == "ana"
+
+    assert login("ana@example.com", "otra").status_code == 401
+    assert login("nadie@example.com", "secreta").status_code == 401
+
+
+def test_login_rehashes_when_cost_changes(users_db, monkeypatch):
+    create_user("ana@example.com", "ana", "secreta")
+    old_hash = stored_hash("ana@example.com")
+
+    assert login("ana@example.com", "secreta").status_code == 200
+    assert stored_hash("ana@example.com") == old_hash
+
+    monkeypatch.setattr(passwords, "SCRYPT_N", 2**11)
+
+    # el repositorio solo deja el hash nuevo en la session; commitea la ruta
+    async def authenticate_and_rollback():
+        async with SessionLocal() as db:
+            user, rehashed = await UserRepository(db).authenticate(
+                "ana@example.com", "secreta"
+            )
+            await db.rollback()
+            return user is not None and rehashed
+
+    assert asyncio.run(authenticate_and_rollback())
+    assert stored_hash("ana@example.com") == old_hash
+
+    assert login("ana@example.com", "secreta").status_code == 200
+    new_hash = stored_hash("ana@example.com")
+    assert new_hash.startswith("$scrypt$n=2048,")
+    assert passwords.verify_password("secreta", new_hash)
+    # una contraseña erronea nunca reescribe el hash
+    monkeypatch.setattr(passwords, "SCRYPT_N", 2**10)
+    assert login("ana@example.com", "otra").status_code == 401
+    assert stored_hash("ana@example.com") == new_hash
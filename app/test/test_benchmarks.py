@@ -0,0 +1,65 @@
+import os
+
+import pytest
+from sqlalchemy import create_engine, func, select
+
+from app.models.post import PostORM, post_tags
+from app.models.tag import TagORM
+from benchmarks.common import Sample, parse_server_timing, percentile, summarize
+from benchmarks.seed import seed
+
+SEED_PATH = "test_seed.db"
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine(f"sqlite:///{SEED_PATH}")
+    yield engine
+    engine.dispose()
+    os.remove(SEED_PATH)
+
+
+def tag_counts(engine) -> dict:
+    with engine.connect() as conn:
+        return dict(conn.execute(select(TagORM.key, TagORM.post_count)).all())
+
+
+def test_seed_is_deterministic_and_zipf_skewed(engine):
+    report = seed(engine, 500, authors=20, tags=100, seed=7, batch_size=128)
+    assert report["posts"] == 500
+
+    with engine.connect() as conn:
+        assert conn.scalar(select(func.count()).select_from(PostORM)) == 500
+        links = dict(
+            conn.execute(
+                select(post_tags.c.tag_id, func.count()).group_by(post_tags.c.tag_id)
+            ).all()
+        )
+        counts = dict(conn.execute(select(TagORM.id, TagORM.post_count)).all())
+    # post_count queda igual que las filas reales de post_tags
+    assert {tag: n for tag, n in counts.items() if n} == links
+
+    # Zipf: el tag mas usado supera por mucho a la mediana
+    used = sorted(counts.values(), reverse=True)
+    assert used[0] > 10 * used[len(used) // 2]
+
+    # misma semilla, mismos datos
+    first = tag_counts(engine)
+    seed(engine, 500, authors=20, tags=100, seed=7, reset=True)
+    assert tag_counts(engine) == first
+
+
+def test_percentiles_and_server_timing():
+    ordered = [float(ms) for ms in range(1, 101)]
+    assert percentile(ordered, 50) == 50
+    assert percentile(ordered, 99) == 99
+    assert percentile([], 95) == 0.0
+
+    header = 'db;dur=3.25;desc="4 queries", db-slowest;dur=1.10, app;dur=12.50'
+    assert parse_server_timing(header) == (4, 3.25)
+    assert parse_server_timing(None) == (None, None)
+
+    summary = summarize([Sample(0.010, 200, 2, 1.0), Sample(0.030, 500, 4, 3.0)])
+    assert summary["errors"] == 1
+    assert summary["p50_ms"] == 10
+    assert summary["queries_per_request"] == 3
@@ -0,0 +1,15 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_db_pool_stats():
+    response = client.get("/api/v1/monitoring/db-pool")
+    assert response.status_code == 200
+
+    stats = response.json()
+    assert set(stats) == {"sync", "async"}
+    for pool in stats.values():
+        assert {"checked_out", "idle", "overflow", "wait_max_ms"} <= set(pool)
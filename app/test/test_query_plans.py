@@ -0,0 +1,170 @@
+import asyncio
+import os
+import re
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event, insert, select
+from sqlalchemy.dialects.postgresql import asyncpg, psycopg
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.api.v1.posts.repository import (
+    PostRepository,
+    clear_counts,
+    explain_statement,
+)
+from app.core.db import Base
+from app.models.author import AuthorORM
+from app.models.post import PostORM, post_tags
+from app.models.search import search_posts
+from app.models.tag import TagORM
+
+# Los listados se ejecutan con el repositorio real, se capturan sus consultas y
+# se revisa el EXPLAIN QUERY PLAN de SQLite de cada una: tienen que buscar por
+# indice y no ordenar en una tabla temporal.
+PLANS_PATH = "test_plans.db"
+POSTS = 2000
+BASE = datetime(2030, 1, 1)
+
+
+@pytest.fixture(scope="module")
+def engine():
+    engine = create_engine(f"sqlite:///{PLANS_PATH}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(AuthorORM),
+            [{"name": f"Autor {i}", "email": f"autor{i}@mail.com"} for i in range(20)],
+        )
+        conn.execute(
+            insert(TagORM),
+            [{"name": f"tag{i}", "key": f"tag{i}"} for i in range(50)],
+        )
+        conn.execute(
+            insert(PostORM),
+            [
+                {
+                    "title": f"Post {i}",
+                    "content": "Contenido",
+                    "author_id": i % 20 + 1,
+                    "created_at": BASE + timedelta(minutes=i),
+                }
+                for i in range(POSTS)
+            ],
+        )
+        conn.execute(
+            insert(post_tags),
+            [{"post_id": i + 1, "tag_id": i % 50 + 1} for i in range(POSTS)],
+        )
+        conn.exec_driver_sql("ANALYZE")
+    yield engine
+    engine.dispose()
+    os.remove(PLANS_PATH)
+
+
+def list_plans(engine, method: str, *args, **kwargs) -> list:
+    """Corre PostRepository.<method> y devuelve el plan de cada SELECT a posts."""
+    clear_counts()
+    async_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{PLANS_PATH}", poolclass=NullPool
+    )
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", capture)
+
+    async def run():
+        async with AsyncSession(async_engine) as db:
+            await getattr(PostRepository(db), method)(*args, **kwargs)
+        await async_engine.dispose()
+
+    asyncio.run(run())
+
+    plans = []
+    with engine.connect() as conn:
+        for statement, parameters in statements:
+            if "FROM posts" not in statement:
+                continue  # perfiles de carga (autores, tags por post)
+            rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            plans.append(" | ".join(row.detail for row in rows))
+    return plans
+
+
+def assert_indexed(plans: list, index: str) -> None:
+    # el conteo y la pagina usan el indice; la pagina no ordena aparte
+    assert plans, "no se capturo ninguna consulta"
+    for plan in plans:
+        assert index in plan, plan
+        # "SCAN posts USING INDEX" recorre el indice en orden; sin USING es la tabla
+        assert not re.search(r"SCAN posts(?! USING)", plan), plan
+        assert "TEMP B-TREE FOR ORDER BY" not in plan, plan
+
+
+def test_newest_first_uses_created_at_index(engine):
+    # sin total: el count(*) sin filtro puede resolverse con cualquier indice
+    plans = list_plans(
+        engine, "search", None, "created_at", "desc", 1, 10, total_mode="none"
+    )
+    assert_indexed(plans, "ix_posts_created_at_id")
+
+    # keyset: el cursor (created_at, id) es un rango sobre el mismo indice
+    cursor = (BASE + timedelta(minutes=500), 501)
+    plans = list_plans(
+        engine, "search", None, "created_at", "desc", 1, 10, cursor, total_mode="none"
+    )
+    # SQLite busca el rango por created_at y filtra el desempate por id
+    assert_indexed(plans, "ix_posts_created_at_id (created_at<?)")
+
+
+def test_created_after_is_an_index_range(engine):
+    since = BASE + timedelta(minutes=POSTS - 100)
+    plans = list_plans(
+        engine, "search", None, "created_at", "asc", 1, 10, created_after=since
+    )
+    assert_indexed(plans, "ix_posts_created_at_id (created_at>?)")
+
+
+@pytest.mark.parametrize(
+    "order_by, index",
+    [
+        ("id", "ix_posts_author_id_id (author_id=?)"),
+        ("created_at", "ix_posts_author_id_created_at_id (author_id=?)"),
+    ],
+)
+def test_author_listing_uses_author_indexes(engine, order_by, index):
+    plans = list_plans(engine, "search", None, order_by, "desc", 2, 10, author_id=3)
+    # el conteo puede elegir cualquiera de los dos indices de author_id
+    assert "ix_posts_author_id" in plans[0]
+    assert_indexed(plans[1:], index)
+
+
+def test_title_order_uses_lower_title_index(engine):
+    plans = list_plans(engine, "search", None, "title", "asc", 3, 10, total_mode="none")
+    assert_indexed(plans, "ix_posts_lower_title_id")
+
+
+def test_by_tags_uses_reverse_post_tags_index(engine):
+    plans = list_plans(engine, "by_tags", ["tag7"], order_by="created_at")
+    for plan in plans:
+        assert "ix_post_tags_tag_id_post_id (tag_id=?)" in plan, plan
+
+
+@pytest.mark.parametrize("dialect", [asyncpg.dialect(), psycopg.dialect()])
+def test_postgres_estimate_binds_filter_values(dialect):
+    # el parametro obsoleto text no se valida por patron: nada va inline
+    condition, _, _ = search_posts("hola'); DROP TABLE posts; --", "postgresql")
+    results = select(PostORM).where(
+        condition,
+        PostORM.created_at > BASE,
+        PostORM.id.in_(
+            select(post_tags.c.post_id).where(post_tags.c.tag_id.in_([3, 4]))
+        ),
+    )
+    statement, params = explain_statement(results, dialect)
+    assert statement.startswith("EXPLAIN (FORMAT JSON) SELECT")
+    assert "hola" not in statement and "2030" not in statement
+    values = list(params.values() if isinstance(params, dict) else params)
+    assert values == ["hola:* & drop:* & table:* & posts:*", BASE, 3, 4]
@@ -0,0 +1,165 @@
+import asyncio
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from app.core import replicas
+from app.core.db import Base, get_db, pool_stats
+from app.core.replicas import PRIMARY_COOKIE, Replica, ReplicaRouter
+from app.core.security import get_current_user
+from app.main import app
+from app.models.post import PostORM
+from app.services.cache import response_cache
+
+# dos SQLite: el primario y una "replica" que no recibe las escrituras
+PRIMARY_PATH = "test_primary.db"
+REPLICA_PATH = "test_replica.db"
+BROKEN_URL = "sqlite:////directorio/que/no/existe/replica.db"
+
+
+@pytest.fixture
+def router(monkeypatch):
+    for path in (PRIMARY_PATH, REPLICA_PATH):
+        engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(bind=engine)
+        engine.dispose()
+
+    primary = async_sessionmaker(
+        bind=create_async_engine(
+            f"sqlite+aiosqlite:///{PRIMARY_PATH}", poolclass=NullPool
+        ),
+        expire_on_commit=False,
+    )
+
+    async def override_get_db():
+        async with primary() as db:
+            yield db
+
+    router = ReplicaRouter(
+        [
+            Replica("replica-a", f"sqlite:///{REPLICA_PATH}"),
+            Replica("replica-b", f"sqlite:///{REPLICA_PATH}"),
+            Replica("replica-broken", BROKEN_URL),
+        ],
+        retry_seconds=60,
+    )
+    monkeypatch.setattr(replicas, "replica_router", router)
+    monkeypatch.setitem(app.dependency_overrides, get_db, override_get_db)
+    monkeypatch.setitem(
+        app.dependency_overrides,
+        get_current_user,
+        lambda: {"email": "javier@mail.com", "username": "javier"},
+    )
+    response_cache.clear()
+    yield router
+
+    response_cache.clear()
+    for replica in router.replicas:
+        pool_stats.pop(replica.name, None)
+        asyncio.run(replica.engine.dispose())
+    for path in (PRIMARY_PATH, REPLICA_PATH):
+        os.remove(path)
+
+
+def pick(router: ReplicaRouter, times: int):
+    async def run():
+        names = []
+        for _ in range(times):
+            db = await router.session()
+            names.append(db.info["replica"].name if db else None)
+            if db is not None:
+                await db.close()
+        return names
+
+    return asyncio.run(run())
+
+
+def test_round_robin_skips_unhealthy_replicas(router):
+    # la rota falla al conectar y queda afuera hasta que venza el retry
+    assert pick(router, 5) == [
+        "replica-a",
+        "replica-b",
+        "replica-a",
+        "replica-a",
+        "replica-b",
+    ]
+    stats = router.stats()
+    assert stats["replica-broken"]["healthy"] is False
+    assert stats["replica-broken"]["failures"] == 1
+    assert stats["replica-a"]["reads"] + stats["replica-b"]["reads"] == 5
+
+    # sin replicas sanas el router devuelve None y se lee del primario
+    for replica in router.replicas:
+        replica.down_until = float("inf")
+    assert pick(router, 1) == [None]
+
+
+def titles(client: TestClient) -> set:
+    response = client.get("/posts", params={"view": "summary", "per_page": 50})
+    return {post["title"] for post in response.json()["items"]}
+
+
+def test_reads_go_to_replica_until_the_client_writes(router):
+    engine = create_engine(f"sqlite:///{REPLICA_PATH}")
+    with Session(engine) as db:
+        db.add(PostORM(title="Solo en la replica", content="Contenido replicado"))
+        db.commit()
+    engine.dispose()
+
+    with TestClient(app) as client:
+        assert titles(client) == {"Solo en la replica"}
+
+        created = client.post(
+            "/posts", data={"title": "Recien escrito", "content": "Va al primario"}
+        )
+        assert created.status_code == 201
+        assert PRIMARY_COOKIE in created.cookies
+
+        # read-your-writes: el cliente ve su post aunque la replica no lo tenga
+        assert titles(client) == {"Recien escrito"}
+
+        client.cookies.clear()
+        response_cache.clear()
+        assert titles(client) == {"Solo en la replica"}
+
+
+def add_to_replica(title: str) -> None:
+    # "replicacion": la fila llega a la replica con atraso
+    engine = create_engine(f"sqlite:///{REPLICA_PATH}")
+    with Session(engine) as db:
+        db.add(PostORM(title=title, content="Contenido replicado"))
+        db.commit()
+    engine.dispose()
+
+
+def test_replica_reads_after_a_write_do_not_refill_shared_caches(router, monkeypatch):
+    add_to_replica("Viejo")
+    writer, reader = TestClient(app), TestClient(app)
+    with writer, reader:
+        # sin escrituras recientes la lectura de la replica se cachea
+        monkeypatch.setattr(replicas, "_last_primary_write", 0.0)
+        assert titles(reader) == {"Viejo"}
+        assert response_cache.stats()["entries"] == 1
+
+        created = writer.post(
+            "/posts", data={"title": "Nuevo", "content": "Va al primario"}
+        )
+        assert created.status_code == 201
+        assert response_cache.stats()["entries"] == 0
+
+        # otro cliente, sin la cookie: lee la replica atrasada, que no se cachea
+        page = reader.get("/posts", params={"view": "summary", "per_page": 50})
+        assert {p["title"] for p in page.json()["items"]} == {"Viejo"}
+        assert page.json()["total"] == 1
+        assert response_cache.stats()["entries"] == 0
+
+        # cuando la replica se pone al dia, todos lo ven (ni pagina ni total viejos)
+        add_to_replica("Nuevo")
+        page = reader.get("/posts", params={"view": "summary", "per_page": 50})
+        assert {p["title"] for p in page.json()["items"]} == {"Viejo", "Nuevo"}
+        assert page.json()["total"] == 2
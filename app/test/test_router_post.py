@@ -1,14 +1,30 @@
+import asyncio
+import csv
+import io
+import json
+import os
+import re
+import time
+from datetime import datetime, timedelta
+
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, text
 from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
+from app.api.v1.posts.repository import EXCERPT_CHARS
+from app.api.v1.posts.schemas import PaginatedPost, PostPublic
+from app.api.v1.tags.repository import TagRepository
 from app.core.db import Base, get_db
+from app.core.instrumentation import instrument_engine
 from app.core.security import get_current_user
 from app.main import app
 from app.models.author import AuthorORM
 from app.models.post import PostORM
-
+from app.services import image_variants, media_gc, save_file
+from app.services.cache import response_cache
 
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"  # o en memoria: "sqlite://"
 
@@ -20,6 +36,15 @@ TestingSessionLocal = sessionmaker(
     autocommit=False, autoflush=False, bind=engine
 )  # No se envian cambios hasta q no se hace el commit
 
+# TestClient abre un event loop por request, asi que no reutilizamos conexiones
+async_engine = create_async_engine("sqlite+aiosqlite:///./test.db", poolclass=NullPool)
+
+instrument_engine(async_engine.sync_engine)
+
+AsyncTestingSessionLocal = async_sessionmaker(
+    autoflush=False, bind=async_engine, expire_on_commit=False
+)
+
 
 @pytest.fixture(scope="session", autouse=True)
 def setup_database():
@@ -40,12 +65,9 @@ def db_session():
 # Override de dependencia de FastAPI
 
 
-def override_get_db():
-    db = TestingSessionLocal()
-    try:
+async def override_get_db():
+    async with AsyncTestingSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
 def override_current_user():
@@ -102,3 +124,558 @@ def test_create_post(db_session):
     assert data_post["id"] == post_id
     assert data_post["title"] == "Mi primer post"
     assert data_post["content"] == "Contenido del primer post de TEST"
+
+
+def test_list_posts_cursor_pagination(db_session):
+    for i in range(3):
+        res = client.post(
+            "/posts",
+            data={"title": f"Cursor post {i}", "content": "Contenido para paginar"},
+        )
+        assert res.status_code == 201
+
+    first = client.get("/posts", params={"per_page": 2, "order_by": "title"}).json()
+    assert first["has_next"] is True
+    assert first["next_cursor"]
+
+    second = client.get(
+        "/posts",
+        params={"per_page": 2, "order_by": "title", "cursor": first["next_cursor"]},
+    ).json()
+    assert second["page"] is None
+    assert second["has_prev"] is True
+
+    seen = [p["id"] for p in first["items"] + second["items"]]
+    assert len(seen) == len(set(seen))
+
+    res = client.get("/posts", params={"cursor": first["next_cursor"]})
+    assert res.status_code == 400
+
+
+def test_search_title_and_content_by_relevance(db_session):
+    client.post(
+        "/posts",
+        data={"title": "Notas de cocina", "content": "Receta con aceitunas y queso"},
+    )
+    res = client.post(
+        "/posts",
+        data={"title": "Aceitunas caseras", "content": "Como curar aceitunas en casa"},
+    )
+    post_id = res.json()["id"]
+
+    data = client.get(
+        "/posts", params={"Search": "aceit", "order_by": "relevance"}
+    ).json()
+    assert data["total"] == 2
+    assert data["items"][0]["id"] == post_id
+
+    res = client.put(
+        f"/posts/{post_id}", json={"title": "Olivas", "content": "Sin nada"}
+    )
+    assert res.status_code == 200
+    assert res.json()["author"]["email"] == "javier@mail.com"
+    data = client.get("/posts", params={"Search": "aceitunas"}).json()
+    assert data["total"] == 1
+    assert data["items"][0]["id"] != post_id
+
+    client.delete(f"/posts/{post_id}")
+    assert client.get("/posts", params={"Search": "olivas"}).json()["total"] == 0
+
+
+@pytest.fixture
+def sql_statements():
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+
+# maximo de sentencias SQL por endpoint (los perfiles de carga evitan el N+1)
+MAX_QUERIES = {
+    "list": 3,  # count + pagina con autor + tags
+    "get": 2,  # post con autor + tags
+    "get_summary": 1,
+    "by_tags": 4,  # ids de tags + count + pagina con autor + tags
+    "update": 4,  # select + update + recarga con autor + tags
+    "delete": 4,  # select + delete post_tags + contadores de tags + delete post
+    "create": 6,  # select tags + insert post + insert post_tags + contadores + recarga
+}
+
+
+def test_max_queries_per_endpoint(sql_statements):
+    for i in range(5):
+        client.post(
+            "/posts",
+            data={
+                "title": f"Consultas {i}",
+                "content": "Contenido para contar consultas",
+                "tags": ["perfil", f"tag{i}"],
+            },
+        )
+    post_id = client.get("/posts", params={"per_page": 1}).json()["items"][0]["id"]
+
+    def count(method, url, **kwargs):
+        response_cache.clear()
+        sql_statements.clear()
+        assert client.request(method, url, **kwargs).status_code < 300
+        return len(sql_statements)
+
+    assert count("GET", "/posts", params={"per_page": 50}) <= MAX_QUERIES["list"]
+    assert count("GET", f"/posts/{post_id}") <= MAX_QUERIES["get"]
+    assert (
+        count("GET", f"/posts/{post_id}", params={"include_content": False})
+        <= MAX_QUERIES["get_summary"]
+    )
+    assert (
+        count("GET", "/posts/by-tags", params={"tags": ["perfil"]})
+        <= MAX_QUERIES["by_tags"]
+    )
+    assert (
+        count("PUT", f"/posts/{post_id}", json={"content": "Contenido editado"})
+        <= MAX_QUERIES["update"]
+    )
+    assert count("DELETE", f"/posts/{post_id}") <= MAX_QUERIES["delete"]
+    assert (
+        count(
+            "POST",
+            "/posts",
+            data={
+                "title": "Consultas nuevo",
+                "content": "Contenido para contar consultas",
+                "tags": ["perfil", "tag1", "tag2", "tag3"],
+            },
+        )
+        <= MAX_QUERIES["create"]
+    )
+
+
+def test_create_post_reuses_tags_case_insensitive(db_session):
+    first = client.post(
+        "/posts",
+        data={"title": "Tags A", "content": "Contenido con tags", "tags": ["Rust"]},
+    ).json()
+    second = client.post(
+        "/posts",
+        data={
+            "title": "Tags B",
+            "content": "Contenido con tags",
+            "tags": [" rust ", "RUST", "100%_tag"],
+        },
+    ).json()
+
+    assert [t["name"] for t in first["tags"]] == ["Rust"]
+    assert sorted(t["name"] for t in second["tags"]) == ["100%_tag", "Rust"]
+
+
+def test_server_timing_header(db_session):
+    response = client.get("/posts")
+    assert response.status_code == 200
+
+    timing = response.headers["Server-Timing"]
+    queries = int(re.search(r'desc="(\d+) queries"', timing).group(1))
+    assert 1 <= queries <= MAX_QUERIES["list"]
+    assert "app;dur=" in timing
+
+
+def test_read_cache_hits_and_invalidation(sql_statements):
+    res = client.post(
+        "/posts", data={"title": "Cacheado", "content": "Contenido para el cache"}
+    )
+    post_id = res.json()["id"]
+    before = response_cache.stats()
+
+    assert client.get(f"/posts/{post_id}").json()["title"] == "Cacheado"
+    sql_statements.clear()
+    assert client.get(f"/posts/{post_id}").json()["title"] == "Cacheado"
+    assert sql_statements == []
+    assert response_cache.stats()["hits"] == before["hits"] + 1
+
+    client.put(f"/posts/{post_id}", json={"title": "Editado"})
+    assert client.get(f"/posts/{post_id}").json()["title"] == "Editado"
+
+    client.delete(f"/posts/{post_id}")
+    assert client.get(f"/posts/{post_id}").status_code == 404
+
+
+def test_conditional_get_post_and_list(sql_statements):
+    res = client.post(
+        "/posts", data={"title": "Revalidar", "content": "Contenido con ETag"}
+    )
+    post_id = res.json()["id"]
+
+    first = client.get(f"/posts/{post_id}")
+    etag = first.headers["ETag"]
+    assert first.headers["Last-Modified"]
+
+    res = client.get(f"/posts/{post_id}", headers={"If-None-Match": etag})
+    assert res.status_code == 304
+
+    # sin cache, el 304 se decide sin leer content
+    response_cache.clear()
+    sql_statements.clear()
+    res = client.get(f"/posts/{post_id}", headers={"If-None-Match": etag})
+    assert res.status_code == 304
+    assert not any("content" in statement for statement in sql_statements)
+
+    newest = {"direction": "desc", "per_page": 1}
+    page = client.get("/posts", params=newest)
+    res = client.get(
+        "/posts", params=newest, headers={"If-None-Match": page.headers["ETag"]}
+    )
+    assert res.status_code == 304
+
+    client.put(f"/posts/{post_id}", json={"content": "Contenido nuevo con ETag"})
+    res = client.get(f"/posts/{post_id}", headers={"If-None-Match": etag})
+    assert res.status_code == 200
+    assert res.headers["ETag"] != etag
+    res = client.get(
+        "/posts", params=newest, headers={"If-None-Match": page.headers["ETag"]}
+    )
+    assert res.status_code == 200
+
+
+def test_bulk_import_ndjson(db_session):
+    lines = [
+        '{"title": "Importado 1", "content": "Contenido importado", "tags": ["bulk"]}',
+        "no es json",
+        '{"title": "x", "content": "Contenido importado"}',
+        '{"title": "Importado 2", "content": "Contenido importado", "tags": ["Bulk"],'
+        ' "author": {"name": "Ana", "email": "ana@example.com"}}',
+        '{"title": "Tags sueltos", "content": "Contenido importado", "tags": 5}',
+        '{"title": "Tags raros", "content": "Contenido importado", "tags": true}',
+    ]
+    res = client.post(
+        "/posts/import",
+        params={"batch_size": 1},
+        content="\n".join(lines).encode(),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert res.status_code == 200
+
+    report = res.json()
+    assert report["received"] == 6
+    assert report["inserted"] == 2
+    assert [error["line"] for error in report["errors"]] == [2, 3, 5, 6]
+    assert report["errors"][2]["error"] == "tags debe ser una lista"
+
+    posts = client.get("/posts/by-tags", params={"tags": ["bulk"]}).json()["items"]
+    assert [p["title"] for p in posts] == ["Importado 1", "Importado 2"]
+    assert posts[1]["author"]["email"] == "ana@example.com"
+
+
+def test_export_ndjson_and_csv(db_session):
+    client.post(
+        "/posts",
+        data={
+            "title": "Exportable",
+            "content": "Contenido a exportar",
+            "tags": ["exp"],
+        },
+    )
+    total = client.get("/posts").json()["total"]
+
+    res = client.get("/posts/export", params={"chunk_size": 10})
+    assert res.status_code == 200
+    records = [json.loads(line) for line in res.text.splitlines()]
+    assert len(records) == total
+    exported = next(r for r in records if r["title"] == "Exportable")
+    assert exported["tags"] == ["exp"]
+    assert exported["author_email"] == "javier@mail.com"
+
+    res = client.get("/posts/export", params={"format": "csv", "chunk_size": 10})
+    rows = list(csv.DictReader(io.StringIO(res.text)))
+    assert len(rows) == total
+    assert next(r for r in rows if r["title"] == "Exportable")["tags"] == "exp"
+
+
+def test_shared_image_is_collected_after_last_post(db_session, tmp_path, monkeypatch):
+    monkeypatch.setattr(save_file, "MEDIA_DIR", str(tmp_path))
+    monkeypatch.setattr(media_gc, "MEDIA_GC_GRACE_SECONDS", 0)
+    png = b"\x89PNG\r\n\x1a\n" + b"\x01" * 256
+
+    ids = []
+    for title in ("Con imagen 1", "Con imagen 2"):
+        res = client.post(
+            "/posts",
+            data={"title": title, "content": "Post que comparte imagen"},
+            files={"image": ("foto.png", png, "image/png")},
+        )
+        assert res.status_code == 201
+        ids.append(res.json()["id"])
+    image_url = client.get(f"/posts/{ids[0]}").json()["image_url"]
+    assert client.get(f"/posts/{ids[1]}").json()["image_url"] == image_url
+    stored = save_file.media_path(image_url)
+
+    # el archivo sigue mientras lo use algun post
+    assert client.delete(f"/posts/{ids[0]}").status_code == 204
+    assert os.path.exists(stored)
+    assert client.delete(f"/posts/{ids[1]}").status_code == 204
+    assert not os.path.exists(stored)
+    assert not any(p.is_file() for p in tmp_path.rglob("*"))
+
+
+def test_image_variants_generated_in_background(db_session, tmp_path, monkeypatch):
+    Image = pytest.importorskip("PIL.Image")
+    monkeypatch.setattr(save_file, "MEDIA_DIR", str(tmp_path))
+    monkeypatch.setattr(media_gc, "MEDIA_GC_GRACE_SECONDS", 0)
+    monkeypatch.setattr(image_variants, "IMAGE_VARIANT_WIDTHS", [320, 640])
+    buffer = io.BytesIO()
+    Image.new("RGB", (800, 400), "teal").save(buffer, format="PNG")
+
+    # con el loop vivo entre requests, como en un servidor real
+    with TestClient(app) as live:
+        res = live.post(
+            "/posts",
+            data={"title": "Con derivados", "content": "Post con miniaturas"},
+            files={"image": ("foto.png", buffer.getvalue(), "image/png")},
+        )
+        post_id = res.json()["id"]
+        # hasta que el pool termina se sirve solo el original
+        first = live.get(f"/posts/{post_id}")
+        pending = first.json()["image_variants"] == []
+
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            ready = live.get(f"/posts/{post_id}")
+            if ready.json()["image_variants"]:
+                break
+            time.sleep(0.1)
+        variants = ready.json()["image_variants"]
+        assert {(v["width"], v["content_type"]) for v in variants} == {
+            (320, "image/webp"),
+            (320, "image/png"),
+            (640, "image/webp"),
+            (640, "image/png"),
+            (800, "image/webp"),
+        }
+        if pending:
+            # la respuesta cacheada se invalido y cambio su version
+            assert ready.headers["etag"] != first.headers["etag"]
+        for variant in variants:
+            with Image.open(save_file.media_path(variant["url"])) as derived:
+                assert derived.width == variant["width"]
+
+        # al borrar el post se van el original y sus derivados
+        assert live.delete(f"/posts/{post_id}").status_code == 204
+        assert not any(p.is_file() for p in tmp_path.rglob("*"))
+
+
+def test_tag_counts_follow_writes_and_rebuild(db_session):
+    def counts():
+        tags = client.get("/tags", params={"order_by": "name", "min_count": 0})
+        return {t["name"]: t["post_count"] for t in tags.json() if "cnt" in t["name"]}
+
+    first = client.post(
+        "/posts",
+        data={"title": "Contador 1", "content": "Post para contar tags"},
+        files=[("tags", (None, "cnt-a")), ("tags", (None, "cnt-b"))],
+    ).json()
+    client.post(
+        "/posts/import",
+        content=b'{"title": "Contador 2", "content": "Post importado", '
+        b'"tags": ["CNT-A"]}',
+    )
+    assert counts() == {"cnt-a": 2, "cnt-b": 1}
+
+    # editar los tags ajusta los contadores y la version del post
+    before = client.get(f"/posts/{first['id']}")
+    res = client.put(
+        f"/posts/{first['id']}", json={"tags": [{"name": "cnt-b"}, {"name": "cnt-c"}]}
+    )
+    assert sorted(t["name"] for t in res.json()["tags"]) == ["cnt-b", "cnt-c"]
+    assert counts() == {"cnt-a": 1, "cnt-b": 1, "cnt-c": 1}
+    after = client.get(f"/posts/{first['id']}")
+    assert after.headers["etag"] != before.headers["etag"]
+    cnt_c = client.get("/posts/by-tags", params={"tags": ["cnt-c"]}).json()["items"]
+    assert [p["id"] for p in cnt_c] == [first["id"]]
+
+    assert client.delete(f"/posts/{first['id']}").status_code == 204
+    assert counts() == {"cnt-a": 1, "cnt-b": 0, "cnt-c": 0}
+    top = client.get("/tags").json()
+    assert "cnt-b" not in [t["name"] for t in top]
+    assert [t["post_count"] for t in top] == sorted(
+        (t["post_count"] for t in top), reverse=True
+    )
+
+    # la reconciliacion corrige contadores desfasados
+    db_session.execute(text("UPDATE tags SET post_count = 7 WHERE key LIKE 'cnt-%'"))
+    db_session.commit()
+
+    async def rebuild():
+        async with AsyncTestingSessionLocal() as db:
+            fixed = await TagRepository(db).rebuild_counts()
+            await db.commit()
+            return fixed
+
+    assert asyncio.run(rebuild()) == 3
+    assert counts() == {"cnt-a": 1, "cnt-b": 0, "cnt-c": 0}
+
+
+def test_by_tags_match_and_pagination(db_session):
+    for title, tags in [
+        ("Etiquetas 1", ["bt-x"]),
+        ("Etiquetas 2", ["bt-x", "bt-y"]),
+        ("Etiquetas 3", ["bt-y"]),
+        ("Etiquetas 4", ["BT-X", "bt-y"]),
+    ]:
+        client.post(
+            "/posts",
+            data={"title": title, "content": "Post para filtrar por tags"},
+            files=[("tags", (None, tag)) for tag in tags],
+        )
+
+    def titles(**params):
+        res = client.get("/posts/by-tags", params={"tags": ["bt-x", "Bt-Y"], **params})
+        assert res.status_code == 200
+        return res.json()
+
+    any_tag = titles()
+    assert any_tag["total"] == 4 and any_tag["match"] == "any"
+    assert any_tag["tags"] == ["bt-x", "bt-y"]
+    both = titles(match="all")
+    assert [p["title"] for p in both["items"]] == ["Etiquetas 2", "Etiquetas 4"]
+    # un tag inexistente con match=all no deja resultados
+    missing = client.get(
+        "/posts/by-tags", params={"tags": ["bt-x", "bt-none"], "match": "all"}
+    )
+    assert missing.json()["total"] == 0
+
+    pages = [titles(per_page=3, direction="desc")]
+    assert pages[0]["page"] == 1 and pages[0]["has_next"]
+    pages.append(titles(per_page=3, direction="desc", cursor=pages[0]["next_cursor"]))
+    seen = [p["title"] for page in pages for p in page["items"]]
+    assert seen == ["Etiquetas 4", "Etiquetas 3", "Etiquetas 2", "Etiquetas 1"]
+    assert pages[1]["next_cursor"] is None
+    assert titles(page=2, per_page=3)["items"][0]["title"] == "Etiquetas 4"
+
+
+def test_list_total_modes(sql_statements):
+    client.post("/posts", data={"title": "Conteo", "content": "Post para contar"})
+    response_cache.clear()
+
+    exact = client.get("/posts", params={"per_page": 2}).json()
+    assert exact["total_mode"] == "exact"
+    assert exact["total_pages"] == -(-exact["total"] // 2)
+
+    # el total queda en cache unos segundos: la pagina siguiente no cuenta
+    sql_statements.clear()
+    cached = client.get("/posts", params={"per_page": 2, "page": 2}).json()
+    assert (cached["total_mode"], cached["total"]) == ("cached", exact["total"])
+    assert not any("count(" in sql.lower() for sql in sql_statements)
+
+    sql_statements.clear()
+    skipped = client.get("/posts", params={"per_page": 2, "include_total": False})
+    body = skipped.json()
+    assert body["total"] is body["total_pages"] is None
+    assert body["total_mode"] == "none"
+    assert body["page"] == 1 and body["has_next"]
+    assert not any("count(" in sql.lower() for sql in sql_statements)
+
+    # SQLite no tiene estadisticas del planner: cae en el conteo
+    estimated = client.get("/posts", params={"count_mode": "estimated"}).json()
+    assert estimated["total_mode"] in ("exact", "cached")
+
+    # crear un post vacia el cache de totales
+    client.post("/posts", data={"title": "Conteo 2", "content": "Post para contar"})
+    after = client.get("/posts", params={"per_page": 2}).json()
+    assert (after["total_mode"], after["total"]) == ("exact", exact["total"] + 1)
+
+
+def test_fast_json_matches_schemas_and_sparse_fields(sql_statements):
+    created = client.post(
+        "/posts",
+        data={"title": "Campos", "content": "Post con campos", "tags": ["fields"]},
+    ).json()
+    assert PostPublic.model_validate(created).model_dump() == created
+
+    response_cache.clear()
+    page = client.get("/posts", params={"per_page": 50}).json()
+    assert PaginatedPost.model_validate(page).model_dump() == page
+
+    # sin tags ni autor no se cargan las relaciones
+    sql_statements.clear()
+    sparse = client.get("/posts", params={"per_page": 50, "fields": "title"})
+    assert sparse.status_code == 200
+    assert all(set(item) == {"id", "title"} for item in sparse.json()["items"])
+    assert not any("post_tags" in sql for sql in sql_statements)
+
+    detail = client.get(f"/posts/{created['id']}", params={"fields": "tags,title"})
+    assert detail.json() == {
+        "title": "Campos",
+        "tags": [{"name": "fields"}],
+        "id": created["id"],
+    }
+
+    bad = client.get("/posts", params={"fields": "title,password"})
+    assert bad.status_code == 400
+
+
+def test_views_project_only_needed_columns(sql_statements):
+    body = "Parrafo largo del articulo. " * 40
+    created = client.post("/posts", data={"title": "Vistas", "content": body}).json()
+    response_cache.clear()
+
+    # card (por defecto en listados): extracto calculado en SQL, sin content
+    sql_statements.clear()
+    page = client.get("/posts", params={"per_page": 50}).json()
+    card = next(item for item in page["items"] if item["id"] == created["id"])
+    assert "content" not in card
+    assert card["excerpt"] == body[:EXCERPT_CHARS]
+    assert any("substr(posts.content" in sql for sql in sql_statements)
+    assert not any(re.search(r"posts\.content(?!,)", sql) for sql in sql_statements)
+
+    full = client.get("/posts", params={"per_page": 50, "view": "full"}).json()
+    assert any(item.get("content") == body for item in full["items"])
+
+    # summary: ni content ni relaciones
+    sql_statements.clear()
+    summary = client.get(f"/posts/{created['id']}", params={"view": "summary"})
+    assert summary.json() == {"id": created["id"], "title": "Vistas"}
+    assert len(sql_statements) == 1 and "content" not in sql_statements[0]
+
+    assert client.get("/posts", params={"fields": "content"}).status_code == 400
+
+
+def test_list_by_created_at_with_author_and_date_filters(db_session):
+    author = AuthorORM(name="Fechas", email="fechas@mail.com")
+    db_session.add(author)
+    db_session.flush()
+    base = datetime(2030, 1, 1, 12, 0, 0)
+    # tres posts en el mismo segundo: el cursor desempata por id
+    moments = [base - timedelta(days=1), base, base, base, base + timedelta(hours=1)]
+    for i, moment in enumerate(moments):
+        db_session.add(
+            PostORM(
+                title=f"Fecha {i}",
+                content="Post con fecha fija",
+                created_at=moment,
+                author_id=author.id,
+            )
+        )
+    db_session.commit()
+    response_cache.clear()
+
+    def page(**params):
+        res = client.get("/posts", params={"author_id": author.id, **params})
+        assert res.status_code == 200
+        return res.json()
+
+    newest = {"order_by": "created_at", "direction": "desc", "per_page": 2}
+    pages = [page(**newest)]
+    assert pages[0]["total"] == 5
+    while pages[-1]["next_cursor"]:
+        pages.append(page(**newest, cursor=pages[-1]["next_cursor"]))
+    seen = [p["title"] for result in pages for p in result["items"]]
+    assert seen == ["Fecha 4", "Fecha 3", "Fecha 2", "Fecha 1", "Fecha 0"]
+
+    # created_after es estricto; con zona se pasa a UTC
+    assert page(created_after="2030-01-01T11:59:59")["total"] == 4
+    assert page(created_after="2030-01-01T12:59:59+01:00")["total"] == 4
+    assert [p["title"] for p in page(created_after=base.isoformat())["items"]] == [
+        "Fecha 4"
+    ]
+    assert page(author_id=10**6)["total"] == 0
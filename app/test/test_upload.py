@@ -0,0 +1,261 @@
+import asyncio
+import hashlib
+import json
+from collections import OrderedDict
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.datastructures import UploadFile
+from starlette.routing import Mount
+
+from app.main import app
+from app.services import image_variants, media_files, save_file
+from app.services.media_files import MediaFiles
+
+client = TestClient(app)
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 2048
+
+
+def test_save_image_streams_and_reports(tmp_path, monkeypatch):
+    monkeypatch.setattr(save_file, "MEDIA_DIR", str(tmp_path))
+    monkeypatch.setattr(save_file, "UPLOAD_CHUNK_BYTES", 512)
+    reads = []
+    read = UploadFile.read
+
+    async def counting_read(self, size=-1):
+        data = await read(self, size)
+        reads.append(len(data))
+        return data
+
+    monkeypatch.setattr(UploadFile, "read", counting_read)
+
+    # la extension y el tipo salen de los magic bytes, no del cliente
+    files = {"file": ("foto.txt", PNG, "application/octet-stream")}
+    response = client.post("/upload/save", files=files)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["conten_type"] == "image/png"
+    assert body["filename"].endswith(".png")
+    assert body["bytes_written"] == len(PNG)
+    assert (tmp_path / body["filename"]).read_bytes() == PNG
+    # el archivo se leyo de a UPLOAD_CHUNK_BYTES, no de una vez
+    assert len(reads) > 1 and max(reads) <= 512
+
+
+def test_save_image_is_content_addressed(tmp_path, monkeypatch):
+    monkeypatch.setattr(save_file, "MEDIA_DIR", str(tmp_path))
+
+    files = {"file": ("a.png", PNG, "image/png")}
+    first = client.post("/upload/save", files=files).json()
+    second = client.post("/upload/save", files=files).json()
+
+    sha = hashlib.sha256(PNG).hexdigest()
+    assert first["url"] == second["url"] == f"/media/{sha[:2]}/{sha[2:4]}/{sha}.png"
+    assert [first["deduplicated"], second["deduplicated"]] == [False, True]
+    stored = [p for p in tmp_path.rglob("*") if p.is_file()]
+    assert [p.name for p in stored] == [f"{sha}.png"]
+
+
+def test_save_image_rejects_fake_content_type(tmp_path, monkeypatch):
+    monkeypatch.setattr(save_file, "MEDIA_DIR", str(tmp_path))
+
+    files = {"file": ("foto.png", b"<?php echo 1; ?>", "image/png")}
+    response = client.post("/upload/save", files=files)
+    assert response.status_code == 400
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_upload_over_limit_is_rejected(tmp_path, monkeypatch):
+    monkeypatch.setattr(save_file, "MEDIA_DIR", str(tmp_path))
+    monkeypatch.setattr(save_file, "MAX_UPLOAD_BYTES", 1024)
+
+    files = {"file": ("foto.png", PNG, "image/png")}
+    assert client.post("/upload/save", files=files).status_code == 413
+    assert client.post("/upload/bytes", files=files).status_code == 413
+    # no quedan archivos parciales
+    assert list(tmp_path.iterdir()) == []
+
+    small = {"file": ("foto.png", PNG[:1000], "image/png")}
+    response = client.post("/upload/bytes", files=small)
+    assert response.status_code == 200
+    assert response.json()["size_bytes"] == 1000
+
+
+def test_chunked_upload_over_limit_stops_reading(monkeypatch):
+    monkeypatch.setattr(save_file, "MAX_UPLOAD_BYTES", 1024)
+    monkeypatch.setattr(save_file, "FORM_OVERHEAD_BYTES", 1024)
+    boundary = "limite"
+    head = (
+        f'--{boundary}\r\nContent-Disposition: form-data; name="file"; '
+        'filename="foto.png"\r\nContent-Type: image/png\r\n\r\n'
+    ).encode()
+    chunks = [head + PNG[:8]] + [b"\x00" * 1024] * 100
+    sent = 0
+
+    # sin Content-Length (como un upload chunked): el limite va sobre el stream
+    async def receive():
+        nonlocal sent
+        sent += 1
+        return {
+            "type": "http.request",
+            "body": chunks[sent - 1],
+            "more_body": sent < len(chunks),
+        }
+
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/upload/bytes",
+        "raw_path": b"/upload/bytes",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (b"host", b"testserver"),
+            (b"content-type", f"multipart/form-data; boundary={boundary}".encode()),
+            (b"transfer-encoding", b"chunked"),
+        ],
+        "client": ("testclient", 50000),
+        "server": ("testserver", 80),
+    }
+    asyncio.run(app(scope, receive, send))
+
+    assert messages[0]["status"] == 413
+    # corto apenas paso el limite, sin leer (ni volcar a disco) el resto
+    assert sent <= 3
+
+
+@pytest.fixture
+def media(tmp_path, monkeypatch):
+    monkeypatch.setattr(save_file, "MEDIA_DIR", str(tmp_path))
+    media_app = Starlette(routes=[Mount("/media", MediaFiles(directory=tmp_path))])
+    return tmp_path, TestClient(media_app)
+
+
+def test_media_immutable_cache_and_range(media):
+    root, media_client = media
+    sha = hashlib.sha256(PNG).hexdigest()
+    (root / "legacy.png").write_bytes(PNG)
+    stored = root / sha[:2] / sha[2:4] / f"{sha}.png"
+    stored.parent.mkdir(parents=True)
+    stored.write_bytes(PNG)
+    url = f"/media/{sha[:2]}/{sha[2:4]}/{sha}.png"
+
+    response = media_client.get(url)
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "public, max-age=31536000, immutable"
+    assert response.headers["accept-ranges"] == "bytes"
+    assert (
+        "immutable"
+        not in media_client.get("/media/legacy.png").headers["cache-control"]
+    )
+
+    partial = media_client.get(url, headers={"Range": "bytes=0-7"})
+    assert partial.status_code == 206
+    assert partial.content == PNG[:8]
+
+    revalidated = media_client.get(
+        url, headers={"If-None-Match": response.headers["etag"]}
+    )
+    assert revalidated.status_code == 304
+    assert revalidated.headers["cache-control"].endswith("immutable")
+
+
+def test_media_serves_webp_when_accepted(media):
+    root, media_client = media
+    sha = hashlib.sha256(PNG).hexdigest()
+    shard = root / sha[:2] / sha[2:4]
+    shard.mkdir(parents=True)
+    (shard / f"{sha}.png").write_bytes(PNG)
+    (shard / f"{sha}_w320.png").write_bytes(b"png-320")
+    (shard / f"{sha}_w320.webp").write_bytes(b"webp-320")
+    (shard / f"{sha}_w800.webp").write_bytes(b"webp-800")
+    manifest = [
+        {"file": f"{sha}_w320.webp", "width": 320, "content_type": "image/webp"},
+        {"file": f"{sha}_w320.png", "width": 320, "content_type": "image/png"},
+        {"file": f"{sha}_w800.webp", "width": 800, "content_type": "image/webp"},
+    ]
+    (shard / f"{sha}.variants.json").write_text(json.dumps({"variants": manifest}))
+    base = f"/media/{sha[:2]}/{sha[2:4]}/{sha}"
+    webp = {"Accept": "image/avif,image/webp,*/*"}
+
+    original = media_client.get(f"{base}.png", headers=webp)
+    assert original.content == b"webp-800"
+    assert original.headers["content-type"] == "image/webp"
+    assert original.headers["vary"] == "Accept"
+    assert media_client.get(f"{base}_w320.png", headers=webp).content == b"webp-320"
+
+    plain = media_client.get(f"{base}_w320.png", headers={"Accept": "image/png"})
+    assert plain.content == b"png-320"
+    assert plain.headers["vary"] == "Accept"
+
+
+def test_media_offload_and_incoming_hidden(media, monkeypatch):
+    root, media_client = media
+    (root / ".incoming").mkdir()
+    (root / ".incoming" / "x.part").write_bytes(PNG)
+    (root / "legacy.png").write_bytes(PNG)
+    assert media_client.get("/media/.incoming/x.part").status_code == 404
+
+    monkeypatch.setattr(media_files, "MEDIA_ACCEL", "x-accel-redirect")
+    response = media_client.get("/media/legacy.png")
+    assert response.headers["x-accel-redirect"] == "/protected-media/legacy.png"
+    assert response.headers["content-type"] == "image/png"
+    assert response.content == b""
+
+
+def test_variant_lookups_stay_off_the_disk(tmp_path, monkeypatch):
+    monkeypatch.setattr(save_file, "MEDIA_DIR", str(tmp_path))
+    monkeypatch.setattr(image_variants, "_ready", OrderedDict())
+    monkeypatch.setattr(image_variants, "_missing", OrderedDict())
+    monkeypatch.setattr(image_variants, "IMAGE_READY_CACHE_SIZE", 2)
+    feature = {"on": False}
+    monkeypatch.setattr(image_variants, "enabled", lambda: feature["on"])
+    reads = []
+    read_manifest = image_variants._read_manifest
+
+    def counting_read(source):
+        reads.append(source)
+        return read_manifest(source)
+
+    monkeypatch.setattr(image_variants, "_read_manifest", counting_read)
+    url = "/media/ab/cd/foto.png"
+
+    # deshabilitado: ni disco ni memoria
+    asyncio.run(image_variants.refresh([url]))
+    assert image_variants.variants_for(url) == [] and reads == []
+
+    # sin manifiesto: una sola busqueda mientras dure el TTL negativo
+    feature["on"] = True
+    asyncio.run(image_variants.refresh([url, url]))
+    asyncio.run(image_variants.refresh([url]))
+    assert len(reads) == 1 and image_variants.variants_for(url) == []
+
+    shard = tmp_path / "ab" / "cd"
+    shard.mkdir(parents=True)
+    manifest = [{"file": "foto_w320.webp", "width": 320, "content_type": "image/webp"}]
+    (shard / "foto.variants.json").write_text(json.dumps({"variants": manifest}))
+    image_variants._missing[url] = 0  # vencio el TTL
+    asyncio.run(image_variants.refresh([url]))
+    assert image_variants.variants_for(url)[0]["url"] == "/media/ab/cd/foto_w320.webp"
+    assert image_variants.ready_at(url) is not None
+    # ya en memoria: serializar de nuevo no va al disco
+    asyncio.run(image_variants.refresh([url]))
+    assert len(reads) == 2
+
+    # el pipeline registra lo que termina; el cache queda acotado (LRU)
+    for name in ("otra", "tercera"):
+        image_variants._remember(f"/media/ab/cd/{name}.png", 0, manifest)
+    assert list(image_variants._ready) == [
+        "/media/ab/cd/otra.png",
+        "/media/ab/cd/tercera.png",
+    ]
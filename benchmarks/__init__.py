@@ -0,0 +1,11 @@
+"""
+Benchmarks de la API de posts sobre datos sinteticos:
+
+    python benchmarks/seed.py --posts 100000 --reset   # genera el dataset
+    python benchmarks/latency.py                       # p50/p95/p99 por endpoint
+    python benchmarks/load.py --concurrency 32         # carga concurrente
+    python benchmarks/compare.py antes.json despues.json
+
+Los resultados se guardan como JSON en benchmarks/results/ con el commit, el
+motor de base y el tamaño del dataset, para comparar entre commits.
+"""
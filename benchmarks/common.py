@@ -0,0 +1,211 @@
+import json
+import os
+import platform
+import random
+import re
+import subprocess
+import sys
+from datetime import datetime, timezone
+from math import ceil
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+# Server-Timing de QueryStatsMiddleware: db;dur=1.23;desc="3 queries", ...
+SERVER_TIMING_RE = re.compile(
+    r'db;dur=(?P<db_ms>[\d.]+);desc="(?P<queries>\d+) queries"'
+)
+
+SYLLABLES = ["ca", "sa", "lo", "mi", "ra", "te", "no", "pu", "di", "ve", "fo", "gu"]
+
+
+def make_vocabulary(size: int = 5000) -> List[str]:
+    """Palabras sinteticas fijas (no dependen de --seed): la primera es la mas
+    comun en los contenidos y sirve para buscar; las ultimas son raras."""
+    rng = random.Random(0)
+    words, seen = [], set()
+    while len(words) < size:
+        word = "".join(rng.choices(SYLLABLES, k=rng.randint(2, 4)))
+        if word not in seen:
+            seen.add(word)
+            words.append(word)
+    return words
+
+
+VOCABULARY = make_vocabulary()
+
+
+def zipf_cum_weights(n: int, exponent: float) -> List[float]:
+    """Pesos acumulados de una Zipf: el rango r sale con probabilidad ~ 1/r^s."""
+    total, cum = 0.0, []
+    for rank in range(1, n + 1):
+        total += 1 / rank**exponent
+        cum.append(total)
+    return cum
+
+
+def percentile(ordered: List[float], pct: float) -> float:
+    # nearest-rank sobre una lista ya ordenada
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(ceil(pct / 100 * len(ordered)) - 1, 0))]
+
+
+class Sample(NamedTuple):
+    seconds: float
+    status: int
+    queries: Optional[int]
+    db_ms: Optional[float]
+
+
+def parse_server_timing(header: Optional[str]) -> Tuple[Optional[int], Optional[float]]:
+    match = SERVER_TIMING_RE.search(header or "")
+    if match is None:
+        return None, None
+    return int(match["queries"]), float(match["db_ms"])
+
+
+def summarize(samples: List[Sample]) -> dict:
+    """p50/p95/p99 en ms, errores y consultas por request de una serie."""
+    latencies = sorted(sample.seconds * 1000 for sample in samples)
+    queries = [s.queries for s in samples if s.queries is not None]
+    db_ms = [s.db_ms for s in samples if s.db_ms is not None]
+    return {
+        "requests": len(samples),
+        "errors": sum(1 for sample in samples if sample.status >= 400),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "mean_ms": round(sum(latencies) / len(latencies), 3) if latencies else 0,
+        "max_ms": round(latencies[-1], 3) if latencies else 0,
+        "queries_per_request": (
+            round(sum(queries) / len(queries), 2) if queries else None
+        ),
+        "db_ms_mean": round(sum(db_ms) / len(db_ms), 3) if db_ms else None,
+    }
+
+
+class Dataset(NamedTuple):
+    total: int
+    max_id: int
+    tags: List[str]  # de la mas usada a la menos usada
+
+
+async def discover(client) -> Dataset:
+    """Tamaño del dataset y tags por popularidad, preguntandole a la API."""
+    last = await client.get(
+        "/posts",
+        params={"per_page": 1, "direction": "desc", "view": "summary"},
+    )
+    last.raise_for_status()
+    body = last.json()
+    tags = await client.get("/tags", params={"limit": 1000, "order_by": "count"})
+    tags.raise_for_status()
+    return Dataset(
+        total=body["total"] or 0,
+        max_id=body["items"][0]["id"] if body["items"] else 0,
+        tags=[tag["name"] for tag in tags.json()],
+    )
+
+
+def tiny_png(rng: random.Random) -> bytes:
+    # firma PNG + bytes al azar: pasa el sniff y no se deduplica por contenido
+    return b"\x89PNG\r\n\x1a\n" + rng.randbytes(32 * 1024)
+
+
+# Un escenario arma (metodo, url, kwargs de httpx) para cada request
+Scenario = Callable[[random.Random], Tuple[str, str, dict]]
+
+
+def scenarios(dataset: Dataset, token: str) -> Dict[str, Scenario]:
+    popular = dataset.tags[0] if dataset.tags else "python"
+    second = dataset.tags[1] if len(dataset.tags) > 1 else popular
+    rare = dataset.tags[-1] if dataset.tags else popular
+    deep_page = max(dataset.total // 20 // 2, 1)
+    auth = {"Authorization": f"Bearer {token}"}
+
+    def get(url: str, **params) -> Scenario:
+        return lambda rng: ("GET", url, {"params": params})
+
+    return {
+        "list_first_page": get("/posts", per_page=20),
+        "list_deep_offset": get("/posts", per_page=20, page=deep_page),
+        "list_no_total": get("/posts", per_page=20, include_total=False),
+        "list_full_view": get("/posts", per_page=20, view="full"),
+        "list_title_order": get("/posts", per_page=20, order_by="title"),
+        "search_common": get("/posts", Search=VOCABULARY[0], per_page=20),
+        "search_rare": get("/posts", Search=VOCABULARY[-1], per_page=20),
+        "by_tags_popular": get("/posts/by-tags", tags=popular, per_page=20),
+        "by_tags_rare": get("/posts/by-tags", tags=rare, per_page=20),
+        "by_tags_all": get(
+            "/posts/by-tags", tags=[popular, second], match="all", per_page=20
+        ),
+        "get_post": lambda rng: (
+            "GET",
+            f"/posts/{rng.randint(1, max(dataset.max_id, 1))}",
+            {},
+        ),
+        "create_post": lambda rng: (
+            "POST",
+            "/posts",
+            {
+                "headers": auth,
+                "data": {
+                    "title": f"Bench {rng.getrandbits(64):x}",
+                    "content": " ".join(rng.choices(VOCABULARY[:500], k=120)),
+                    "tags": rng.sample(dataset.tags[:50] or [popular], k=2),
+                },
+            },
+        ),
+        "upload_image": lambda rng: (
+            "POST",
+            "/upload/save",
+            {"files": {"file": ("bench.png", tiny_png(rng), "image/png")}},
+        ),
+    }
+
+
+WRITE_SCENARIOS = {"create_post", "upload_image"}
+
+
+def git_commit() -> Optional[str]:
+    try:
+        sha = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f"{sha}-dirty" if dirty else sha
+
+
+def save_results(kind: str, payload: dict, out: Optional[str] = None) -> str:
+    """Guarda el resultado con metadatos para comparar entre commits."""
+    commit = git_commit()
+    now = datetime.now(timezone.utc)
+    result = {
+        "kind": kind,
+        "commit": commit,
+        "created_at": now.isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "database": os.getenv("DATABASE_URL", "").split(":", 1)[0],
+        **payload,
+    }
+    if out is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        name = f"{kind}-{now:%Y%m%d-%H%M%S}-{commit or 'nogit'}.json"
+        out = os.path.join(RESULTS_DIR, name)
+    with open(out, "w") as file:
+        json.dump(result, file, indent=2)
+    return out
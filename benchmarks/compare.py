@@ -0,0 +1,84 @@
+"""
+Compara dos resultados de benchmarks (latency o load) endpoint por endpoint y
+marca las regresiones: p95 peor que --threshold o mas consultas por request.
+Sale con codigo 1 si hay alguna, para usarlo en CI.
+Ejecutar con: python benchmarks/compare.py antes.json despues.json [--threshold 10]
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import List, Optional
+
+# Agregar el directorio raíz al path para importar app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+METRICS = ("p50_ms", "p95_ms", "p99_ms")
+
+
+def _endpoints(result: dict) -> dict:
+    return {
+        name: row
+        for name, row in result["endpoints"].items()
+        if isinstance(row, dict) and "p95_ms" in row
+    }
+
+
+def _change(before: Optional[float], after: Optional[float]) -> Optional[float]:
+    if not before or after is None:
+        return None
+    return (after - before) / before * 100
+
+
+def compare(before: dict, after: dict, threshold: float) -> List[str]:
+    """Imprime la tabla y devuelve los endpoints con regresion."""
+    if before["kind"] != after["kind"]:
+        raise SystemExit(f"❌ No se comparan {before['kind']} con {after['kind']}")
+    print(f"{before['kind']}: {before['commit']} -> {after['commit']}")
+    regressions = []
+    old, new = _endpoints(before), _endpoints(after)
+    for name in sorted(old.keys() & new.keys()):
+        cells = []
+        for metric in METRICS:
+            change = _change(old[name][metric], new[name][metric])
+            shown = "  n/a" if change is None else f"{change:+5.0f}%"
+            cells.append(f"{metric[:3]} {new[name][metric]:8.2f} ({shown})")
+        queries_before = old[name]["queries_per_request"]
+        queries_after = new[name]["queries_per_request"]
+        p95_change = _change(old[name]["p95_ms"], new[name]["p95_ms"])
+        worse = (p95_change is not None and p95_change > threshold) or (
+            queries_before is not None
+            and queries_after is not None
+            and queries_after > queries_before
+        )
+        if worse:
+            regressions.append(name)
+        mark = "❌" if worse else "  "
+        print(
+            f"{mark} {name:20} {'  '.join(cells)}  "
+            f"queries {queries_before} -> {queries_after}"
+        )
+    for name in sorted(old.keys() - new.keys()):
+        print(f"   {name:20} (solo en el primero)")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument(
+        "--threshold", type=float, default=10, help="% de p95 que cuenta como regresion"
+    )
+    args = parser.parse_args()
+
+    with open(args.before) as file:
+        before = json.load(file)
+    with open(args.after) as file:
+        after = json.load(file)
+    regressions = compare(before, after, args.threshold)
+    if regressions:
+        print(f"❌ Regresiones en: {', '.join(regressions)}")
+        sys.exit(1)
+    print("✅ Sin regresiones")
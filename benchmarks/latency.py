@@ -0,0 +1,104 @@
+"""
+Latencia por endpoint (p50/p95/p99 y consultas SQL por request) contra la app
+en proceso via ASGI, sin red de por medio. Usa la base de DATABASE_URL: generar
+antes el dataset con benchmarks/seed.py. El cache de respuestas se desactiva
+salvo --cache, para medir el camino a la base.
+Ejecutar con: python benchmarks/latency.py [--requests 200] [--only search_common]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import sys
+import tempfile
+from time import perf_counter
+
+# Agregar el directorio raíz al path para importar app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import (
+    WRITE_SCENARIOS,
+    Sample,
+    discover,
+    parse_server_timing,
+    save_results,
+    scenarios,
+    summarize,
+)
+
+
+async def run_scenario(client, scenario, rng, requests: int, warmup: int):
+    samples = []
+    for i in range(warmup + requests):
+        method, url, kwargs = scenario(rng)
+        started = perf_counter()
+        response = await client.request(method, url, **kwargs)
+        elapsed = perf_counter() - started
+        if i >= warmup:
+            queries, db_ms = parse_server_timing(response.headers.get("server-timing"))
+            samples.append(Sample(elapsed, response.status_code, queries, db_ms))
+    return summarize(samples)
+
+
+async def latency(requests: int, warmup: int, only, include_writes: bool, seed: int):
+    import httpx
+
+    from app.core.security import create_access_token
+    from app.main import app
+    from app.services import save_file
+
+    # los uploads del benchmark no ensucian app/media
+    media = tempfile.mkdtemp(prefix="bench-media-")
+    save_file.MEDIA_DIR = media
+
+    rng = random.Random(seed)
+    token = create_access_token({"sub": "bench@example.com", "username": "bench"})
+    transport = httpx.ASGITransport(app=app)
+    results = {}
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        dataset = await discover(client)
+        print(f"Dataset: {dataset.total} posts, {len(dataset.tags)} tags")
+        for name, scenario in scenarios(dataset, token).items():
+            if only and name not in only:
+                continue
+            if name in WRITE_SCENARIOS and not include_writes:
+                continue
+            results[name] = await run_scenario(client, scenario, rng, requests, warmup)
+            row = results[name]
+            print(
+                f"  {name:20} p50 {row['p50_ms']:8.2f}  p95 {row['p95_ms']:8.2f}  "
+                f"p99 {row['p99_ms']:8.2f} ms  queries {row['queries_per_request']}"
+                f"  errores {row['errors']}"
+            )
+    shutil.rmtree(media, ignore_errors=True)
+    return {"dataset": dataset._asdict() | {"tags": len(dataset.tags)}, **results}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--only", nargs="*", help="nombres de escenarios a correr")
+    parser.add_argument(
+        "--no-writes", action="store_true", help="sin create_post ni upload_image"
+    )
+    parser.add_argument("--cache", action="store_true", help="con cache de lecturas")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", help="archivo JSON (por defecto benchmarks/results/)")
+    args = parser.parse_args()
+
+    # antes de importar la app: el cache y los derivados se configuran al importar
+    if not args.cache:
+        os.environ["CACHE_BACKEND"] = "none"
+    os.environ.setdefault("IMAGE_VARIANTS", "false")
+
+    results = asyncio.run(
+        latency(args.requests, args.warmup, args.only, not args.no_writes, args.seed)
+    )
+    settings = {"requests": args.requests, "warmup": args.warmup, "cache": args.cache}
+    path = save_results("latency", {"settings": settings, "endpoints": results})
+    print(f"✅ Resultados en {path}")
@@ -0,0 +1,212 @@
+"""
+Carga concurrente contra un servidor ASGI local: N clientes durante --duration
+segundos con una mezcla ponderada de endpoints. Por defecto levanta uvicorn con
+la app (DATABASE_URL del entorno); con --url usa un servidor ya corriendo y con
+--in-process le pega a la app via ASGI en el mismo proceso.
+Ejecutar con: python benchmarks/load.py --concurrency 32 --duration 30
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+from time import perf_counter
+
+# Agregar el directorio raíz al path para importar app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from benchmarks.common import (
+    ROOT,
+    Sample,
+    discover,
+    parse_server_timing,
+    save_results,
+    scenarios,
+    summarize,
+)
+
+DEFAULT_MIX = "list_first_page=40,get_post=25,search_common=10,by_tags_popular=15,create_post=5,list_deep_offset=5"
+
+
+def parse_mix(mix: str) -> dict:
+    weights = {}
+    for item in mix.split(","):
+        name, _, weight = item.partition("=")
+        weights[name.strip()] = float(weight or 1)
+    return weights
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_ready(url: str, timeout: float = 30) -> None:
+    deadline = perf_counter() + timeout
+    async with httpx.AsyncClient(base_url=url) as client:
+        while perf_counter() < deadline:
+            try:
+                await client.get("/api/v1/monitoring/cache")
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"el servidor no respondio en {timeout} s")
+
+
+def start_server(port: int, workers: int) -> subprocess.Popen:
+    try:
+        import uvicorn  # noqa: F401
+    except ImportError:
+        raise SystemExit(
+            "❌ Falta uvicorn (pip install uvicorn), o usar --url/--in-process"
+        )
+    env = {**os.environ, "CACHE_BACKEND": os.getenv("CACHE_BACKEND", "none")}
+    env.setdefault("IMAGE_VARIANTS", "false")
+    return subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.main:app",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "--log-level",
+            "warning",
+        ],
+        cwd=ROOT,
+        env=env,
+    )
+
+
+async def drive(client, weights: dict, concurrency: int, duration: float, seed: int):
+    from app.core.security import create_access_token
+
+    token = create_access_token({"sub": "bench@example.com", "username": "bench"})
+    dataset = await discover(client)
+    available = scenarios(dataset, token)
+    unknown = set(weights) - set(available)
+    if unknown:
+        raise SystemExit(f"❌ Escenarios desconocidos: {', '.join(sorted(unknown))}")
+    names = list(weights)
+    samples = defaultdict(list)
+    deadline = perf_counter() + duration
+
+    async def worker(number: int):
+        rng = random.Random(seed * 1000 + number)
+        while perf_counter() < deadline:
+            name = rng.choices(names, weights=[weights[n] for n in names])[0]
+            method, url, kwargs = available[name](rng)
+            started = perf_counter()
+            try:
+                response = await client.request(method, url, **kwargs)
+                status = response.status_code
+                queries, db_ms = parse_server_timing(
+                    response.headers.get("server-timing")
+                )
+            except httpx.TransportError:
+                status, queries, db_ms = 599, None, None
+            samples[name].append(
+                Sample(perf_counter() - started, status, queries, db_ms)
+            )
+
+    started = perf_counter()
+    await asyncio.gather(*(worker(n) for n in range(concurrency)))
+    elapsed = perf_counter() - started
+
+    every = [sample for series in samples.values() for sample in series]
+    return {
+        "dataset": {"total": dataset.total, "tags": len(dataset.tags)},
+        "elapsed_s": round(elapsed, 2),
+        "throughput_rps": round(len(every) / elapsed, 1),
+        "overall": summarize(every),
+        "endpoints": {name: summarize(series) for name, series in samples.items()},
+    }
+
+
+async def load(args) -> dict:
+    weights = parse_mix(args.mix)
+    limits = httpx.Limits(max_connections=args.concurrency)
+    if args.in_process:
+        from app.main import app
+        from app.services import save_file
+
+        save_file.MEDIA_DIR = tempfile.mkdtemp(prefix="bench-media-")
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+            try:
+                return await drive(
+                    client, weights, args.concurrency, args.duration, args.seed
+                )
+            finally:
+                shutil.rmtree(save_file.MEDIA_DIR, ignore_errors=True)
+
+    async with httpx.AsyncClient(
+        base_url=args.url, limits=limits, timeout=30
+    ) as client:
+        return await drive(client, weights, args.concurrency, args.duration, args.seed)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="escenario=peso,...")
+    parser.add_argument("--url", help="servidor ya levantado (no arranca uvicorn)")
+    parser.add_argument("--workers", type=int, default=1, help="workers de uvicorn")
+    parser.add_argument("--in-process", action="store_true", help="ASGI sin red")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.in_process:
+        os.environ.setdefault("CACHE_BACKEND", "none")
+        os.environ.setdefault("IMAGE_VARIANTS", "false")
+
+    server = None
+    if not args.url and not args.in_process:
+        port = free_port()
+        args.url = f"http://127.0.0.1:{port}"
+        server = start_server(port, args.workers)
+    try:
+        if server is not None:
+            asyncio.run(wait_ready(args.url))
+        mode = "in-process" if args.in_process else args.url
+        print(f"Carga: {args.concurrency} clientes, {args.duration} s contra {mode}")
+        results = asyncio.run(load(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    overall = results["overall"]
+    print(
+        f"  {results['throughput_rps']} req/s, p50 {overall['p50_ms']} ms, "
+        f"p95 {overall['p95_ms']} ms, p99 {overall['p99_ms']} ms, "
+        f"errores {overall['errors']}"
+    )
+    for name, row in sorted(results["endpoints"].items()):
+        print(
+            f"  {name:20} n={row['requests']:<6} p95 {row['p95_ms']:8.2f} ms"
+            f"  queries {row['queries_per_request']}"
+        )
+    settings = {
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+        "mix": parse_mix(args.mix),
+        "target": "in-process" if args.in_process else ("spawned" if server else "url"),
+        "workers": args.workers if server else None,
+    }
+    path = save_results("load", {"settings": settings, **results})
+    print(f"✅ Resultados en {path}")
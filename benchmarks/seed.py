@@ -0,0 +1,194 @@
+"""
+Generador de datos sinteticos para los benchmarks: autores, tags con uso en
+distribucion Zipf (pocos tags muy usados, una cola larga de raros) y posts con
+contenido de largo variable (algunos articulos muy largos). Inserta por lotes
+con SQL directo, sin pasar por la API, y deja tags.post_count al dia.
+Es deterministico para un mismo --seed.
+Ejecutar con: python benchmarks/seed.py --posts 100000 [--reset]
+"""
+
+import argparse
+import os
+import random
+import sys
+from collections import Counter
+from datetime import datetime, timedelta
+from time import perf_counter
+from typing import Iterator, List, Tuple
+
+# Agregar el directorio raíz al path para importar app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import Engine, bindparam, func, insert, select, text, update
+
+from app.core.db import Base
+from app.models.author import AuthorORM
+from app.models.post import PostORM, post_tags
+from app.models.tag import TagORM
+from benchmarks.common import VOCABULARY, zipf_cum_weights
+
+TAG_EXPONENT = 1.1  # ~ uso real de etiquetas: el top 1% concentra gran parte
+WORD_EXPONENT = 1.0
+AUTHOR_EXPONENT = 0.8
+
+
+def _ensure_rows(engine: Engine, table, rows: List[dict], key: str) -> List[int]:
+    """Inserta las filas que falten (por key) y devuelve los ids en orden."""
+    with engine.begin() as conn:
+        existing = dict(conn.execute(select(table.c[key], table.c.id)).all())
+        missing = [row for row in rows if row[key] not in existing]
+        if missing:
+            conn.execute(insert(table), missing)
+            existing = dict(conn.execute(select(table.c[key], table.c.id)).all())
+    return [existing[row[key]] for row in rows]
+
+
+SENTENCE_WORDS = 12
+
+
+def _sentences(rng: random.Random, words_cum: List[float], count: int = 4096):
+    # frases armadas una vez: sortear palabra por palabra domina el tiempo
+    return [
+        " ".join(rng.choices(VOCABULARY, cum_weights=words_cum, k=SENTENCE_WORDS)) + "."
+        for _ in range(count)
+    ]
+
+
+def _content(rng: random.Random, sentences: List[str]) -> str:
+    # largo log-normal: la mayoria ~150 palabras, algunos articulos de miles
+    words = min(int(rng.lognormvariate(5.0, 0.8)) + 10, 20000)
+    return " ".join(rng.choices(sentences, k=max(words // SENTENCE_WORDS, 1)))
+
+
+def post_batches(
+    rng: random.Random,
+    first_id: int,
+    count: int,
+    batch_size: int,
+    author_ids: List[int],
+    tag_ids: List[int],
+) -> Iterator[Tuple[List[dict], List[dict]]]:
+    words_cum = zipf_cum_weights(len(VOCABULARY), WORD_EXPONENT)
+    tags_cum = zipf_cum_weights(len(tag_ids), TAG_EXPONENT)
+    authors_cum = zipf_cum_weights(len(author_ids), AUTHOR_EXPONENT)
+    sentences = _sentences(rng, words_cum)
+    # fechas crecientes a lo largo de ~3 años, como un blog real
+    start = datetime(2023, 1, 1)
+    step = timedelta(days=3 * 365) / max(count, 1)
+
+    for offset in range(0, count, batch_size):
+        posts, links = [], []
+        for n in range(offset, min(offset + batch_size, count)):
+            post_id = first_id + n
+            created = start + step * n
+            title_words = rng.choices(VOCABULARY, cum_weights=words_cum, k=3)
+            posts.append(
+                {
+                    "id": post_id,
+                    "title": f"{' '.join(title_words).capitalize()} #{post_id}",
+                    "content": _content(rng, sentences),
+                    "author_id": rng.choices(author_ids, cum_weights=authors_cum)[0],
+                    "created_at": created,
+                    "updated_at": created,
+                }
+            )
+            picked = rng.choices(tag_ids, cum_weights=tags_cum, k=rng.randint(1, 5))
+            links.extend({"post_id": post_id, "tag_id": tag} for tag in set(picked))
+        yield posts, links
+
+
+def seed(
+    engine: Engine,
+    posts: int,
+    authors: int = 1000,
+    tags: int = 2000,
+    seed: int = 42,
+    batch_size: int = 5000,
+    reset: bool = False,
+) -> dict:
+    """Genera el dataset en engine y devuelve cuanto inserto y a que ritmo."""
+    if reset:
+        Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(seed)
+    started = perf_counter()
+
+    author_ids = _ensure_rows(
+        engine,
+        AuthorORM.__table__,
+        [
+            {"name": f"Autor {i}", "email": f"autor{i}@bench.example.com"}
+            for i in range(authors)
+        ],
+        "email",
+    )
+    tag_ids = _ensure_rows(
+        engine,
+        TagORM.__table__,
+        [{"name": f"tag-{i:05d}", "key": f"tag-{i:05d}"} for i in range(tags)],
+        "key",
+    )
+
+    with engine.connect() as conn:
+        first_id = (conn.scalar(select(func.max(PostORM.id))) or 0) + 1
+
+    counts: Counter = Counter()
+    inserted = links_inserted = 0
+    for post_rows, link_rows in post_batches(
+        rng, first_id, posts, batch_size, author_ids, tag_ids
+    ):
+        with engine.begin() as conn:
+            conn.execute(insert(PostORM.__table__), post_rows)
+            conn.execute(insert(post_tags), link_rows)
+        counts.update(link["tag_id"] for link in link_rows)
+        inserted += len(post_rows)
+        links_inserted += len(link_rows)
+        print(f"  {inserted}/{posts} posts", end="\r", flush=True)
+
+    with engine.begin() as conn:
+        # mismo ajuste relativo que usan las escrituras de la API
+        if counts:
+            conn.execute(
+                update(TagORM.__table__)
+                .where(TagORM.__table__.c.id == bindparam("tag_id"))
+                .values(post_count=TagORM.__table__.c.post_count + bindparam("n")),
+                [{"tag_id": tag, "n": n} for tag, n in counts.items()],
+            )
+        conn.execute(text("ANALYZE"))
+
+    elapsed = perf_counter() - started
+    return {
+        "posts": inserted,
+        "links": links_inserted,
+        "authors": len(author_ids),
+        "tags": len(tag_ids),
+        "seconds": round(elapsed, 2),
+        "posts_per_s": round(inserted / elapsed) if elapsed else None,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--posts", type=int, default=100000)
+    parser.add_argument("--authors", type=int, default=1000)
+    parser.add_argument("--tags", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument(
+        "--reset", action="store_true", help="borra TODAS las tablas antes de generar"
+    )
+    args = parser.parse_args()
+
+    from app.core.db import engine
+
+    print(f"Generando {args.posts} posts en {engine.url.render_as_string()}")
+    report = seed(
+        engine,
+        args.posts,
+        authors=args.authors,
+        tags=args.tags,
+        seed=args.seed,
+        batch_size=args.batch_size,
+        reset=args.reset,
+    )
+    print(f"✅ {report}")
@@ -0,0 +1,29 @@
+"""
+Script para agregar el indice ix_posts_image_url a la tabla posts, que usa el
+GC de media para contar cuantos posts referencian cada archivo.
+Ejecutar con: python scripts/add_image_url_index.py
+"""
+
+import os
+import sys
+
+# Agregar el directorio raíz al path para importar app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from app.core.db import engine
+
+
+def add_image_url_index():
+    """Crea ix_posts_image_url si no existe"""
+    with engine.begin() as conn:
+        conn.execute(
+            text("CREATE INDEX IF NOT EXISTS ix_posts_image_url ON posts (image_url)")
+        )
+    print("✅ Indice ix_posts_image_url listo en la tabla posts")
+
+
+if __name__ == "__main__":
+    print("Ejecutando migración para indexar posts.image_url...")
+    add_image_url_index()
@@ -0,0 +1,65 @@
+"""
+Script para agregar los indices de los listados de posts: orden por fecha
+(order_by=created_at, created_after), por autor (author_id) y los que ya usaban
+el orden por titulo y /posts/by-tags, por si la base es anterior a ellos.
+En SQLite tambien lleva created_at al formato de CURRENT_TIMESTAMP (sin
+microsegundos), que es el que comparan los filtros y los cursores.
+Se puede correr mas de una vez.
+Ejecutar con: python scripts/add_post_list_indexes.py
+"""
+
+import os
+import sys
+
+# Agregar el directorio raíz al path para importar app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from app.core.db import engine
+
+INDEXES = {
+    "ix_posts_created_at_id": "posts (created_at, id)",
+    "ix_posts_author_id_id": "posts (author_id, id)",
+    "ix_posts_author_id_created_at_id": "posts (author_id, created_at, id)",
+    "ix_posts_lower_title_id": "posts (lower(title), id)",
+    "ix_post_tags_tag_id_post_id": "post_tags (tag_id, post_id)",
+}
+
+
+def normalize_created_at(conn):
+    """SQLite: 'YYYY-MM-DD HH:MM:SS[.ffffff]' -> 'YYYY-MM-DD HH:MM:SS'"""
+    result = conn.execute(
+        text(
+            "UPDATE posts SET created_at = substr(replace(created_at, 'T', ' '), 1, 19) "
+            "WHERE length(created_at) > 19 OR created_at LIKE '%T%'"
+        )
+    )
+    print(f"✅ created_at normalizado en {result.rowcount} posts")
+
+
+def add_post_list_indexes():
+    """Crea los indices que falten"""
+    postgres = engine.dialect.name == "postgresql"
+    if postgres:
+        # CONCURRENTLY no bloquea las escrituras, pero no corre en una transaccion
+        connection = engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+        create = "CREATE INDEX CONCURRENTLY IF NOT EXISTS"
+    else:
+        connection = engine.connect()
+        create = "CREATE INDEX IF NOT EXISTS"
+
+    with connection as conn:
+        if engine.dialect.name == "sqlite":
+            normalize_created_at(conn)
+        for name, columns in INDEXES.items():
+            conn.execute(text(f"{create} {name} ON {columns}"))
+            print(f"✅ Indice {name} listo")
+        # estadisticas al dia para que el planner elija los indices nuevos
+        conn.execute(text("ANALYZE"))
+        conn.commit()
+
+
+if __name__ == "__main__":
+    print("Ejecutando migración para indexar los listados de posts...")
+    add_post_list_indexes()
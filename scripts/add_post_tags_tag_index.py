@@ -0,0 +1,32 @@
+"""
+Script para agregar el indice (tag_id, post_id) a post_tags, que usa
+/posts/by-tags para filtrar por tag (la PK empieza por post_id).
+Ejecutar con: python scripts/add_post_tags_tag_index.py
+"""
+
+import os
+import sys
+
+# Agregar el directorio raíz al path para importar app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from app.core.db import engine
+
+
+def add_post_tags_tag_index():
+    """Crea ix_post_tags_tag_id_post_id si no existe"""
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_post_tags_tag_id_post_id "
+                "ON post_tags (tag_id, post_id)"
+            )
+        )
+    print("✅ Indice ix_post_tags_tag_id_post_id listo en la tabla post_tags")
+
+
+if __name__ == "__main__":
+    print("Ejecutando migración para indexar post_tags por tag...")
+    add_post_tags_tag_index()
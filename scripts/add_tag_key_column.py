@@ -0,0 +1,49 @@
+"""
+Script para agregar la columna key (nombre normalizado) a la tabla tags,
+con su indice unico. Si hay tags que solo difieren en mayusculas/espacios
+hay que unificarlos antes: el script los lista y no toca nada.
+Ejecutar con: python scripts/add_tag_key_column.py
+"""
+
+import os
+import sys
+
+# Agregar el directorio raíz al path para importar app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import inspect, text
+
+from app.core.db import engine
+
+
+def add_tag_key_column():
+    """Agrega tags.key = lower(trim(name)) y el indice unico ix_tags_key"""
+    columns = {column["name"] for column in inspect(engine).get_columns("tags")}
+
+    with engine.begin() as conn:
+        duplicates = conn.execute(
+            text(
+                "SELECT lower(trim(name)) AS tag_key, count(*) FROM tags "
+                "GROUP BY lower(trim(name)) HAVING count(*) > 1"
+            )
+        ).all()
+        if duplicates:
+            print("❌ Hay tags duplicados por nombre normalizado, unificalos primero:")
+            for tag_key, total in duplicates:
+                print(f"   {tag_key!r}: {total} tags")
+            return
+
+        if "key" not in columns:
+            conn.execute(text("ALTER TABLE tags ADD COLUMN key VARCHAR(100) NULL"))
+        conn.execute(text("UPDATE tags SET key = lower(trim(name)) WHERE key IS NULL"))
+        conn.execute(
+            text("CREATE UNIQUE INDEX IF NOT EXISTS ix_tags_key ON tags (key)")
+        )
+        if engine.dialect.name == "postgresql":
+            conn.execute(text("ALTER TABLE tags ALTER COLUMN key SET NOT NULL"))
+    print("✅ Columna key lista en la tabla tags")
+
+
+if __name__ == "__main__":
+    print("Ejecutando migración para agregar columna key a tags...")
+    add_tag_key_column()
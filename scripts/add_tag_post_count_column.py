@@ -0,0 +1,43 @@
+"""
+Script para agregar el contador post_count a la tabla tags (con su indice) y
+llenarlo desde post_tags.
+Ejecutar con: python scripts/add_tag_post_count_column.py
+"""
+
+import os
+import sys
+
+# Agregar el directorio raíz al path para importar app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import inspect, text
+
+from app.core.db import engine
+
+
+def add_tag_post_count_column():
+    """Agrega tags.post_count, el indice ix_tags_post_count y calcula los valores"""
+    columns = {column["name"] for column in inspect(engine).get_columns("tags")}
+
+    with engine.begin() as conn:
+        if "post_count" not in columns:
+            conn.execute(
+                text(
+                    "ALTER TABLE tags ADD COLUMN post_count INTEGER NOT NULL DEFAULT 0"
+                )
+            )
+        conn.execute(
+            text("CREATE INDEX IF NOT EXISTS ix_tags_post_count ON tags (post_count)")
+        )
+        conn.execute(
+            text(
+                "UPDATE tags SET post_count = "
+                "(SELECT count(*) FROM post_tags WHERE post_tags.tag_id = tags.id)"
+            )
+        )
+    print("✅ Columna post_count lista en la tabla tags")
+
+
+if __name__ == "__main__":
+    print("Ejecutando migración para agregar post_count a tags...")
+    add_tag_post_count_column()
@@ -0,0 +1,41 @@
+"""
+Script para agregar la columna updated_at a la tabla posts
+(usada por ETag / Last-Modified). Los posts existentes toman su created_at.
+Ejecutar con: python scripts/add_updated_at_column.py
+"""
+
+import os
+import sys
+
+# Agregar el directorio raíz al path para importar app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import inspect, text
+
+from app.core.db import engine
+
+
+def add_updated_at_column():
+    """Agrega la columna updated_at a la tabla posts si no existe"""
+    columns = {column["name"] for column in inspect(engine).get_columns("posts")}
+    if "updated_at" in columns:
+        print("✅ La columna updated_at ya existe en la tabla posts")
+        return
+
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE posts ADD COLUMN updated_at TIMESTAMP NULL"))
+        conn.execute(text("UPDATE posts SET updated_at = created_at"))
+        if engine.dialect.name == "postgresql":
+            # SQLite no permite cambiar default/NOT NULL con ALTER TABLE
+            conn.execute(
+                text(
+                    "ALTER TABLE posts ALTER COLUMN updated_at SET DEFAULT now(), "
+                    "ALTER COLUMN updated_at SET NOT NULL"
+                )
+            )
+    print("✅ Columna updated_at agregada exitosamente a la tabla posts")
+
+
+if __name__ == "__main__":
+    print("Ejecutando migración para agregar columna updated_at...")
+    add_updated_at_column()
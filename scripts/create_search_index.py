@@ -0,0 +1,38 @@
+"""
+Script para crear el indice de busqueda de posts en una base existente
+(FTS5 + triggers en SQLite, indice GIN en Postgres) y reindexar lo que ya hay.
+Ejecutar con: python scripts/create_search_index.py
+"""
+
+import os
+import sys
+
+# Agregar el directorio raíz al path para importar app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from app.core.db import engine
+from app.models.search import POSTGRES_SEARCH_DDL, SQLITE_REBUILD, SQLITE_SEARCH_DDL
+
+
+def create_search_index():
+    """Crea el indice de busqueda si no existe y lo llena con los posts actuales"""
+    dialect = engine.dialect.name
+    if dialect == "sqlite":
+        statements = SQLITE_SEARCH_DDL + [SQLITE_REBUILD]
+    elif dialect == "postgresql":
+        statements = POSTGRES_SEARCH_DDL
+    else:
+        print(f"⚠️  {dialect} no tiene indice de busqueda, se usa ILIKE")
+        return
+
+    with engine.begin() as conn:
+        for statement in statements:
+            conn.execute(text(statement))
+    print(f"✅ Indice de busqueda listo ({dialect})")
+
+
+if __name__ == "__main__":
+    print("Creando indice de busqueda de posts...")
+    create_search_index()
@@ -0,0 +1,48 @@
+"""
+Script para crear un usuario que pueda loguearse en /api/v1/auth/login (crea la
+tabla users si no existe). Si no se pasa --password la pide por consola.
+Ejecutar con: python scripts/create_user.py email@example.com usuario
+"""
+
+import argparse
+import asyncio
+import getpass
+import os
+import sys
+
+# Agregar el directorio raíz al path para importar app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.exc import IntegrityError
+
+from app.api.v1.auth.repository import UserRepository
+from app.core.db import AsyncSessionLocal, engine
+from app.models.user import UserORM
+
+
+async def create_user(email: str, username: str, password: str):
+    """Crea el usuario con la contraseña hasheada con el costo configurado"""
+    UserORM.__table__.create(bind=engine, checkfirst=True)
+    async with AsyncSessionLocal() as db:
+        user = await UserRepository(db).create(email, username, password)
+        await db.commit()
+        return user
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("email")
+    parser.add_argument("username")
+    parser.add_argument("--password", help="si no se pasa, se pide por consola")
+    args = parser.parse_args()
+
+    password = args.password or getpass.getpass("Contraseña: ")
+    if not password:
+        print("❌ La contraseña no puede estar vacia")
+        sys.exit(1)
+    try:
+        user = asyncio.run(create_user(args.email, args.username, password))
+    except IntegrityError:
+        print(f"❌ Ya existe un usuario con ese email o username")
+        sys.exit(1)
+    print(f"✅ Usuario {user.email} creado (id {user.id})")
@@ -0,0 +1,36 @@
+"""
+Script para borrar los archivos de app/media que ya no usa ningun post
+(incluye los uploads a medio escribir). Respeta MEDIA_GC_GRACE_SECONDS: los
+archivos subidos o reutilizados hace menos que eso no se tocan.
+Ejecutar con: python scripts/gc_media.py [--grace 600]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+# Agregar el directorio raíz al path para importar app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.db import AsyncSessionLocal
+from app.services import media_gc
+
+
+async def gc_media():
+    """Recorre app/media y devuelve las urls borradas"""
+    async with AsyncSessionLocal() as db:
+        return await media_gc.sweep(db)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="GC de archivos de media")
+    parser.add_argument("--grace", type=float, help="segundos de gracia")
+    args = parser.parse_args()
+    if args.grace is not None:
+        media_gc.MEDIA_GC_GRACE_SECONDS = args.grace
+
+    removed = asyncio.run(gc_media())
+    for url in removed:
+        print(f"   {url}")
+    print(f"✅ {len(removed)} archivos sin referencias borrados")
@@ -0,0 +1,52 @@
+"""
+Script para importar posts en lote desde un archivo NDJSON (un post por linea):
+    {"title": "...", "content": "...", "tags": ["python"], "author": {"name": "...", "email": "..."}}
+Usa las mismas validaciones e inserciones por lote que POST /posts/import.
+Ejecutar con: python scripts/import_posts.py posts.ndjson [--batch-size 1000]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+# Agregar el directorio raíz al path para importar app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.api.v1.posts.importer import PostImporter
+from app.api.v1.posts.schemas import Author
+from app.core.db import AsyncSessionLocal
+
+
+async def read_lines(path: str):
+    source = sys.stdin.buffer if path == "-" else open(path, "rb")
+    with source:
+        for number, line in enumerate(source, start=1):
+            yield number, line
+
+
+async def import_posts(path: str, batch_size: int, author: Author = None):
+    """Importa el archivo y devuelve el reporte con los errores por linea"""
+    async with AsyncSessionLocal() as db:
+        importer = PostImporter(db, batch_size=batch_size, default_author=author)
+        return await importer.run(read_lines(path))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Importa posts desde NDJSON")
+    parser.add_argument("path", help="archivo NDJSON, o - para stdin")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--author-name", help="autor para las lineas sin author")
+    parser.add_argument("--author-email")
+    args = parser.parse_args()
+
+    default_author = None
+    if args.author_email:
+        default_author = Author(
+            name=args.author_name or args.author_email, email=args.author_email
+        )
+
+    report = asyncio.run(import_posts(args.path, args.batch_size, default_author))
+    print(json.dumps(report.model_dump(exclude={"tags"}), indent=2, ensure_ascii=False))
+    print(f"✅ {report.inserted} posts importados, ❌ {report.failed} con error")
@@ -0,0 +1,113 @@
+"""
+Benchmark de /api/v1/auth/login con logins concurrentes. Mientras tanto un
+ticker mide cuanto se atrasa el event loop (lag): con el hash en el pool debe
+quedar en pocos ms aunque cada login tarde decenas. Con --inline se hashea en
+el loop, como comparacion.
+Ejecutar con: python scripts/login_bench.py [--logins 50] [--concurrency 10]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+from time import perf_counter
+
+# Agregar el directorio raíz al path para importar app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from app.api.v1.auth.repository import UserRepository
+from app.core import passwords
+from app.core.db import AsyncSessionLocal, engine
+from app.main import app
+from app.models.user import UserORM
+
+BENCH_EMAIL = "bench@example.com"
+BENCH_PASSWORD = "bench-password"
+TICK_SECONDS = 0.005
+
+
+async def ensure_user():
+    UserORM.__table__.create(bind=engine, checkfirst=True)
+    async with AsyncSessionLocal() as db:
+        repository = UserRepository(db)
+        if await repository.get_by_email(BENCH_EMAIL) is None:
+            await repository.create(BENCH_EMAIL, "bench", BENCH_PASSWORD)
+            await db.commit()
+
+
+async def ticker(lags: list, stop: asyncio.Event):
+    """Duerme TICK_SECONDS y anota cuanto tarda de mas en despertar"""
+    while not stop.is_set():
+        started = perf_counter()
+        await asyncio.sleep(TICK_SECONDS)
+        lags.append(perf_counter() - started - TICK_SECONDS)
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def login_bench(logins: int, concurrency: int):
+    await ensure_user()
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, lags = [], []
+    form = {"username": BENCH_EMAIL, "password": BENCH_PASSWORD}
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+
+        async def one_login():
+            async with semaphore:
+                started = perf_counter()
+                response = await client.post("/api/v1/auth/login", data=form)
+                latencies.append(perf_counter() - started)
+                response.raise_for_status()
+
+        stop = asyncio.Event()
+        tick = asyncio.create_task(ticker(lags, stop))
+        started = perf_counter()
+        await asyncio.gather(*(one_login() for _ in range(logins)))
+        elapsed = perf_counter() - started
+        stop.set()
+        await tick
+
+    ms = lambda seconds: round(seconds * 1000, 2)  # noqa: E731
+    return {
+        "logins": logins,
+        "concurrency": concurrency,
+        "logins_per_s": round(logins / elapsed, 1),
+        "latency_p50_ms": ms(statistics.median(latencies)),
+        "latency_p95_ms": ms(percentile(latencies, 95)),
+        "loop_lag_p99_ms": ms(percentile(lags, 99)),
+        "loop_lag_max_ms": ms(max(lags)),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument(
+        "--inline", action="store_true", help="hashear en el event loop (sin pool)"
+    )
+    args = parser.parse_args()
+
+    if args.inline:
+
+        async def run_inline(func, *func_args):
+            return func(*func_args)
+
+        passwords.run_in_hash_pool = run_inline
+
+    mode = "inline" if args.inline else f"pool ({passwords.PASSWORD_HASH_WORKERS})"
+    print(f"Esquema {passwords.PASSWORD_SCHEME}, hash {mode}")
+    for key, value in asyncio.run(login_bench(args.logins, args.concurrency)).items():
+        print(f"  {key}: {value}")
+    passwords.shutdown()
+    print("✅ Benchmark terminado")
@@ -0,0 +1,28 @@
+"""
+Script para reconciliar tags.post_count con post_tags (por ejemplo despues de
+editar la base a mano). Es un solo UPDATE y solo toca los contadores desfasados.
+Ejecutar con: python scripts/rebuild_tag_counts.py
+"""
+
+import asyncio
+import os
+import sys
+
+# Agregar el directorio raíz al path para importar app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.api.v1.tags.repository import TagRepository
+from app.core.db import AsyncSessionLocal
+
+
+async def rebuild_tag_counts():
+    """Recalcula los contadores y devuelve cuantos estaban mal"""
+    async with AsyncSessionLocal() as db:
+        fixed = await TagRepository(db).rebuild_counts()
+        await db.commit()
+        return fixed
+
+
+if __name__ == "__main__":
+    fixed = asyncio.run(rebuild_tag_counts())
+    print(f"✅ Contadores de tags reconciliados ({fixed} corregidos)")
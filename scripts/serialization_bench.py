@@ -0,0 +1,94 @@
+"""
+Benchmark de CPU para serializar una pagina de GET /posts: el camino anterior
+(PostPublic.model_validate por item + PaginatedPost.model_dump_json) contra el
+actual (dicts desde el ORM + orjson), con y sin ?fields=.
+No toca la base: arma los posts en memoria.
+Ejecutar con: python scripts/serialization_bench.py [--per-page 50] [--rounds 200]
+"""
+
+import argparse
+import os
+import sys
+from time import process_time
+
+# Agregar el directorio raíz al path para importar app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.api.v1.posts import serialization
+from app.api.v1.posts.schemas import PaginatedPost, PostPublic
+from app.models.author import AuthorORM
+from app.models.post import PostORM
+from app.models.tag import TagORM
+
+PAGE = {
+    "page": 1,
+    "total": 1000,
+    "total_pages": 20,
+    "total_mode": "exact",
+    "has_prev": False,
+    "has_next": True,
+    "order_by": "id",
+    "direction": "asc",
+    "search": None,
+    "next_cursor": None,
+}
+
+
+def make_posts(count: int):
+    author = AuthorORM(id=1, name="Ricardo", email="ricardo@example.com")
+    tags = [TagORM(id=i, name=f"tag{i}", key=f"tag{i}") for i in range(3)]
+    return [
+        PostORM(
+            id=i,
+            title=f"Post numero {i}",
+            content="Contenido del post con acentos: áéíóú. " * 40,
+            image_url=None,
+            author=author,
+            tags=list(tags),
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def before(posts, per_page: int) -> bytes:
+    page = PaginatedPost(
+        per_page=per_page,
+        items=[PostPublic.model_validate(post) for post in posts],
+        **PAGE,
+    )
+    return page.model_dump_json().encode()
+
+
+def after(posts, per_page: int, only=None) -> bytes:
+    items = [serialization.post_dict(post, only) for post in posts]
+    return serialization.dumps({**PAGE, "per_page": per_page, "items": items})
+
+
+def cpu_per_call_ms(func, rounds: int) -> float:
+    started = process_time()
+    for _ in range(rounds):
+        func()
+    return (process_time() - started) / rounds * 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--per-page", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    posts = make_posts(args.per_page)
+    only = serialization.parse_fields("id,title")
+    cases = {
+        "antes (pydantic x2)": lambda: before(posts, args.per_page),
+        "ahora (dict + json)": lambda: after(posts, args.per_page),
+        "ahora ?fields=id,title": lambda: after(posts, args.per_page, only),
+    }
+    encoder = "orjson" if serialization.orjson is not None else "json stdlib"
+    print(f"Pagina de {args.per_page} posts, {args.rounds} rondas, {encoder}")
+    baseline = None
+    for name, func in cases.items():
+        cpu = cpu_per_call_ms(func, args.rounds)
+        baseline = baseline or cpu
+        print(f"  {name:24} {cpu:7.3f} ms CPU/request  x{baseline / cpu:.1f}")
+    print("✅ Benchmark terminado")